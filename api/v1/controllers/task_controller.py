@@ -1,30 +1,66 @@
 """Modulo que genera los controllers para la gestion de tareas."""
 
+import json
 import logging
-from fastapi import HTTPException, status
+from typing import Awaitable, Callable, Optional
+import anyio
+from fastapi import HTTPException, Response, status
+from fastapi.responses import StreamingResponse
 from api.v1.schemas.tasks.task_message_response import TaskMessageResponse
 from api.v1.services.task_service import TaskService
+from api.v1.schemas.tasks.task_batch_create import TaskBatchCreate
+from api.v1.schemas.tasks.task_batch_filter import TaskBatchFilter
+from api.v1.schemas.tasks.task_batch_update import TaskBatchUpdate
 from api.v1.schemas.tasks.task_create import TaskCreate
 from api.v1.schemas.tasks.task_update import TaskUpdate
 from core.global_config.exceptions.exceptions import (
     RepositoryConflictError,
     RepositoryConnectionError,
+    RepositoryQueryError,
     ExceptionDataError,
 )
+from core.global_config.timing.timing import timed
 
 logger = logging.getLogger("app")
 
 
+class ClosingStreamingResponse(StreamingResponse):
+    """``StreamingResponse`` que siempre libera el origen de sus datos.
+
+    ``close`` se ejecuta al terminar la respuesta pase lo que pase, tambien
+    si el cliente se desconecta antes de que se empiece a recorrer el cuerpo
+    (en ese caso ni el ``finally`` del cuerpo ni ``background`` llegan a
+    ejecutarse). Un fallo al cerrar solo se registra: la respuesta ya se
+    envio o se abandono.
+    """
+
+    def __init__(self, content, close: Callable[[], Awaitable[None]], **kwargs):
+        super().__init__(content, **kwargs)
+        self._close = close
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            # Protegido de la cancelacion: devuelve la conexion al pool
+            with anyio.CancelScope(shield=True):
+                try:
+                    await self._close()
+                except (RepositoryConnectionError, RepositoryQueryError):
+                    logger.warning("[Controller] Error al cerrar la respuesta por bloques", exc_info=True)
+
+
 class TaskController:
     """Controller para la gestion de tareas."""
 
     def __init__(self, task_service: TaskService):
         self.task_service = task_service
 
-    def create_task(self, task_create: TaskCreate, user_id: int):
+    @timed("controller")
+    async def create_task(self, task_create: TaskCreate, user_id: int):
         """Crea una nueva tarea."""
         try:
-            task_id = self.task_service.create_task(task_create, user_id)
+            task_id = await self.task_service.create_task(task_create, user_id)
             return TaskMessageResponse(
                     success=True,
                     data={
@@ -49,10 +85,35 @@ class TaskController:
                 detail="Servicio no disponible"
             )
 
-    def update_task(self, task_id: int, update_data: TaskUpdate, user_id: int):
+    @timed("controller")
+    async def create_tasks(self, task_batch: TaskBatchCreate, user_id: int):
+        """Crea varias tareas en una sola peticion."""
+        try:
+            task_ids = await self.task_service.create_tasks(task_batch, user_id)
+            return TaskMessageResponse(
+                    success=True,
+                    data={
+                        "task_ids": task_ids
+                    },
+                    message="Tareas creadas exitosamente.",
+                    status=201
+            )
+        except RepositoryConflictError as e:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=str(e)
+            )
+        except RepositoryConnectionError:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Servicio no disponible"
+            )
+
+    @timed("controller")
+    async def update_task(self, task_id: int, update_data: TaskUpdate, user_id: int):
         """Actualiza una tarea existente."""
         try:
-            updated_task_id = self.task_service.update_task(task_id, update_data, user_id)
+            updated_task_id = await self.task_service.update_task(task_id, update_data, user_id)
             return TaskMessageResponse(
                         success=True,
                         data={
@@ -77,10 +138,11 @@ class TaskController:
                 detail="Servicio no disponible"
             )
 
-    def delete_task(self, task_id: int, user_id: int):
+    @timed("controller")
+    async def delete_task(self, task_id: int, user_id: int):
         """Elimina una tarea existente."""
         try:
-            deleted_task_id = self.task_service.delete_task(task_id, user_id)
+            deleted_task_id = await self.task_service.delete_task(task_id, user_id)
             return TaskMessageResponse(
                         success=True,
                         data={
@@ -100,18 +162,189 @@ class TaskController:
                 detail="Servicio no disponible"
             )
 
-    def get_tasks(self, user_id: int):
-        """Obtiene una tarea por su ID."""
+    @timed("controller")
+    async def update_tasks(self, task_batch: TaskBatchUpdate, user_id: int):
+        """Actualiza el estado de varias tareas en una sola peticion."""
+        try:
+            result = await self.task_service.update_tasks(task_batch, user_id)
+            return TaskMessageResponse(
+                        success=True,
+                        data=result,
+                        message="Tareas actualizadas exitosamente.",
+                        status=200
+                    )
+        except RepositoryConflictError as e:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=str(e)
+            )
+        except RepositoryConnectionError:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Servicio no disponible"
+            )
+
+    @timed("controller")
+    async def delete_tasks(self, task_filter: TaskBatchFilter, user_id: int):
+        """Elimina varias tareas en una sola peticion."""
         try:
-            tasks = self.task_service.get_tasks(user_id)
+            result = await self.task_service.delete_tasks(task_filter, user_id)
+            return TaskMessageResponse(
+                        success=True,
+                        data=result,
+                        message="Tareas eliminadas exitosamente.",
+                        status=200
+                    )
+        except RepositoryConnectionError:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Servicio no disponible"
+            )
+
+    @timed("controller")
+    async def get_tasks(
+        self,
+        user_id: int,
+        response: Response,
+        limit: Optional[int] = None,
+        after: Optional[int] = None,
+        if_none_match: Optional[str] = None
+    ):
+        """Obtiene las tareas del usuario.
+
+        Sin ``limit`` devuelve la lista completa. Con ``limit`` devuelve una
+        pagina junto con ``next_after``, el cursor para pedir la siguiente
+        pagina (``None`` cuando no hay mas tareas).
+
+        La respuesta lleva un ``ETag`` con la version del listado; si el
+        cliente la envia en ``If-None-Match`` y no hubo cambios se responde
+        ``304 Not Modified`` sin leer las tareas.
+        """
+        try:
+            version, tasks = await self.task_service.get_tasks(
+                user_id,
+                limit=limit,
+                after=after,
+                known_version=self._known_version(if_none_match, user_id)
+            )
+            etag = self._etag(user_id, version)
+            if tasks is None:
+                return Response(
+                    status_code=status.HTTP_304_NOT_MODIFIED,
+                    headers={"ETag": etag, "Cache-Control": "private, no-cache"}
+                )
+            response.headers["ETag"] = etag
+            response.headers["Cache-Control"] = "private, no-cache"
+            if limit is None:
+                data = tasks
+            else:
+                data = {
+                    "tasks": tasks,
+                    "next_after": tasks[-1]["id"] if len(tasks) == limit else None
+                }
             return TaskMessageResponse(
                     success=True,
-                    data=tasks,
+                    data=data,
                     message="Tareas obtenidas exitosamente.",
                     status=200
                 )
+        except ExceptionDataError as e:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=str(e)
+            )
+        except RepositoryConnectionError:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Servicio no disponible"
+            )
+
+    @staticmethod
+    def _etag(user_id: int, version: int) -> str:
+        """Construye el ETag del listado de tareas del usuario."""
+        return f'"{user_id}-{version}"'
+
+    @staticmethod
+    def _known_version(if_none_match: Optional[str], user_id: int) -> Optional[int]:
+        """Extrae de ``If-None-Match`` la version que el cliente ya tiene.
+
+        Se ignoran las etiquetas de otros usuarios o con formato desconocido.
+        """
+        if not if_none_match:
+            return None
+        prefix = f"{user_id}-"
+        for tag in reversed(if_none_match.split(",")):
+            tag = tag.strip().removeprefix("W/").strip('"')
+            if tag.startswith(prefix) and tag[len(prefix):].isdigit():
+                return int(tag[len(prefix):])
+        return None
+
+    @timed("controller")
+    async def get_task_summary(self, user_id: int):
+        """Obtiene el resumen de tareas del usuario."""
+        try:
+            summary = await self.task_service.get_task_summary(user_id)
+            return TaskMessageResponse(
+                    success=True,
+                    data=summary,
+                    message="Resumen de tareas obtenido exitosamente.",
+                    status=200
+                )
         except RepositoryConnectionError:
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                 detail="Servicio no disponible"
             )
+
+    @timed("controller")
+    async def search_tasks(self, user_id: int, query: str, limit: int):
+        """Busca tareas del usuario por titulo y descripcion."""
+        try:
+            tasks = await self.task_service.search_tasks(user_id, query, limit)
+            return TaskMessageResponse(
+                    success=True,
+                    data=tasks,
+                    message="Busqueda de tareas completada.",
+                    status=200
+                )
+        except RepositoryConnectionError:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Servicio no disponible"
+            )
+
+    @timed("controller")
+    async def stream_tasks(self, user_id: int, batch_size: int):
+        """Envia las tareas del usuario como un arreglo JSON por bloques.
+
+        El primer bloque se lee antes de construir la respuesta para que los
+        errores de base de datos se traduzcan en un 503 o un 500 y no en una
+        respuesta cortada. Desde ese momento el cursor ocupa una conexion, que
+        ``ClosingStreamingResponse`` libera aunque el cliente se desconecte.
+        """
+        batches = self.task_service.stream_tasks(user_id, batch_size)
+        try:
+            first_batch = await anext(batches, [])
+        except RepositoryConnectionError:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Servicio no disponible"
+            )
+        except RepositoryQueryError:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="No se pudieron obtener las tareas"
+            )
+
+        async def body():
+            yield b"["
+            separator = b""
+            batch = first_batch
+            while batch:
+                chunk = b",".join(json.dumps(task).encode("utf-8") for task in batch)
+                yield separator + chunk
+                separator = b","
+                batch = await anext(batches, [])
+            yield b"]"
+
+        return ClosingStreamingResponse(body(), close=batches.aclose, media_type="application/json")
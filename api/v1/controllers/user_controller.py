@@ -1,6 +1,8 @@
 """Modulo que genera los controllers para la gestion de usuarios."""
 
 import logging
+import math
+from typing import Optional
 from fastapi import HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from api.v1.schemas.auth.auth_token import Token
@@ -9,10 +11,15 @@ from api.v1.services.user_service import UserService
 from api.v1.schemas.users.user_create import UserCreate
 from api.v1.schemas.users.user_update import UserUpdate
 from core.global_config.exceptions.exceptions import (
+    HashingQueueFullError,
     InvalidCredentialsError,
+    LoginRateLimitedError,
+    RepositoryConflictError,
     RepositoryConnectionError,
     ExceptionDataError
 )
+from core.global_config.timing.timing import timed
+from core.settings.settings import settings
 
 logger = logging.getLogger("app")
 
@@ -23,31 +30,39 @@ class UserController:
     def __init__(self, user_service: UserService):
         self.user_service = user_service
 
-    def register_user(self, user_create: UserCreate):
+    @timed("controller")
+    async def register_user(self, user_create: UserCreate):
         """Registra un nuevo usuario."""
         try:
-            user_id = self.user_service.create_user(user_create)
+            user_id = await self.user_service.create_user(user_create)
             return UserMessageResponse(
                 success=True,
                 data=user_id,
                 message="Usuario creado exitosamente.",
                 status=201
             )
-        except ExceptionDataError as e:
+        except (ExceptionDataError, RepositoryConflictError) as e:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail=str(e)
             )
+        except HashingQueueFullError as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=str(e),
+                headers={"Retry-After": str(settings.HASH_RETRY_AFTER_SECONDS)}
+            )
         except RepositoryConnectionError:
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                 detail="Servicio no disponible"
             )
 
-    def update_user_status(self, user_id: int, update_data: UserUpdate):
+    @timed("controller")
+    async def update_user_status(self, user_id: int, update_data: UserUpdate):
         """Actualiza el estado activo de un usuario."""
         try:
-            updated_user = self.user_service.update_user_status(user_id, update_data)
+            updated_user = await self.user_service.update_user_status(user_id, update_data)
             return UserMessageResponse(
                 success=True,
                 data={
@@ -67,10 +82,11 @@ class UserController:
                 detail="Servicio no disponible"
             )
 
-    def login_user(self, user_login_data: OAuth2PasswordRequestForm):
+    @timed("controller")
+    async def login_user(self, user_login_data: OAuth2PasswordRequestForm, client_ip: Optional[str] = None):
         """Inicia sesion de un usuario."""
         try:
-            token = self.user_service.login_user(user_login_data)
+            token = await self.user_service.login_user(user_login_data, client_ip)
             return Token(
                 access_token=token.access_token,
                 token_type=token.token_type
@@ -81,6 +97,18 @@ class UserController:
                 detail=str(e),
                 headers={"WWW-Authenticate": "Bearer"}
                 )
+        except LoginRateLimitedError as e:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=str(e),
+                headers={"Retry-After": str(math.ceil(e.retry_after))}
+            )
+        except HashingQueueFullError as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=str(e),
+                headers={"Retry-After": str(settings.HASH_RETRY_AFTER_SECONDS)}
+            )
         except RepositoryConnectionError:
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
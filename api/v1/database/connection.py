@@ -1,55 +1,230 @@
 """Modulo de conexion a la base de datos."""
 
-import atexit
-from typing import Optional
-from psycopg2.pool import ThreadedConnectionPool
+import asyncio
+import os
+import time
+import weakref
+from typing import Optional, Tuple
+from psycopg import AsyncConnection, Error, OperationalError
+from psycopg_pool import AsyncConnectionPool
+from core.global_config.metrics.metrics import (
+    DB_ERRORS,
+    DB_POOL_CHECKOUT_DURATION,
+    DB_POOL_CONNECTIONS,
+    DB_POOL_REQUESTS_WAITING,
+    DB_TRANSACTION_DURATION,
+    DB_TRANSACTIONS,
+    set_gauge_function,
+)
+from core.global_config.timing.timing import add_span
+from core.settings.settings import settings
+from utils.worker_budget import primary_pool_size
 
 
 class DatabaseConnection:
-    """Clase para manejar la conexion a la base de datos."""
+    """Clase para manejar la conexion asincrona a la base de datos.
 
-    _pool: Optional[ThreadedConnectionPool] = None
+    El pool atiende a quienes esperan una conexion en orden de llegada y
+    falla con ``PoolTimeout`` (un ``OperationalError``) si no obtienen una en
+    ``DB_POOL_TIMEOUT`` segundos. Las conexiones se reciclan al superar
+    ``DB_POOL_MAX_LIFETIME`` y se cierran tras ``DB_POOL_MAX_IDLE`` segundos
+    sin uso por encima de ``min_conn``.
 
-    def __init__(self, db_url: str, min_conn: int = 1, max_conn: int = 10):
+    El pool es propio de cada proceso: ``DB_POOL_MIN_SIZE`` y
+    ``DB_POOL_MAX_SIZE`` son el presupuesto de todo el servidor y cada worker
+    abre su parte, descontada su conexion de escucha
+    (``utils.worker_budget``). Si el proceso se bifurca (``fork``) el hijo descarta el
+    pool heredado y crea el suyo.
+    """
+
+    _pool: Optional[AsyncConnectionPool] = None
+    _pool_lock = asyncio.Lock()
+    _returned_at: "weakref.WeakKeyDictionary[AsyncConnection, float]" = weakref.WeakKeyDictionary()
+
+    def __init__(
+        self,
+        db_url: str,
+        min_conn: int = primary_pool_size()[0],
+        max_conn: int = primary_pool_size()[1],
+        cursor_name: Optional[str] = None
+    ):
         self.db_url = db_url
         self.min_conn = min_conn
         self.max_conn = max_conn
+        self.cursor_name = cursor_name
         self.connection = None
         self.cursor = None
+        self._source_pool: Optional[AsyncConnectionPool] = None
+        self._checked_out_at = 0.0
+
+    async def _getconn(self) -> Tuple[AsyncConnectionPool, AsyncConnection]:
+        """Obtiene una conexion del pool principal junto con el pool de origen."""
+        pool = await self._get_pool(self.db_url, self.min_conn, self.max_conn)
+        return pool, await pool.getconn()
+
+    @classmethod
+    async def _get_pool(cls, db_url: str, min_conn: int, max_conn: int) -> AsyncConnectionPool:
+        """Devuelve el pool de conexiones, creandolo en el primer uso."""
+        if cls._pool is None:
+            async with cls._pool_lock:
+                if cls._pool is None:
+                    pool = AsyncConnectionPool(
+                        conninfo=db_url,
+                        min_size=min_conn,
+                        max_size=max_conn,
+                        timeout=settings.DB_POOL_TIMEOUT,
+                        max_waiting=settings.DB_POOL_MAX_WAITING,
+                        max_lifetime=settings.DB_POOL_MAX_LIFETIME,
+                        max_idle=settings.DB_POOL_MAX_IDLE,
+                        configure=cls._configure_connection,
+                        check=cls._check_connection,
+                        open=False
+                    )
+                    # Abre ``min_conn`` conexiones antes de atender peticiones
+                    try:
+                        await pool.open(wait=True, timeout=settings.DB_POOL_TIMEOUT)
+                    except Error:
+                        # Sin cerrarlo el pool seguiria reintentando en segundo plano
+                        await pool.close()
+                        raise
+                    cls._pool = pool
+                    cls._register_pool_metrics()
+        return cls._pool
+
+    @classmethod
+    def _pool_stat(cls, name: str) -> int:
+        """Lee una estadistica instantanea del pool (0 si no existe el pool)."""
+        if cls._pool is None:
+            return 0
+        return cls._pool.get_stats().get(name, 0)
+
+    @classmethod
+    def _register_pool_metrics(cls):
+        """Publica el estado del pool como gauges de Prometheus."""
+        set_gauge_function(DB_POOL_CONNECTIONS.labels("idle"), lambda: cls._pool_stat("pool_available"))
+        set_gauge_function(
+            DB_POOL_CONNECTIONS.labels("in_use"),
+            lambda: cls._pool_stat("pool_size") - cls._pool_stat("pool_available")
+        )
+        set_gauge_function(DB_POOL_REQUESTS_WAITING, lambda: cls._pool_stat("requests_waiting"))
+
+    @staticmethod
+    async def _configure_connection(connection: AsyncConnection):
+        """Configura los prepared statements de cada conexion nueva del pool.
+
+        psycopg mantiene por conexion un registro de las sentencias ya
+        preparadas en el servidor y las ejecuta por nombre. Con
+        ``prepare_threshold = 0`` cada sentencia se prepara en su primera
+        ejecucion; como el registro es propio de cada conexion, al reconectar
+        se vuelven a preparar sin intervencion. ``DB_PREPARED_STATEMENTS``
+        permite desactivarlos para poolers en modo transaccion.
+        """
+        if settings.DB_PREPARED_STATEMENTS:
+            connection.prepare_threshold = 0
+            connection.prepared_max = settings.DB_PREPARED_MAX
+        else:
+            connection.prepare_threshold = None
+
+    @classmethod
+    async def _check_connection(cls, connection: AsyncConnection):
+        """Comprueba las conexiones que llevan un tiempo sin usarse.
+
+        Solo se hace el ping si la conexion estuvo inactiva mas de
+        ``DB_POOL_PING_AFTER_IDLE`` segundos; si falla, el pool la descarta y
+        entrega otra.
+        """
+        returned_at = cls._returned_at.get(connection)
+        if returned_at is None or time.monotonic() - returned_at >= settings.DB_POOL_PING_AFTER_IDLE:
+            await AsyncConnectionPool.check_connection(connection)
+
+    @classmethod
+    async def open_pool(cls, db_url: str):
+        """Crea el pool del proceso y abre las conexiones minimas."""
+        min_conn, max_conn = primary_pool_size()
+        await cls._get_pool(db_url, min_conn, max_conn)
+
+    @classmethod
+    async def ping(cls, timeout: float = settings.DB_POOL_TIMEOUT):
+        """Comprueba que el pool entrega una conexion sana ejecutando ``SELECT 1``.
 
-        if DatabaseConnection._pool is None:
-            DatabaseConnection._pool = ThreadedConnectionPool(
-                minconn=self.min_conn,
-                maxconn=self.max_conn,
-                dsn=self.db_url
-            )
-            atexit.register(self._close_all_pool_connections)
+        Lanza ``PoolTimeout`` si no hay conexion libre en ``timeout`` segundos
+        y ``OperationalError`` si el pool no esta abierto o la conexion falla.
+        """
+        if cls._pool is None:
+            raise OperationalError("El pool de conexiones no esta abierto")
+        async with cls._pool.connection(timeout=timeout) as connection:
+            await connection.execute("SELECT 1")
 
     @classmethod
-    def _close_all_pool_connections(cls):
+    def _reset_after_fork(cls):
+        """Olvida en el proceso hijo el pool heredado del padre.
+
+        Las conexiones del padre no se pueden compartir; no se cierran aqui
+        porque siguen siendo del padre.
+        """
+        cls._pool = None
+        cls._pool_lock = asyncio.Lock()
+        cls._returned_at = weakref.WeakKeyDictionary()
+
+    @classmethod
+    async def close_pool(cls):
         """Cierra todas las conexiones en el pool."""
         if cls._pool:
-            cls._pool.closeall()
+            await cls._pool.close()
             cls._pool = None
 
-    def __enter__(self):
-        """Establece la conexion a la base de datos con pooling de conexiones."""
-        self.connection = DatabaseConnection._pool.getconn()
-        self.cursor = self.connection.cursor()
+    async def __aenter__(self):
+        """Establece la conexion a la base de datos con pooling de conexiones.
+
+        Si se indica ``cursor_name`` se abre un cursor con nombre (del lado del
+        servidor), que permite leer los resultados por bloques sin cargarlos
+        todos en memoria.
+        """
+        start = time.perf_counter()
+        try:
+            self._source_pool, self.connection = await self._getconn()
+        except Error as e:
+            DB_ERRORS.labels(type(e).__name__).inc()
+            raise
+        self._checked_out_at = time.perf_counter()
+        DB_POOL_CHECKOUT_DURATION.observe(self._checked_out_at - start)
+        add_span("pool", self._checked_out_at - start)
+        if self.cursor_name:
+            self.cursor = self.connection.cursor(name=self.cursor_name)
+        else:
+            self.cursor = self.connection.cursor()
         return self.cursor
 
-    def __exit__(self, exc_type, exc_value, traceback):
-        """Devuelve la conexión al pool."""
-        if self.connection:
-            if exc_type:
-                self.connection.rollback()
-            else:
-                self.connection.commit()
-
-        if self.cursor:
-            self.cursor.close()
-            self.cursor = None
-        if self.connection:
-            # Devuelve la conexion al pool
-            DatabaseConnection._pool.putconn(self.connection)
-            self.connection = None
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        """Confirma o revierte la transaccion y devuelve la conexion al pool."""
+        if exc_type is not None and issubclass(exc_type, Error):
+            DB_ERRORS.labels(exc_type.__name__).inc()
+        start = time.perf_counter()
+        try:
+            if self.cursor:
+                await self.cursor.close()
+                self.cursor = None
+            if self.connection:
+                if exc_type:
+                    await self.connection.rollback()
+                    DB_TRANSACTIONS.labels("rollback").inc()
+                else:
+                    await self.connection.commit()
+                    DB_TRANSACTIONS.labels("commit").inc()
+                add_span("commit", time.perf_counter() - start)
+        except Error as e:
+            DB_ERRORS.labels(type(e).__name__).inc()
+            raise
+        finally:
+            if self.connection:
+                DB_TRANSACTION_DURATION.observe(time.perf_counter() - self._checked_out_at)
+                DatabaseConnection._returned_at[self.connection] = time.monotonic()
+            if self.connection:
+                # Devuelve la conexion al pool del que salio
+                await self._source_pool.putconn(self.connection)
+                self.connection = None
+                self._source_pool = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=DatabaseConnection._reset_after_fork)
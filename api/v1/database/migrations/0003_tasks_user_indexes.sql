@@ -0,0 +1,13 @@
+-- migrate: no-transaction
+-- Los indices se crean con CONCURRENTLY para no bloquear las escrituras en
+-- tasks mientras se construyen. Un intento fallido deja un indice invalido
+-- que IF NOT EXISTS daria por bueno, por eso se borra antes de crearlo.
+
+-- Indice para los listados paginados por usuario y los filtros por
+-- user_id de las actualizaciones y borrados.
+DROP INDEX CONCURRENTLY IF EXISTS idx_tasks_user_id_id;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tasks_user_id_id ON tasks (user_id, id);
+
+-- Indice parcial para las tareas pendientes de cada usuario.
+DROP INDEX CONCURRENTLY IF EXISTS idx_tasks_user_id_pending;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tasks_user_id_pending ON tasks (user_id, id) WHERE NOT completed;
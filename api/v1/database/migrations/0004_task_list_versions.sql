@@ -0,0 +1,11 @@
+-- Version del listado de tareas de cada usuario. Se incrementa en cada
+-- escritura sobre sus tareas y se expone como ETag de GET /tasks/get.
+-- Un usuario sin fila tiene version 0.
+CREATE TABLE IF NOT EXISTS task_list_versions (
+    user_id INTEGER PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0,
+    CONSTRAINT fk_user
+        FOREIGN KEY(user_id)
+        REFERENCES users(id)
+        ON DELETE CASCADE
+);
@@ -0,0 +1,20 @@
+-- migrate: no-transaction
+-- Busqueda de tareas por texto completo (titulo y descripcion) y por
+-- similitud de trigramas en el titulo, tolerante a erratas y prefijos.
+-- btree_gin permite incluir user_id en los indices GIN, de modo que cada
+-- busqueda solo recorre las entradas del propio usuario.
+-- Los indices se crean con CONCURRENTLY para no bloquear las escrituras en
+-- tasks; un intento fallido deja un indice invalido, que se borra antes.
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE EXTENSION IF NOT EXISTS btree_gin;
+
+-- La expresion debe coincidir exactamente con la de TaskRepository.search_tasks
+DROP INDEX CONCURRENTLY IF EXISTS idx_tasks_user_id_search;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tasks_user_id_search ON tasks USING GIN (
+    user_id,
+    (setweight(to_tsvector('spanish', title), 'A')
+        || setweight(to_tsvector('spanish', coalesce(description, '')), 'B'))
+);
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_tasks_user_id_title_trgm;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tasks_user_id_title_trgm ON tasks USING GIN (user_id, title gin_trgm_ops);
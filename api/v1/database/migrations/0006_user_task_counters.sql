@@ -0,0 +1,92 @@
+-- Contadores de tareas por usuario para el resumen total / completadas /
+-- pendientes sin recorrer la tabla de tareas. Los mantienen triggers a
+-- nivel de sentencia con tablas de transicion, por lo que cubren tambien
+-- los lotes y las cargas con COPY.
+CREATE TABLE IF NOT EXISTS user_task_counters (
+    user_id INTEGER PRIMARY KEY,
+    total BIGINT NOT NULL DEFAULT 0,
+    completed BIGINT NOT NULL DEFAULT 0,
+    CONSTRAINT fk_user
+        FOREIGN KEY(user_id)
+        REFERENCES users(id)
+        ON DELETE CASCADE
+);
+
+CREATE OR REPLACE FUNCTION tasks_insert_counters() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO user_task_counters (user_id, total, completed)
+    SELECT user_id, count(*), count(*) FILTER (WHERE completed)
+    FROM new_tasks
+    GROUP BY user_id
+    ORDER BY user_id
+    ON CONFLICT (user_id) DO UPDATE
+    SET total = user_task_counters.total + EXCLUDED.total,
+        completed = user_task_counters.completed + EXCLUDED.completed;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION tasks_update_counters() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO user_task_counters (user_id, total, completed)
+    SELECT user_id, sum(total), sum(completed)
+    FROM (
+        SELECT user_id, 1 AS total, (completed IS TRUE)::int AS completed FROM new_tasks
+        UNION ALL
+        SELECT user_id, -1, -(completed IS TRUE)::int FROM old_tasks
+    ) AS deltas
+    GROUP BY user_id
+    HAVING sum(total) <> 0 OR sum(completed) <> 0
+    ORDER BY user_id
+    ON CONFLICT (user_id) DO UPDATE
+    SET total = user_task_counters.total + EXCLUDED.total,
+        completed = user_task_counters.completed + EXCLUDED.completed;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Solo UPDATE: en el borrado en cascada de un usuario su fila de contadores
+-- ya no existe y no debe volver a crearse.
+CREATE OR REPLACE FUNCTION tasks_delete_counters() RETURNS trigger AS $$
+BEGIN
+    UPDATE user_task_counters AS counters
+    SET total = counters.total - deltas.total,
+        completed = counters.completed - deltas.completed
+    FROM (
+        SELECT user_id, count(*) AS total, count(*) FILTER (WHERE completed) AS completed
+        FROM old_tasks
+        GROUP BY user_id
+    ) AS deltas
+    WHERE counters.user_id = deltas.user_id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS tasks_insert_counters ON tasks;
+CREATE TRIGGER tasks_insert_counters
+    AFTER INSERT ON tasks
+    REFERENCING NEW TABLE AS new_tasks
+    FOR EACH STATEMENT EXECUTE FUNCTION tasks_insert_counters();
+
+DROP TRIGGER IF EXISTS tasks_update_counters ON tasks;
+CREATE TRIGGER tasks_update_counters
+    AFTER UPDATE ON tasks
+    REFERENCING OLD TABLE AS old_tasks NEW TABLE AS new_tasks
+    FOR EACH STATEMENT EXECUTE FUNCTION tasks_update_counters();
+
+DROP TRIGGER IF EXISTS tasks_delete_counters ON tasks;
+CREATE TRIGGER tasks_delete_counters
+    AFTER DELETE ON tasks
+    REFERENCING OLD TABLE AS old_tasks
+    FOR EACH STATEMENT EXECUTE FUNCTION tasks_delete_counters();
+
+-- Carga inicial. Los triggers ya existen y su creacion bloquea las
+-- escrituras concurrentes hasta el final de la migracion, asi que ninguna
+-- tarea queda fuera ni se cuenta dos veces.
+INSERT INTO user_task_counters (user_id, total, completed)
+SELECT user_id, count(*), count(*) FILTER (WHERE completed)
+FROM tasks
+GROUP BY user_id
+ON CONFLICT (user_id) DO UPDATE
+SET total = EXCLUDED.total,
+    completed = EXCLUDED.completed;
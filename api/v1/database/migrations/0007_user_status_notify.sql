@@ -0,0 +1,30 @@
+-- Aviso en el canal user_status de cada usuario creado y de cada cambio de
+-- is_active, incluidos los UPDATE hechos fuera de la API. Los workers lo
+-- reciben por LISTEN y actualizan su conjunto de usuarios desactivados;
+-- PostgreSQL solo entrega el aviso si la transaccion se confirma.
+CREATE OR REPLACE FUNCTION users_notify_status() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify(
+        'user_status',
+        json_build_object(
+            'user_id', NEW.id,
+            'is_active', NEW.is_active,
+            'username', NEW.username,
+            'email', NEW.email
+        )::text
+    );
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS users_notify_status_insert ON users;
+CREATE TRIGGER users_notify_status_insert
+    AFTER INSERT ON users
+    FOR EACH ROW EXECUTE FUNCTION users_notify_status();
+
+DROP TRIGGER IF EXISTS users_notify_status_update ON users;
+CREATE TRIGGER users_notify_status_update
+    AFTER UPDATE OF is_active ON users
+    FOR EACH ROW
+    WHEN (OLD.is_active IS DISTINCT FROM NEW.is_active)
+    EXECUTE FUNCTION users_notify_status();
@@ -0,0 +1,139 @@
+"""Modulo que aplica las migraciones versionadas del esquema de base de datos."""
+
+import asyncio
+import logging
+import os
+import re
+from typing import List, NamedTuple
+
+import psycopg
+
+from paths.path import ApiPaths
+
+logger = logging.getLogger("app")
+
+# Clave del advisory lock que serializa las migraciones entre procesos.
+MIGRATIONS_LOCK_KEY = 7_402_113_001
+
+# Espera entre intentos de tomar el lock mientras otro proceso migra
+MIGRATIONS_LOCK_POLL_SECONDS = 0.5
+
+# Primera linea de las migraciones que no pueden ir en una transaccion, como
+# ``CREATE INDEX CONCURRENTLY``
+NO_TRANSACTION_MARKER = "-- migrate: no-transaction"
+
+_MIGRATION_FILE = re.compile(r"^(\d+)_(\w+)\.sql$")
+
+# Fin de sentencia: ``;`` al final de una linea
+_STATEMENT_END = re.compile(r";[ \t]*$", re.MULTILINE)
+
+
+class Migration(NamedTuple):
+    """Migracion leida de la carpeta de migraciones."""
+    version: int
+    name: str
+    sql: str
+    transactional: bool = True
+
+
+def load_migrations(directory: str = ApiPaths.migrations) -> List[Migration]:
+    """Lee los archivos ``<version>_<nombre>.sql`` ordenados por version."""
+    migrations = []
+    for file_name in os.listdir(directory):
+        match = _MIGRATION_FILE.match(file_name)
+        if not match:
+            continue
+        with open(os.path.join(directory, file_name), "r", encoding="utf-8") as file:
+            sql = file.read()
+        transactional = not sql.lstrip().startswith(NO_TRANSACTION_MARKER)
+        migrations.append(Migration(int(match.group(1)), match.group(2), sql, transactional))
+    migrations.sort(key=lambda migration: migration.version)
+
+    versions = [migration.version for migration in migrations]
+    if len(versions) != len(set(versions)):
+        raise ValueError("Hay migraciones con la misma version")
+    return migrations
+
+
+def split_statements(sql: str) -> List[str]:
+    """Separa las sentencias de una migracion sin transaccion.
+
+    Cada sentencia termina con ``;`` al final de una linea; los bloques que
+    solo tienen comentarios se descartan. No admite cuerpos ``$$`` con
+    varias lineas terminadas en ``;``, que deben ir en migraciones normales.
+    """
+    statements = []
+    for chunk in _STATEMENT_END.split(sql):
+        lines = [line for line in chunk.strip().splitlines() if not line.strip().startswith("--")]
+        if any(line.strip() for line in lines):
+            statements.append(chunk.strip())
+    return statements
+
+
+async def _acquire_lock(connection: psycopg.AsyncConnection):
+    """Espera a tener el advisory lock de las migraciones.
+
+    Se sondea con ``pg_try_advisory_lock`` en lugar de bloquear: un proceso
+    esperando dentro de una sentencia retendria un snapshot y
+    ``CREATE INDEX CONCURRENTLY`` en el proceso que migra esperaria por el.
+    """
+    while True:
+        cursor = await connection.execute("SELECT pg_try_advisory_lock(%s)", (MIGRATIONS_LOCK_KEY,))
+        if (await cursor.fetchone())[0]:
+            return
+        await asyncio.sleep(MIGRATIONS_LOCK_POLL_SECONDS)
+
+
+async def _apply(connection: psycopg.AsyncConnection, migration: Migration):
+    """Aplica una migracion y la registra en ``schema_migrations``.
+
+    Las migraciones normales van en una transaccion junto con su registro.
+    Las marcadas con ``NO_TRANSACTION_MARKER`` ejecutan cada sentencia por
+    separado en autocommit y se registran al terminar; si fallan a medias se
+    repiten enteras, por lo que sus sentencias deben poder repetirse.
+    """
+    record = "INSERT INTO schema_migrations (version, name) VALUES (%s, %s)"
+    if migration.transactional:
+        async with connection.transaction():
+            # Las migraciones pueden tener varias sentencias y no se preparan
+            await connection.execute(migration.sql, prepare=False)
+            await connection.execute(record, (migration.version, migration.name))
+        return
+    for statement in split_statements(migration.sql):
+        await connection.execute(statement, prepare=False)
+    await connection.execute(record, (migration.version, migration.name))
+
+
+async def run_migrations(db_url: str):
+    """Aplica las migraciones pendientes.
+
+    Se usa una conexion propia en autocommit que retiene un advisory lock de
+    sesion, de modo que si varios procesos arrancan a la vez solo uno las
+    aplica y el resto espera y encuentra el esquema al dia. Cada migracion
+    se confirma por separado: las que crean indices con ``CONCURRENTLY`` no
+    bloquean las escrituras mientras se construyen.
+    """
+    migrations = load_migrations()
+    try:
+        async with await psycopg.AsyncConnection.connect(db_url, autocommit=True) as connection:
+            await _acquire_lock(connection)
+            await connection.execute("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version INTEGER PRIMARY KEY,
+                name VARCHAR(255) NOT NULL,
+                applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+            );
+            """)
+            cursor = await connection.execute("SELECT version FROM schema_migrations")
+            applied = {row[0] for row in await cursor.fetchall()}
+
+            for migration in migrations:
+                if migration.version in applied:
+                    continue
+                logger.info("Aplicando migracion %04d_%s", migration.version, migration.name)
+                await _apply(connection, migration)
+            # El lock de sesion se libera al cerrar la conexion
+        logger.info("Esquema de base de datos al dia.")
+    except Exception as e:
+        logger.error("Error al aplicar las migraciones: %s", e)
+        raise
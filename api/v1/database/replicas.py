@@ -0,0 +1,262 @@
+"""Modulo que reparte las consultas de solo lectura entre las replicas."""
+
+import logging
+import os
+import time
+from collections import OrderedDict
+from contextvars import ContextVar, Token
+from typing import Dict, Hashable, List, Optional, Tuple
+
+from psycopg import AsyncConnection, OperationalError
+from psycopg_pool import AsyncConnectionPool, PoolTimeout, TooManyRequests
+
+from api.v1.database.connection import DatabaseConnection
+from core.global_config.metrics.metrics import DB_READ_ROUTING
+from core.settings.settings import settings
+from utils.worker_budget import replica_pool_size
+
+logger = logging.getLogger("app")
+
+
+class ClientWrites:
+    """Marca de lectura de lo escrito que viaja con el cliente.
+
+    ``pinned_until`` llega en la cookie de la peticion y ``written_until``
+    se rellena si la peticion escribe, para devolver la cookie renovada.
+    Ambos son instantes de reloj de pared, comparables entre procesos.
+    """
+
+    __slots__ = ("pinned_until", "written_until")
+
+    def __init__(self, pinned_until: Optional[float] = None):
+        self.pinned_until = pinned_until
+        self.written_until: Optional[float] = None
+
+
+_client_writes: ContextVar[Optional[ClientWrites]] = ContextVar("client_writes", default=None)
+
+
+def start_client_writes(pinned_until: Optional[float]) -> Tuple[ClientWrites, Token]:
+    """Abre la marca del cliente para la peticion en curso."""
+    marker = ClientWrites(pinned_until)
+    return marker, _client_writes.set(marker)
+
+
+def reset_client_writes(token: Token):
+    """Cierra la marca abierta con ``start_client_writes``."""
+    _client_writes.reset(token)
+
+
+class ReplicaRouter:
+    """Elige la replica de lectura de cada conexion de solo lectura.
+
+    Cada replica tiene su propio pool. Se elige la que tiene menos
+    conexiones en uso (``least_busy``) o se van alternando (``round_robin``).
+    Una replica que falla se aparta durante ``retry_after`` segundos; si no
+    queda ninguna disponible la lectura va al principal.
+
+    Las replicas van con retraso respecto al principal, asi que tras una
+    escritura confirmada el usuario (``key``) lee del principal durante
+    ``read_your_writes`` segundos para ver sus propios cambios. El registro
+    de ``record_write`` es local al proceso: con varios workers la garantia
+    depende de la marca del cliente (``ClientWrites``), que
+    ``ReadYourWritesMiddleware`` envia en una cookie y lee en la siguiente
+    peticion, atienda el worker que la atienda.
+    """
+
+    def __init__(
+        self,
+        urls: List[str],
+        selection: str,
+        read_your_writes: float,
+        retry_after: float,
+        max_tracked_keys: int
+    ):
+        if selection not in ("least_busy", "round_robin"):
+            raise ValueError(f"Seleccion de replicas no soportada: {selection}")
+        self.urls = list(urls)
+        self.selection = selection
+        self.read_your_writes = read_your_writes
+        self.retry_after = retry_after
+        self.max_tracked_keys = max_tracked_keys
+        self._pools: Dict[str, AsyncConnectionPool] = {}
+        self._down_until: Dict[str, float] = {}
+        self._next = 0
+        self._recent_writes: "OrderedDict[Hashable, float]" = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        """Indica si hay replicas configuradas."""
+        return bool(self.urls)
+
+    async def open(self):
+        """Crea el pool de cada replica sin esperar a sus conexiones.
+
+        Una replica caida no debe retrasar el arranque: su pool se llena en
+        segundo plano y mientras tanto las lecturas van a las demas.
+        """
+        min_conn, max_conn = replica_pool_size()
+        for url in self.urls:
+            if url in self._pools:
+                continue
+            pool = AsyncConnectionPool(
+                conninfo=url,
+                min_size=min_conn,
+                max_size=max_conn,
+                timeout=settings.DB_REPLICA_TIMEOUT,
+                max_waiting=settings.DB_POOL_MAX_WAITING,
+                max_lifetime=settings.DB_POOL_MAX_LIFETIME,
+                max_idle=settings.DB_POOL_MAX_IDLE,
+                configure=DatabaseConnection._configure_connection,
+                check=DatabaseConnection._check_connection,
+                open=False
+            )
+            await pool.open(wait=False)
+            self._pools[url] = pool
+        if self._pools:
+            logger.info("[Replicas] %s pools de replica abiertos (%s).", len(self._pools), self.selection)
+
+    async def close(self):
+        """Cierra los pools de las replicas."""
+        pools, self._pools = self._pools, {}
+        for pool in pools.values():
+            await pool.close()
+
+    def reset_after_fork(self):
+        """Olvida en el proceso hijo los pools heredados del padre."""
+        self._pools = {}
+        self._down_until = {}
+        self._recent_writes = OrderedDict()
+
+    def record_write(self, key: Hashable):
+        """Fija ``key`` al principal durante la ventana de lectura de lo escrito.
+
+        Se anota en este proceso y en la marca del cliente de la peticion.
+        """
+        if not self.enabled or key is None:
+            return
+        marker = _client_writes.get()
+        if marker is not None:
+            marker.written_until = time.time() + self.read_your_writes
+        self._recent_writes[key] = time.monotonic() + self.read_your_writes
+        self._recent_writes.move_to_end(key)
+        while len(self._recent_writes) > self.max_tracked_keys:
+            self._recent_writes.popitem(last=False)
+
+    def pinned_to_primary(self, key: Optional[Hashable]) -> bool:
+        """Indica si ``key`` escribio hace poco y debe leer del principal."""
+        if key is None:
+            return False
+        marker = _client_writes.get()
+        if marker is not None and marker.pinned_until is not None and marker.pinned_until > time.time():
+            return True
+        expires_at = self._recent_writes.get(key)
+        if expires_at is None:
+            return False
+        if expires_at <= time.monotonic():
+            del self._recent_writes[key]
+            return False
+        return True
+
+    def use_replica(self, key: Optional[Hashable] = None) -> bool:
+        """Indica si la lectura de ``key`` puede ir a una replica."""
+        return bool(self._pools) and not self.pinned_to_primary(key)
+
+    def _candidates(self) -> List[Tuple[str, AsyncConnectionPool]]:
+        """Replicas disponibles en el orden en que se intentaran."""
+        now = time.monotonic()
+        available = [
+            (url, pool) for url, pool in self._pools.items()
+            if self._down_until.get(url, 0) <= now
+        ]
+        if not available:
+            return []
+        start = self._next % len(available)
+        self._next += 1
+        available = available[start:] + available[:start]
+        if self.selection == "least_busy":
+            # ``sorted`` es estable: a igual carga se mantiene la rotacion
+            available.sort(key=lambda candidate: self._busy(candidate[1]))
+        return available
+
+    @staticmethod
+    def _busy(pool: AsyncConnectionPool) -> int:
+        """Conexiones en uso mas peticiones esperando en el pool."""
+        stats = pool.get_stats()
+        return stats.get("pool_size", 0) - stats.get("pool_available", 0) + stats.get("requests_waiting", 0)
+
+    def mark_down(self, pool: AsyncConnectionPool):
+        """Aparta la replica de ``pool`` durante ``retry_after`` segundos."""
+        for url, candidate in self._pools.items():
+            if candidate is pool:
+                self._down_until[url] = time.monotonic() + self.retry_after
+                logger.warning("[Replicas] Replica %s apartada durante %s s.", pool.name, self.retry_after)
+                return
+
+    async def getconn(self) -> Optional[Tuple[AsyncConnectionPool, AsyncConnection]]:
+        """Obtiene una conexion de la primera replica que responda.
+
+        Una replica con el pool saturado (``PoolTimeout``, ``TooManyRequests``)
+        se salta sin apartarla: esta sana, solo ocupada. Solo se aparta si
+        falla la conexion. Devuelve ``None`` si ninguna esta disponible.
+        """
+        for _, pool in self._candidates():
+            try:
+                connection = await pool.getconn(timeout=settings.DB_REPLICA_TIMEOUT)
+            except (PoolTimeout, TooManyRequests) as e:
+                logger.info("[Replicas] Replica %s saturada, se prueba la siguiente: %s", pool.name, e)
+                continue
+            except OperationalError:
+                self.mark_down(pool)
+                continue
+            DB_READ_ROUTING.labels("replica").inc()
+            return pool, connection
+        return None
+
+
+class ReplicaConnection(DatabaseConnection):
+    """Conexion de solo lectura servida por una replica.
+
+    Se usa igual que ``DatabaseConnection``. Si ``key`` escribio hace poco o
+    no hay replicas disponibles la conexion sale del pool principal.
+    """
+
+    def __init__(self, db_url: str, key: Optional[Hashable] = None, cursor_name: Optional[str] = None):
+        super().__init__(db_url, cursor_name=cursor_name)
+        self.key = key
+        self._from_replica = False
+
+    async def _getconn(self) -> Tuple[AsyncConnectionPool, AsyncConnection]:
+        """Obtiene la conexion de una replica o, si no procede, del principal."""
+        if not replica_router.use_replica(self.key):
+            if replica_router.enabled:
+                DB_READ_ROUTING.labels("primary_pinned").inc()
+            return await super()._getconn()
+        checked_out = await replica_router.getconn()
+        if checked_out is None:
+            DB_READ_ROUTING.labels("primary_failover").inc()
+            return await super()._getconn()
+        self._from_replica = True
+        return checked_out
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        """Devuelve la conexion y aparta la replica si la conexion fallo."""
+        pool = self._source_pool
+        try:
+            await super().__aexit__(exc_type, exc_value, traceback)
+        finally:
+            if self._from_replica and exc_type is not None and issubclass(exc_type, OperationalError):
+                replica_router.mark_down(pool)
+            self._from_replica = False
+
+
+replica_router = ReplicaRouter(
+    urls=settings.DB_REPLICA_URLS,
+    selection=settings.DB_REPLICA_SELECTION,
+    read_your_writes=settings.DB_READ_YOUR_WRITES_SECONDS,
+    retry_after=settings.DB_REPLICA_RETRY_AFTER_SECONDS,
+    max_tracked_keys=settings.DB_READ_YOUR_WRITES_MAX_USERS
+)
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=replica_router.reset_after_fork)
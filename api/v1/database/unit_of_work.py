@@ -0,0 +1,106 @@
+"""Modulo que implementa la unidad de trabajo por peticion."""
+
+import logging
+from contextlib import asynccontextmanager
+from typing import Callable, Hashable, List, Optional
+
+from psycopg import Error
+
+from api.v1.database.connection import DatabaseConnection
+from api.v1.database.replicas import ReplicaConnection, replica_router
+from core.global_config.metrics.metrics import DB_READ_ROUTING
+
+logger = logging.getLogger("app")
+
+
+class UnitOfWork:
+    """Unidad de trabajo con alcance de peticion.
+
+    Todas las operaciones de los repositorios de una peticion comparten una
+    conexion y una transaccion, que se confirma o revierte una sola vez al
+    final. La conexion se obtiene del pool en el primer uso, por lo que las
+    peticiones que no acceden a la base de datos no ocupan ninguna.
+
+    Las lecturas pedidas con ``read_cursor`` usan una conexion aparte de una
+    replica, la misma durante toda la peticion, salvo que ya haya una
+    transaccion abierta en el principal.
+    """
+
+    def __init__(self, db_url: str):
+        self.db_url = db_url
+        self._connection: Optional[DatabaseConnection] = None
+        self._cursor = None
+        self._read_connection: Optional[ReplicaConnection] = None
+        self._read_cursor = None
+        self._after_commit: List[Callable[[], None]] = []
+
+    @asynccontextmanager
+    async def cursor(self):
+        """Entrega el cursor de la transaccion en curso, abriendola si hace falta."""
+        if self._connection is None:
+            connection = DatabaseConnection(self.db_url)
+            self._cursor = await connection.__aenter__()
+            self._connection = connection
+        yield self._cursor
+
+    @asynccontextmanager
+    async def read_cursor(self, key: Optional[Hashable] = None):
+        """Entrega un cursor para consultas de solo lectura de ``key``.
+
+        Si la peticion ya escribio se lee de su propia transaccion; si ``key``
+        no puede leer de una replica se abre la transaccion principal.
+        """
+        if self._connection is not None or not replica_router.use_replica(key):
+            if self._connection is None and replica_router.enabled:
+                DB_READ_ROUTING.labels("primary_pinned").inc()
+            async with self.cursor() as cursor:
+                yield cursor
+            return
+        if self._read_connection is None:
+            connection = ReplicaConnection(self.db_url, key)
+            self._read_cursor = await connection.__aenter__()
+            self._read_connection = connection
+        yield self._read_cursor
+
+    def after_commit(self, callback: Callable[[], None]):
+        """Registra una accion que se ejecuta solo si la transaccion se confirma."""
+        self._after_commit.append(callback)
+
+    async def commit(self):
+        """Confirma la transaccion en curso y devuelve la conexion al pool.
+
+        Si despues se vuelve a usar ``cursor`` se abre una transaccion nueva,
+        lo que permite liberar la conexion antes de un trabajo lento.
+        """
+        await self._release_read(None, None)
+        connection, self._connection = self._connection, None
+        self._cursor = None
+        if connection is not None:
+            await connection.__aexit__(None, None, None)
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            callback()
+
+    async def rollback(self, exc: Optional[BaseException] = None):
+        """Revierte la transaccion en curso y devuelve la conexion al pool."""
+        exc_type = type(exc) if exc is not None else Exception
+        await self._release_read(exc_type, exc)
+        connection, self._connection = self._connection, None
+        self._cursor = None
+        self._after_commit = []
+        if connection is not None:
+            await connection.__aexit__(exc_type, exc, None)
+
+    async def _release_read(self, exc_type, exc: Optional[BaseException]):
+        """Cierra la transaccion de lectura y devuelve su conexion al pool.
+
+        Un fallo aqui no afecta a la peticion: los datos ya se leyeron y la
+        transaccion principal debe confirmarse igualmente.
+        """
+        connection, self._read_connection = self._read_connection, None
+        self._read_cursor = None
+        if connection is not None:
+            try:
+                await connection.__aexit__(exc_type, exc, None)
+            except Error:
+                logger.warning("[Repository] Error al cerrar la transaccion de lectura", exc_info=True)
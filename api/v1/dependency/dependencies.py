@@ -2,22 +2,63 @@
 from typing import Annotated
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from psycopg import IntegrityError, OperationalError
 
-from utils.auth_utils import verify_access_token
+from api.v1.database.unit_of_work import UnitOfWork
+from core.global_config.timing.timing import span
+from core.settings.settings import settings
+from utils.auth_utils import verify_access_token, verify_access_token_cached
+from utils.deactivated_users import deactivated_users
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/users/login")
 
 
-def current_user_authenticated(token: Annotated[str, Depends(oauth2_scheme)]):
-    """Dependencia para obtener el usuario actual."""
+async def current_user_authenticated(token: Annotated[str, Depends(oauth2_scheme)]):
+    """Dependencia para obtener el usuario actual.
+
+    Ademas de verificar el token se rechazan los usuarios desactivados
+    despues de emitirlo, consultando el registro en memoria.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="No se pudo validar las credenciales.",
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = verify_access_token(token)
+        with span("auth"):
+            if settings.TOKEN_CACHE_ENABLED:
+                payload = verify_access_token_cached(token)
+            else:
+                payload = verify_access_token(token)
     except Exception:
         raise credentials_exception
+    if payload.user_id in deactivated_users:
+        raise credentials_exception
     return payload
+
+
+async def get_unit_of_work():
+    """Dependencia que comparte una conexion y una transaccion por peticion.
+
+    La transaccion se confirma una sola vez al terminar la ruta y se revierte
+    si la ruta termina con una excepcion.
+    """
+    unit_of_work = UnitOfWork(settings.DB_URL)
+    try:
+        yield unit_of_work
+    except BaseException as e:
+        await unit_of_work.rollback(e)
+        raise
+    try:
+        await unit_of_work.commit()
+    except OperationalError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Servicio no disponible"
+        )
+    except IntegrityError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Conflicto con los datos existentes"
+        )
@@ -1,19 +1,31 @@
 """Modulo de dependencias para la gestion de tareas"""
 
+from typing import Optional
 from fastapi import Depends
+from api.v1.database.unit_of_work import UnitOfWork
+from api.v1.dependency.dependencies import get_unit_of_work
 from api.v1.repositories.task_repository import TaskRepository
 from api.v1.controllers.task_controller import TaskController
 from api.v1.services.task_service import TaskService
+from core.cache.caches import task_list_cache
+from core.cache.task_list_cache import TaskListCache
 from core.settings.settings import settings
 
 
-def get_task_repository():
-    return TaskRepository(settings.DB_URL)
+async def get_task_repository(unit_of_work: UnitOfWork = Depends(get_unit_of_work)):
+    return TaskRepository(settings.DB_URL, unit_of_work)
 
 
-def get_task_service(user_repository: TaskRepository = Depends(get_task_repository)):
-    return TaskService(user_repository)
+async def get_task_cache():
+    return task_list_cache if settings.TASKS_CACHE_ENABLED else None
 
 
-def get_task_controller(user_service: TaskService = Depends(get_task_service)):
+async def get_task_service(
+    user_repository: TaskRepository = Depends(get_task_repository),
+    task_cache: Optional[TaskListCache] = Depends(get_task_cache)
+):
+    return TaskService(user_repository, task_cache, user_repository.unit_of_work)
+
+
+async def get_task_controller(user_service: TaskService = Depends(get_task_service)):
     return TaskController(user_service)
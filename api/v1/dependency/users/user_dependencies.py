@@ -1,19 +1,31 @@
 """Modulo de dependencias para la gestion de usuarios"""
 
+from typing import Optional
 from fastapi import Depends
+from api.v1.database.unit_of_work import UnitOfWork
+from api.v1.dependency.dependencies import get_unit_of_work
 from api.v1.repositories.user_repository import UserRepository
 from api.v1.controllers.user_controller import UserController
 from api.v1.services.user_service import UserService
+from core.cache.caches import user_cache
+from core.cache.user_cache import UserCache
 from core.settings.settings import settings
 
 
-def get_user_repository():
-    return UserRepository(settings.DB_URL)
+async def get_user_repository(unit_of_work: UnitOfWork = Depends(get_unit_of_work)):
+    return UserRepository(settings.DB_URL, unit_of_work)
 
 
-def get_user_service(user_repository: UserRepository = Depends(get_user_repository)):
-    return UserService(user_repository)
+async def get_user_cache():
+    return user_cache if settings.USER_CACHE_ENABLED else None
 
 
-def get_user_controller(user_service: UserService = Depends(get_user_service)):
+async def get_user_service(
+    user_repository: UserRepository = Depends(get_user_repository),
+    cache: Optional[UserCache] = Depends(get_user_cache)
+):
+    return UserService(user_repository, user_repository.unit_of_work, cache)
+
+
+async def get_user_controller(user_service: UserService = Depends(get_user_service)):
     return UserController(user_service)
@@ -1,7 +1,11 @@
 """Modulo que genera el repositorios de tareas en la base de datos."""
 
-from psycopg2 import DatabaseError, IntegrityError, OperationalError
+from typing import List, Optional, Tuple
+from psycopg import DatabaseError, IntegrityError, OperationalError
+from contextlib import asynccontextmanager
 from api.v1.database.connection import DatabaseConnection
+from api.v1.database.replicas import ReplicaConnection, replica_router
+from api.v1.database.unit_of_work import UnitOfWork
 import logging
 
 from core.global_config.exceptions.exceptions import (
@@ -9,6 +13,7 @@ from core.global_config.exceptions.exceptions import (
     RepositoryConnectionError,
     RepositoryQueryError
 )
+from core.global_config.timing.timing import span, timed
 
 
 logger = logging.getLogger("app")
@@ -17,10 +22,48 @@ logger = logging.getLogger("app")
 class TaskRepository:
     """Repositorio para la gestion de tareas en la base de datos."""
 
-    def __init__(self, db_url: str):
+    def __init__(self, db_url: str, unit_of_work: Optional[UnitOfWork] = None):
         self.db_url = db_url
+        self.unit_of_work = unit_of_work
 
-    def create_task(self, title: str, description: str, user_id: int, completed: bool = False):
+    @asynccontextmanager
+    async def _cursor(self):
+        """Entrega el cursor de la unidad de trabajo o uno con conexion propia.
+
+        El tiempo dentro del bloque se suma al tramo ``sql``.
+        """
+        if self.unit_of_work is not None:
+            connection = self.unit_of_work.cursor()
+        else:
+            connection = DatabaseConnection(self.db_url)
+        async with connection as cursor:
+            with span("sql"):
+                yield cursor
+
+    @asynccontextmanager
+    async def _read_cursor(self, user_id: int):
+        """Como ``_cursor`` pero para consultas de solo lectura del usuario.
+
+        Se sirven desde una replica cuando las hay, salvo que el usuario haya
+        escrito hace poco.
+        """
+        if self.unit_of_work is not None:
+            connection = self.unit_of_work.read_cursor(user_id)
+        else:
+            connection = ReplicaConnection(self.db_url, user_id)
+        async with connection as cursor:
+            with span("sql"):
+                yield cursor
+
+    def _record_write(self, user_id: int):
+        """Anota que el usuario escribio, al confirmarse la transaccion."""
+        if self.unit_of_work is not None:
+            self.unit_of_work.after_commit(lambda: replica_router.record_write(user_id))
+        else:
+            replica_router.record_write(user_id)
+
+    @timed("repository")
+    async def create_task(self, title: str, description: str, user_id: int, completed: bool = False):
         """Crea una nueva tarea en la base de datos."""
         sql = """
         INSERT INTO tasks (title, description, completed, user_id)
@@ -28,10 +71,11 @@ class TaskRepository:
         RETURNING id;
         """
         try:
-            with DatabaseConnection(self.db_url) as cursor:
-                cursor.execute(sql, (title, description, completed, user_id))
-                task_id = cursor.fetchone()[0]
-            logger.info(f"[Repository] Tarea creada exitósamente con ID: {task_id}")
+            async with self._cursor() as cursor:
+                await cursor.execute(sql, (title, description, completed, user_id))
+                task_id = (await cursor.fetchone())[0]
+                await self._bump_list_version(cursor, user_id)
+            logger.info("[Repository] Tarea creada exitósamente con ID: %s", task_id)
             return task_id
         except OperationalError as e:
             logger.error("[Repository] Base de datos no disponible al crear la tarea", exc_info=True)
@@ -43,7 +87,71 @@ class TaskRepository:
             logger.error("[Repository] Error de base de datos al crear la tarea", exc_info=True)
             raise RepositoryQueryError("Error interno en la base de datos") from e
 
-    def update_task(self, task_id: int, title: str, description: str, completed: bool, user_id: int):
+    @timed("repository")
+    async def create_tasks(self, tasks: List[Tuple[str, Optional[str], bool]], user_id: int, copy_threshold: int):
+        """Crea varias tareas en una sola transaccion.
+
+        ``tasks`` es una lista de tuplas ``(title, description, completed)``.
+        Los lotes pequeños se insertan con un unico ``INSERT ... SELECT`` sobre
+        ``unnest``; a partir de ``copy_threshold`` tareas se reservan los IDs de
+        la secuencia y se cargan las filas con ``COPY``. Devuelve los IDs en el
+        mismo orden que ``tasks``.
+        """
+        try:
+            async with self._cursor() as cursor:
+                if len(tasks) < copy_threshold:
+                    task_ids = await self._insert_tasks(cursor, tasks, user_id)
+                else:
+                    task_ids = await self._copy_tasks(cursor, tasks, user_id)
+                if task_ids:
+                    await self._bump_list_version(cursor, user_id)
+            logger.info("[Repository] %s tareas creadas por lote para el usuario %s", len(task_ids), user_id)
+            return task_ids
+        except OperationalError as e:
+            logger.error("[Repository] Base de datos no disponible al crear las tareas", exc_info=True)
+            raise RepositoryConnectionError("Base de datos no disponible") from e
+        except IntegrityError as e:
+            logger.warning("[Repository] Violación de integridad al crear las tareas", exc_info=True)
+            raise RepositoryConflictError("Conflicto de datos") from e
+        except DatabaseError as e:
+            logger.error("[Repository] Error de base de datos al crear las tareas", exc_info=True)
+            raise RepositoryQueryError("Error interno en la base de datos") from e
+
+    @staticmethod
+    async def _insert_tasks(cursor, tasks, user_id: int):
+        """Inserta el lote con un unico INSERT multi-fila."""
+        sql = """
+        INSERT INTO tasks (title, description, completed, user_id)
+        SELECT t.title, t.description, t.completed, %s
+        FROM unnest(%s::varchar[], %s::text[], %s::boolean[])
+            WITH ORDINALITY AS t(title, description, completed, ord)
+        ORDER BY t.ord
+        RETURNING id;
+        """
+        titles, descriptions, completed = (list(column) for column in zip(*tasks))
+        await cursor.execute(sql, (user_id, titles, descriptions, completed))
+        # Las filas se insertan en el orden de ``ord`` y la secuencia es
+        # creciente, por lo que ordenar los IDs recupera el orden de entrada.
+        return sorted(row[0] for row in await cursor.fetchall())
+
+    @staticmethod
+    async def _copy_tasks(cursor, tasks, user_id: int):
+        """Reserva los IDs del lote y carga las filas con COPY."""
+        sql_ids = """
+        SELECT nextval(pg_get_serial_sequence('tasks', 'id'))
+        FROM generate_series(1, %s);
+        """
+        await cursor.execute(sql_ids, (len(tasks),))
+        task_ids = sorted(row[0] for row in await cursor.fetchall())
+        async with cursor.copy(
+            "COPY tasks (id, title, description, completed, user_id) FROM STDIN"
+        ) as copy:
+            for task_id, (title, description, completed) in zip(task_ids, tasks):
+                await copy.write_row((task_id, title, description, completed, user_id))
+        return task_ids
+
+    @timed("repository")
+    async def update_task(self, task_id: int, title: str, description: str, completed: bool, user_id: int):
         """Actualiza el estado de completitud de una tarea."""
         sql = """
         UPDATE tasks
@@ -54,15 +162,17 @@ class TaskRepository:
         RETURNING id;
         """
         try:
-            with DatabaseConnection(self.db_url) as cursor:
-                cursor.execute(sql, (title, description, completed, task_id, user_id))
-                result = cursor.fetchone()
+            async with self._cursor() as cursor:
+                await cursor.execute(sql, (title, description, completed, task_id, user_id))
+                result = await cursor.fetchone()
+                if result is not None:
+                    await self._bump_list_version(cursor, user_id)
 
             if result is None:
-                logger.warning(f"[Repository] No se encontró la tarea {task_id} para el usuario {user_id}")
+                logger.warning("[Repository] No se encontró la tarea %s para el usuario %s", task_id, user_id)
                 return None
             updated_task_id = result[0]
-            logger.info(f"[Repository] Tarea {task_id} actualizada exitosamente por el usuario {user_id}")
+            logger.info("[Repository] Tarea %s actualizada exitosamente por el usuario %s", task_id, user_id)
             return updated_task_id
         except OperationalError as e:
             logger.error("[Repository] Base de datos no disponible al actualizar la tarea", exc_info=True)
@@ -74,7 +184,8 @@ class TaskRepository:
             logger.error("[Repository] Error al actualizar la tarea", exc_info=True)
             raise RepositoryQueryError("No se pudo actualizar la tarea en la base de datos.") from e
 
-    def delete_task(self, task_id: int, user_id: int):
+    @timed("repository")
+    async def delete_task(self, task_id: int, user_id: int):
         """Elimina una tarea de la base de datos."""
         sql = """
         DELETE FROM tasks
@@ -82,15 +193,17 @@ class TaskRepository:
         RETURNING id;
         """
         try:
-            with DatabaseConnection(self.db_url) as cursor:
-                cursor.execute(sql, (task_id, user_id))
-                result = cursor.fetchone()
+            async with self._cursor() as cursor:
+                await cursor.execute(sql, (task_id, user_id))
+                result = await cursor.fetchone()
+                if result is not None:
+                    await self._bump_list_version(cursor, user_id)
 
             if result is None:
-                logger.warning(f"[Repository] No se encontró la tarea {task_id} para el usuario {user_id}")
+                logger.warning("[Repository] No se encontró la tarea %s para el usuario %s", task_id, user_id)
                 return None
             deleted_task_id = result[0]
-            logger.info(f"[Repository] Tarea {deleted_task_id} eliminada exitosamente por el usuario {user_id}")
+            logger.info("[Repository] Tarea %s eliminada exitosamente por el usuario %s", deleted_task_id, user_id)
             return deleted_task_id
         except OperationalError as e:
             logger.error("[Repository] Base de datos no disponible al eliminar la tarea", exc_info=True)
@@ -102,32 +215,163 @@ class TaskRepository:
             logger.error("[Repository] Error al eliminar la tarea", exc_info=True)
             raise RepositoryQueryError("No se pudo eliminar la tarea en la base de datos.") from e
 
-    def get_task_by_user_id(self, user_id: int):
-        """Obtiene todas las tareas asociadas a un usuario."""
+    @timed("repository")
+    async def update_tasks_completed(
+        self,
+        user_id: int,
+        completed: bool,
+        task_ids: Optional[List[int]] = None,
+        where_completed: Optional[bool] = None
+    ):
+        """Cambia el estado de varias tareas del usuario en una sola sentencia.
+
+        Devuelve los IDs de las tareas que coincidieron con el filtro.
+        """
+        conditions, params = self._batch_conditions(user_id, task_ids, where_completed)
+        sql = f"""
+        UPDATE tasks
+        SET completed = %s
+        WHERE {conditions}
+        RETURNING id;
+        """
+        try:
+            async with self._cursor() as cursor:
+                await cursor.execute(sql, [completed, *params])
+                updated_task_ids = [row[0] for row in await cursor.fetchall()]
+                if updated_task_ids:
+                    await self._bump_list_version(cursor, user_id)
+            logger.info("[Repository] %s tareas actualizadas por lote para el usuario %s", len(updated_task_ids), user_id)
+            return updated_task_ids
+        except OperationalError as e:
+            logger.error("[Repository] Base de datos no disponible al actualizar las tareas", exc_info=True)
+            raise RepositoryConnectionError("Base de datos no disponible") from e
+        except IntegrityError as e:
+            logger.warning("[Repository] Violación de integridad al actualizar las tareas", exc_info=True)
+            raise RepositoryConflictError("Conflicto de datos") from e
+        except DatabaseError as e:
+            logger.error("[Repository] Error al actualizar las tareas", exc_info=True)
+            raise RepositoryQueryError("No se pudieron actualizar las tareas en la base de datos.") from e
+
+    @timed("repository")
+    async def delete_tasks(
+        self,
+        user_id: int,
+        task_ids: Optional[List[int]] = None,
+        where_completed: Optional[bool] = None
+    ):
+        """Elimina varias tareas del usuario en una sola sentencia.
+
+        Devuelve los IDs de las tareas eliminadas.
+        """
+        conditions, params = self._batch_conditions(user_id, task_ids, where_completed)
+        sql = f"""
+        DELETE FROM tasks
+        WHERE {conditions}
+        RETURNING id;
+        """
+        try:
+            async with self._cursor() as cursor:
+                await cursor.execute(sql, params)
+                deleted_task_ids = [row[0] for row in await cursor.fetchall()]
+                if deleted_task_ids:
+                    await self._bump_list_version(cursor, user_id)
+            logger.info("[Repository] %s tareas eliminadas por lote para el usuario %s", len(deleted_task_ids), user_id)
+            return deleted_task_ids
+        except OperationalError as e:
+            logger.error("[Repository] Base de datos no disponible al eliminar las tareas", exc_info=True)
+            raise RepositoryConnectionError("Base de datos no disponible") from e
+        except IntegrityError as e:
+            logger.warning("[Repository] Violación de integridad al eliminar las tareas", exc_info=True)
+            raise RepositoryConflictError("Conflicto de datos") from e
+        except DatabaseError as e:
+            logger.error("[Repository] Error al eliminar las tareas", exc_info=True)
+            raise RepositoryQueryError("No se pudieron eliminar las tareas en la base de datos.") from e
+
+    async def _bump_list_version(self, cursor, user_id: int):
+        """Incrementa la version del listado de tareas del usuario.
+
+        Se ejecuta en la misma transaccion que la escritura, de modo que la
+        nueva version solo es visible junto con los cambios. El usuario pasa
+        a leer del principal durante la ventana de lectura de lo escrito.
+        """
+        self._record_write(user_id)
+        sql = """
+        INSERT INTO task_list_versions (user_id, version)
+        VALUES (%s, 1)
+        ON CONFLICT (user_id) DO UPDATE
+        SET version = task_list_versions.version + 1;
+        """
+        await cursor.execute(sql, (user_id,))
+
+    @timed("repository")
+    async def get_task_list_version(self, user_id: int) -> int:
+        """Obtiene la version del listado de tareas del usuario (0 si nunca cambio)."""
+        sql = """
+        SELECT version
+        FROM task_list_versions
+        WHERE user_id = %s;
+        """
+        try:
+            async with self._read_cursor(user_id) as cursor:
+                await cursor.execute(sql, (user_id,))
+                result = await cursor.fetchone()
+            return result[0] if result is not None else 0
+        except OperationalError as e:
+            logger.error("[Repository] Base de datos no disponible al obtener la version de las tareas", exc_info=True)
+            raise RepositoryConnectionError("Base de datos no disponible") from e
+        except DatabaseError as e:
+            logger.error("[Repository] Error al obtener la version de las tareas", exc_info=True)
+            raise RepositoryQueryError("No se pudo obtener la version de las tareas.") from e
+
+    @staticmethod
+    def _batch_conditions(user_id: int, task_ids: Optional[List[int]], where_completed: Optional[bool]):
+        """Construye el filtro de las operaciones por lotes.
+
+        El filtro siempre incluye ``user_id``, igual que las operaciones
+        individuales, para que un usuario solo afecte a sus propias tareas.
+        """
+        conditions = ["user_id = %s"]
+        params = [user_id]
+        if task_ids is not None:
+            conditions.append("id = ANY(%s)")
+            params.append(task_ids)
+        if where_completed is not None:
+            conditions.append("completed = %s")
+            params.append(where_completed)
+        return " AND ".join(conditions), params
+
+    @timed("repository")
+    async def get_task_by_user_id(self, user_id: int, limit: Optional[int] = None, after: Optional[int] = None):
+        """Obtiene las tareas asociadas a un usuario.
+
+        Las tareas se devuelven ordenadas por ``id``. Si se indica ``limit`` se
+        devuelve una pagina de como maximo ``limit`` tareas cuyo ``id`` es mayor
+        que ``after`` (paginacion por cursor sobre ``id``).
+        """
         sql = """
         SELECT id, title, description, completed, user_id
         FROM tasks
-        WHERE user_id = %s;
+        WHERE user_id = %s
         """
+        params = [user_id]
+        if after is not None:
+            sql += " AND id > %s"
+            params.append(after)
+        sql += " ORDER BY id"
+        if limit is not None:
+            sql += " LIMIT %s"
+            params.append(limit)
         try:
-            with DatabaseConnection(self.db_url) as cursor:
-                cursor.execute(sql, (user_id,))
-                tasks = cursor.fetchall()
+            async with self._read_cursor(user_id) as cursor:
+                await cursor.execute(sql, params)
+                tasks = await cursor.fetchall()
 
             if not tasks:
-                logger.warning(f"[Repository] No se encontraron tareas para el usuario con ID: {user_id}")
+                logger.warning("[Repository] No se encontraron tareas para el usuario con ID: %s", user_id)
                 return []
-            task_list = [
-                {
-                    "id": row[0],
-                    "title": row[1],
-                    "description": row[2],
-                    "completed": row[3],
-                    "user_id": row[4]
-                }
-                for row in tasks
-            ]
-            logger.info(f"[Repository] {len(task_list)} tareas obtenidas para el usuario {user_id}")
+            with span("map"):
+                task_list = self._rows_to_tasks(tasks)
+            logger.info("[Repository] %s tareas obtenidas para el usuario %s", len(task_list), user_id)
             return task_list
         except OperationalError as e:
             logger.error("[Repository] Base de datos no disponible al obtener las tareas", exc_info=True)
@@ -135,3 +379,117 @@ class TaskRepository:
         except DatabaseError as e:
             logger.error("[Repository] Error al obtener las tareas del usuario", exc_info=True)
             raise RepositoryQueryError("No se pudieron obtener las tareas del usuario desde la base de datos.") from e
+
+    @timed("repository")
+    async def get_task_summary(self, user_id: int):
+        """Obtiene los contadores de tareas del usuario.
+
+        Es una lectura por clave primaria de ``user_task_counters``, que los
+        triggers de la migracion 0006 mantienen en cada escritura.
+        """
+        sql = """
+        SELECT total, completed
+        FROM user_task_counters
+        WHERE user_id = %s;
+        """
+        try:
+            async with self._read_cursor(user_id) as cursor:
+                await cursor.execute(sql, (user_id,))
+                result = await cursor.fetchone()
+            total, completed = result if result is not None else (0, 0)
+            return {"total": total, "completed": completed, "pending": total - completed}
+        except OperationalError as e:
+            logger.error("[Repository] Base de datos no disponible al obtener el resumen de tareas", exc_info=True)
+            raise RepositoryConnectionError("Base de datos no disponible") from e
+        except DatabaseError as e:
+            logger.error("[Repository] Error al obtener el resumen de tareas", exc_info=True)
+            raise RepositoryQueryError("No se pudo obtener el resumen de tareas.") from e
+
+    @timed("repository")
+    async def search_tasks(self, user_id: int, query: str, limit: int):
+        """Busca tareas del usuario por texto completo y por similitud del titulo.
+
+        Una tarea coincide si su titulo o descripcion contiene los terminos de
+        ``query`` (sintaxis de ``websearch_to_tsquery``) o si ``query`` se
+        parece a alguna palabra del titulo (``<%``, tolerante a erratas y
+        prefijos). Los resultados se ordenan por relevancia: el ranking de
+        texto completo, con el titulo pesando mas que la descripcion, mas la
+        similitud de trigramas. Ambos filtros usan los indices GIN por
+        ``user_id`` de la migracion 0005.
+        """
+        search_vector = (
+            "(setweight(to_tsvector('spanish', title), 'A')"
+            " || setweight(to_tsvector('spanish', coalesce(description, '')), 'B'))"
+        )
+        sql = f"""
+        SELECT id, title, description, completed, user_id
+        FROM tasks, websearch_to_tsquery('spanish', %s) AS query
+        WHERE user_id = %s
+          AND ({search_vector} @@ query OR %s <%% title)
+        ORDER BY ts_rank({search_vector}, query) + word_similarity(%s, title) DESC, id
+        LIMIT %s;
+        """
+        try:
+            async with self._read_cursor(user_id) as cursor:
+                await cursor.execute(sql, (query, user_id, query, query, limit))
+                tasks = await cursor.fetchall()
+            with span("map"):
+                task_list = self._rows_to_tasks(tasks)
+            logger.info("[Repository] %s tareas encontradas en la busqueda del usuario %s", len(task_list), user_id)
+            return task_list
+        except OperationalError as e:
+            logger.error("[Repository] Base de datos no disponible al buscar tareas", exc_info=True)
+            raise RepositoryConnectionError("Base de datos no disponible") from e
+        except DatabaseError as e:
+            logger.error("[Repository] Error al buscar las tareas del usuario", exc_info=True)
+            raise RepositoryQueryError("No se pudieron buscar las tareas del usuario en la base de datos.") from e
+
+    async def iter_tasks_by_user_id(self, user_id: int, batch_size: int = 1000):
+        """Recorre las tareas de un usuario por bloques de ``batch_size``.
+
+        Usa un cursor con nombre del lado del servidor, de modo que solo un
+        bloque de filas se mantiene en memoria a la vez. La conexion queda
+        ocupada hasta que el generador se agota o se cierra.
+        """
+        sql = """
+        SELECT id, title, description, completed, user_id
+        FROM tasks
+        WHERE user_id = %s
+        ORDER BY id
+        """
+        try:
+            async with ReplicaConnection(self.db_url, user_id, cursor_name=f"tasks_stream_{user_id}") as cursor:
+                cursor.itersize = batch_size
+                await cursor.execute(sql, (user_id,))
+                total = 0
+                while True:
+                    rows = await cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    total += len(rows)
+                    yield self._rows_to_tasks(rows)
+            logger.info("[Repository] %s tareas enviadas por bloques para el usuario %s", total, user_id)
+        except OperationalError as e:
+            logger.error("[Repository] Base de datos no disponible al recorrer las tareas", exc_info=True)
+            raise RepositoryConnectionError("Base de datos no disponible") from e
+        except DatabaseError as e:
+            logger.error("[Repository] Error al recorrer las tareas del usuario", exc_info=True)
+            raise RepositoryQueryError("No se pudieron obtener las tareas del usuario desde la base de datos.") from e
+
+    @staticmethod
+    def _rows_to_tasks(rows):
+        """Convierte filas de la tabla ``tasks`` en diccionarios.
+
+        El diccionario se construye dentro de la comprension, sin una llamada
+        por fila, porque este mapeo recorre listados de miles de tareas.
+        """
+        return [
+            {
+                "id": row[0],
+                "title": row[1],
+                "description": row[2],
+                "completed": row[3],
+                "user_id": row[4]
+            }
+            for row in rows
+        ]
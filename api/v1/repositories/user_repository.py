@@ -1,7 +1,11 @@
 """Modulo que genera los repositorios de usuarios en la base de datos."""
 
-from psycopg2 import DatabaseError, IntegrityError, OperationalError
+from typing import Optional, Set
+from psycopg import DatabaseError, IntegrityError, OperationalError
+from contextlib import asynccontextmanager
 from api.v1.database.connection import DatabaseConnection
+from api.v1.database.replicas import ReplicaConnection, replica_router
+from api.v1.database.unit_of_work import UnitOfWork
 import logging
 
 from core.global_config.exceptions.exceptions import (
@@ -9,17 +13,49 @@ from core.global_config.exceptions.exceptions import (
     RepositoryConnectionError,
     RepositoryQueryError
 )
+from core.global_config.timing.timing import span, timed
 
 logger = logging.getLogger("app")
 
+# Canal de LISTEN/NOTIFY por el que el trigger ``users_notify_status`` (migracion
+# 0007) avisa de los usuarios creados y de sus cambios de estado
+USER_STATUS_CHANNEL = "user_status"
+
 
 class UserRepository:
     """Repositorio para la gestion de usuarios en la base de datos."""
 
-    def __init__(self, db_url: str):
+    def __init__(self, db_url: str, unit_of_work: Optional[UnitOfWork] = None):
         self.db_url = db_url
+        self.unit_of_work = unit_of_work
+
+    @asynccontextmanager
+    async def _cursor(self):
+        """Entrega el cursor de la unidad de trabajo o uno con conexion propia.
+
+        El tiempo dentro del bloque se suma al tramo ``sql``.
+        """
+        if self.unit_of_work is not None:
+            connection = self.unit_of_work.cursor()
+        else:
+            connection = DatabaseConnection(self.db_url)
+        async with connection as cursor:
+            with span("sql"):
+                yield cursor
+
+    @asynccontextmanager
+    async def _read_cursor(self):
+        """Como ``_cursor`` pero para consultas de solo lectura, servidas por una replica si las hay."""
+        if self.unit_of_work is not None:
+            connection = self.unit_of_work.read_cursor()
+        else:
+            connection = ReplicaConnection(self.db_url)
+        async with connection as cursor:
+            with span("sql"):
+                yield cursor
 
-    def create_user(self, username: str, email: str, hashed_password: str, is_active: bool = True):
+    @timed("repository")
+    async def create_user(self, username: str, email: str, hashed_password: str, is_active: bool = True):
         """Crea un nuevo usuario en la base de datos."""
         sql = """
         INSERT INTO users (username, email, hashed_password, is_active)
@@ -27,10 +63,10 @@ class UserRepository:
         RETURNING id;
         """
         try:
-            with DatabaseConnection(self.db_url) as cursor:
-                cursor.execute(sql, (username, email, hashed_password, is_active))
-                user_id = cursor.fetchone()[0]
-            logger.info(f"[Repository] Usuario creado exitósamente con ID: {user_id}")
+            async with self._cursor() as cursor:
+                await cursor.execute(sql, (username, email, hashed_password, is_active))
+                user_id = (await cursor.fetchone())[0]
+            logger.info("[Repository] Usuario creado exitósamente con ID: %s", user_id)
             return user_id
         except OperationalError as e:
             logger.error("[Repository] Base de datos no disponible al crear el usuario", exc_info=True)
@@ -42,8 +78,13 @@ class UserRepository:
             logger.error("[Repository] Error de base de datos al crear el usuario", exc_info=True)
             raise RepositoryQueryError("Error interno en la base de datos") from e
 
-    def user_update_status(self, user_id: int, is_active: bool):
-        """Actualiza el estado activo de un usuario."""
+    @timed("repository")
+    async def user_update_status(self, user_id: int, is_active: bool):
+        """Actualiza el estado activo de un usuario.
+
+        El trigger ``users_notify_status`` publica el cambio en el canal
+        ``USER_STATUS_CHANNEL``; PostgreSQL solo lo entrega si se confirma.
+        """
         sql = """
         UPDATE users
         SET is_active = %s
@@ -51,15 +92,15 @@ class UserRepository:
         RETURNING id;
         """
         try:
-            with DatabaseConnection(self.db_url) as cursor:
-                cursor.execute(sql, (is_active, user_id))
-                result = cursor.fetchone()
+            async with self._cursor() as cursor:
+                await cursor.execute(sql, (is_active, user_id))
+                result = await cursor.fetchone()
 
             if result is None:
-                logging.warning(f"[Repository] No se encontró el usuario con ID: {user_id}")
+                logger.warning("[Repository] No se encontró el usuario con ID: %s", user_id)
                 return None
             updated_user_id = result[0]
-            logger.info(f"[Repository] Estado del usuario con ID {user_id} actualizado a {is_active}")
+            logger.info("[Repository] Estado del usuario con ID %s actualizado a %s", user_id, is_active)
             return updated_user_id
         except OperationalError as e:
             logger.error("[Repository] Base de datos no disponible al actualizar el usuario", exc_info=True)
@@ -71,20 +112,31 @@ class UserRepository:
             logger.error("[Repository] Error al actualizar el usuario", exc_info=True)
             raise RepositoryQueryError("No se pudo actualizar el usuario en la base de datos") from e
 
-    def get_user_by_email_or_username(self, identifier: str):
-        """Obtiene un usuario por su email o nombre de usuario."""
+    @timed("repository")
+    async def get_user_by_email_or_username(self, identifier: str, primary: bool = False):
+        """Obtiene un usuario por su email o nombre de usuario.
+
+        Se lee de una replica si las hay; si alli no aparece se confirma en el
+        principal, porque el usuario puede haberse creado hace un momento. Con
+        ``primary`` se lee directamente del principal.
+        """
         sql = """
         SELECT id, username, email, hashed_password, is_active
         FROM users
         WHERE email = %s OR username = %s;
         """
         try:
-            with DatabaseConnection(self.db_url) as cursor:
-                cursor.execute(sql, (identifier, identifier))
-                user = cursor.fetchone()
+            from_replica = not primary and replica_router.use_replica()
+            async with (self._read_cursor() if from_replica else self._cursor()) as cursor:
+                await cursor.execute(sql, (identifier, identifier))
+                user = await cursor.fetchone()
+            if user is None and from_replica:
+                async with self._cursor() as cursor:
+                    await cursor.execute(sql, (identifier, identifier))
+                    user = await cursor.fetchone()
 
             if user is None:
-                logger.info(f"[Repository] No se encontró el usuario {identifier}")
+                logger.info("[Repository] No se encontró el usuario %s", identifier)
                 return None
             user_data = {
                 "id": user[0],
@@ -93,7 +145,7 @@ class UserRepository:
                 "hashed_password": user[3],
                 "is_active": user[4]
             }
-            logger.info(f"[Repository] Usuario encontrado {identifier}")
+            logger.info("[Repository] Usuario encontrado %s", identifier)
             return user_data
         except OperationalError as e:
             logger.error("[Repository] Base de datos no disponible al obtener el usuario", exc_info=True)
@@ -101,3 +153,22 @@ class UserRepository:
         except DatabaseError as e:
             logger.error("[Repository] Error al obtener el usuario", exc_info=True)
             raise RepositoryQueryError("No se pudo obtener el usuario desde la base de datos") from e
+
+    @timed("repository")
+    async def get_inactive_user_ids(self) -> Set[int]:
+        """Obtiene los IDs de todos los usuarios desactivados."""
+        sql = """
+        SELECT id
+        FROM users
+        WHERE NOT is_active;
+        """
+        try:
+            async with self._cursor() as cursor:
+                await cursor.execute(sql)
+                return {row[0] for row in await cursor.fetchall()}
+        except OperationalError as e:
+            logger.error("[Repository] Base de datos no disponible al obtener los usuarios inactivos", exc_info=True)
+            raise RepositoryConnectionError("Base de datos no disponible") from e
+        except DatabaseError as e:
+            logger.error("[Repository] Error al obtener los usuarios inactivos", exc_info=True)
+            raise RepositoryQueryError("No se pudieron obtener los usuarios inactivos") from e
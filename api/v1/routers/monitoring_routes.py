@@ -0,0 +1,42 @@
+"""Modulo que genera las rutas de monitorizacion de la API."""
+
+from fastapi import APIRouter, Response, status
+from fastapi.responses import JSONResponse
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, generate_latest, multiprocess
+from psycopg import Error
+
+from api.v1.database.connection import DatabaseConnection
+from core.global_config.metrics.metrics import MULTIPROCESS, refresh_gauge_functions
+from core.settings.settings import settings
+
+router = APIRouter(tags=["Monitoring"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Metricas Prometheus; con varios workers, las agregadas de todos ellos."""
+    if not MULTIPROCESS:
+        return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+    refresh_gauge_functions()
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return Response(content=generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+
+
+@router.get("/healthz", include_in_schema=False)
+async def healthz():
+    """Liveness: el proceso responde. No hace I/O."""
+    return {"status": "ok"}
+
+
+@router.get("/readyz", include_in_schema=False)
+async def readyz():
+    """Readiness: el pool entrega una conexion sana en ``READINESS_TIMEOUT`` segundos."""
+    try:
+        await DatabaseConnection.ping(timeout=settings.READINESS_TIMEOUT)
+    except Error:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "unavailable"}
+        )
+    return {"status": "ready"}
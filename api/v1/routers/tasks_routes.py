@@ -1,52 +1,127 @@
 """Modulo que genera las rutas para las tareas."""
 
-from fastapi import APIRouter, Depends
+from typing import Annotated, Optional
+from fastapi import APIRouter, Depends, Header, Query, Response
 from api.v1.controllers.task_controller import TaskController
 from api.v1.dependency.dependencies import current_user_authenticated
 from api.v1.schemas.auth.auth_token import UserAuthData
+from api.v1.schemas.tasks.task_batch_create import TaskBatchCreate
+from api.v1.schemas.tasks.task_batch_filter import TaskBatchQueryFilter
+from api.v1.schemas.tasks.task_batch_update import TaskBatchUpdate
 from api.v1.schemas.tasks.task_create import TaskCreate
 from api.v1.schemas.tasks.task_message_response import TaskMessageResponse
 from api.v1.schemas.tasks.task_update import TaskUpdate
 from api.v1.dependency.tasks.tasks_dependecies import get_task_controller
+from core.settings.settings import settings
+from core.global_config.timing.timed_route import TimedRoute
 
-router = APIRouter(tags=["Tasks"])
+router = APIRouter(tags=["Tasks"], route_class=TimedRoute)
 
 
 @router.post("/create", response_model=TaskMessageResponse)
-def create_task(
+async def create_task(
     task_data: TaskCreate,
     current_user: UserAuthData = Depends(current_user_authenticated),
     controller: TaskController = Depends(get_task_controller)
 ):
     user_id = current_user.user_id
-    return controller.create_task(task_data, user_id)
+    return await controller.create_task(task_data, user_id)
+
+
+@router.post("/create-batch", response_model=TaskMessageResponse)
+async def create_tasks(
+    task_batch: TaskBatchCreate,
+    current_user: UserAuthData = Depends(current_user_authenticated),
+    controller: TaskController = Depends(get_task_controller)
+):
+    user_id = current_user.user_id
+    return await controller.create_tasks(task_batch, user_id)
 
 
 @router.put("/update", response_model=TaskMessageResponse)
-def update_task(
+async def update_task(
     task_id: int,
     update_data: TaskUpdate,
     current_user: UserAuthData = Depends(current_user_authenticated),
     controller: TaskController = Depends(get_task_controller)
 ):
     user_id = current_user.user_id
-    return controller.update_task(task_id, update_data, user_id)
+    return await controller.update_task(task_id, update_data, user_id)
 
 
 @router.delete("/delete", response_model=TaskMessageResponse)
-def delete_task(
+async def delete_task(
     task_id: int,
     current_user: UserAuthData = Depends(current_user_authenticated),
     controller: TaskController = Depends(get_task_controller)
 ):
     user_id = current_user.user_id
-    return controller.delete_task(task_id, user_id)
+    return await controller.delete_task(task_id, user_id)
+
+
+@router.put("/update-batch", response_model=TaskMessageResponse)
+async def update_tasks(
+    task_batch: TaskBatchUpdate,
+    current_user: UserAuthData = Depends(current_user_authenticated),
+    controller: TaskController = Depends(get_task_controller)
+):
+    user_id = current_user.user_id
+    return await controller.update_tasks(task_batch, user_id)
+
+
+@router.delete("/delete-batch", response_model=TaskMessageResponse)
+async def delete_tasks(
+    task_filter: Annotated[TaskBatchQueryFilter, Query()],
+    current_user: UserAuthData = Depends(current_user_authenticated),
+    controller: TaskController = Depends(get_task_controller)
+):
+    user_id = current_user.user_id
+    return await controller.delete_tasks(task_filter, user_id)
 
 
 @router.get("/get", response_model=TaskMessageResponse)
-def get_tasks(
+async def get_tasks(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=settings.TASKS_PAGE_MAX_LIMIT),
+    after: Optional[int] = Query(None, ge=0),
+    if_none_match: Optional[str] = Header(None),
+    current_user: UserAuthData = Depends(current_user_authenticated),
+    controller: TaskController = Depends(get_task_controller)
+):
+    user_id = current_user.user_id
+    return await controller.get_tasks(
+        user_id,
+        response,
+        limit=limit,
+        after=after,
+        if_none_match=if_none_match
+    )
+
+
+@router.get("/summary", response_model=TaskMessageResponse)
+async def get_task_summary(
+    current_user: UserAuthData = Depends(current_user_authenticated),
+    controller: TaskController = Depends(get_task_controller)
+):
+    user_id = current_user.user_id
+    return await controller.get_task_summary(user_id)
+
+
+@router.get("/search", response_model=TaskMessageResponse)
+async def search_tasks(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(settings.TASKS_SEARCH_DEFAULT_LIMIT, ge=1, le=settings.TASKS_SEARCH_MAX_LIMIT),
+    current_user: UserAuthData = Depends(current_user_authenticated),
+    controller: TaskController = Depends(get_task_controller)
+):
+    user_id = current_user.user_id
+    return await controller.search_tasks(user_id, q, limit)
+
+
+@router.get("/get/stream")
+async def stream_tasks(
     current_user: UserAuthData = Depends(current_user_authenticated),
     controller: TaskController = Depends(get_task_controller)
 ):
     user_id = current_user.user_id
-    return controller.get_tasks(user_id)
+    return await controller.stream_tasks(user_id, settings.TASKS_STREAM_BATCH_SIZE)
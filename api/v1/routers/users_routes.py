@@ -1,7 +1,7 @@
 """Modulo que genera las rutas para los usuarios."""
 
 from typing_extensions import Annotated
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from fastapi.security import OAuth2PasswordRequestForm
 from api.v1.controllers.user_controller import UserController
 from api.v1.dependency.dependencies import current_user_authenticated
@@ -10,34 +10,37 @@ from api.v1.schemas.users.user_create import UserCreate
 from api.v1.schemas.users.user_message_response import UserMessageResponse
 from api.v1.schemas.users.user_update import UserUpdate
 from api.v1.dependency.users.user_dependencies import get_user_controller
+from core.global_config.timing.timed_route import TimedRoute
 
-router = APIRouter(tags=["Users"])
+router = APIRouter(tags=["Users"], route_class=TimedRoute)
 
 
 @router.post("/register", response_model=UserMessageResponse)
-def register_user(
+async def register_user(
     user_data: UserCreate,
     controller: UserController = Depends(get_user_controller)
 ):
-    data = controller.register_user(user_data)
+    data = await controller.register_user(user_data)
     return data
 
 
 @router.put("/update-status", response_model=UserMessageResponse)
-def update_status_user(
+async def update_status_user(
     update_data: UserUpdate,
     current_user: UserAuthData = Depends(current_user_authenticated),
     controller: UserController = Depends(get_user_controller)
 ):
     user_id = current_user.user_id
-    data = controller.update_user_status(user_id, update_data)
+    data = await controller.update_user_status(user_id, update_data)
     return data
 
 
 @router.post("/token", response_model=Token)
-def login_user(
+async def login_user(
+    request: Request,
     user_login_data: Annotated[OAuth2PasswordRequestForm, Depends()],
     controller: UserController = Depends(get_user_controller)
 ):
-    token_data = controller.login_user(user_login_data)
+    client_ip = request.client.host if request.client else None
+    token_data = await controller.login_user(user_login_data, client_ip)
     return token_data
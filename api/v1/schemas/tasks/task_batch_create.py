@@ -0,0 +1,16 @@
+"""Modulo que genera los modelos de datos para la creacion de tareas por lotes"""
+
+from typing import List
+from pydantic import BaseModel, Field
+from api.v1.schemas.tasks.task_create import TaskCreate
+from core.settings.settings import settings
+
+
+class TaskBatchCreate(BaseModel):
+    """Modelo de datos para la creacion de varias tareas en una sola peticion"""
+    tasks: List[TaskCreate] = Field(
+        ...,
+        title="Tareas a crear",
+        min_length=1,
+        max_length=settings.TASKS_BATCH_MAX_SIZE
+    )
@@ -0,0 +1,37 @@
+"""Modulo que genera el modelo de datos para seleccionar tareas por lotes"""
+
+from typing import List, Optional
+from pydantic import BaseModel, Field, model_validator
+from core.settings.settings import settings
+
+
+class TaskBatchFilter(BaseModel):
+    """Modelo de datos para seleccionar las tareas de una operacion por lotes"""
+    task_ids: Optional[List[int]] = Field(
+        None,
+        title="IDs de las tareas",
+        min_length=1,
+        max_length=settings.TASKS_BATCH_MAX_SIZE
+    )
+    where_completed: Optional[bool] = Field(None, title="Estado actual de las tareas")
+
+    @model_validator(mode="after")
+    def check_selector(self):
+        """Exige al menos un criterio para no afectar todas las tareas por error."""
+        if self.task_ids is None and self.where_completed is None:
+            raise ValueError("Debe indicar task_ids o where_completed")
+        return self
+
+
+class TaskBatchQueryFilter(TaskBatchFilter):
+    """Modelo de datos para seleccionar tareas por lotes desde la query string
+
+    Los IDs viajan en la URL, que los proxies y el servidor limitan a unos
+    pocos KB, por eso se admiten menos que en el cuerpo de una peticion.
+    """
+    task_ids: Optional[List[int]] = Field(
+        None,
+        title="IDs de las tareas",
+        min_length=1,
+        max_length=settings.TASKS_BATCH_QUERY_MAX_SIZE
+    )
@@ -0,0 +1,9 @@
+"""Modulo que genera el modelo de datos para la actualizacion de tareas por lotes"""
+
+from pydantic import Field
+from api.v1.schemas.tasks.task_batch_filter import TaskBatchFilter
+
+
+class TaskBatchUpdate(TaskBatchFilter):
+    """Modelo de datos para cambiar el estado de varias tareas"""
+    completed: bool = Field(..., title="Nuevo estado de las tareas")
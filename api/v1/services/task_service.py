@@ -1,13 +1,21 @@
 """ Modulo que genera el servicio para las tareas. """
 
+from typing import List, Optional, Tuple
+from api.v1.database.unit_of_work import UnitOfWork
 from api.v1.repositories.task_repository import TaskRepository
+from api.v1.schemas.tasks.task_batch_create import TaskBatchCreate
+from api.v1.schemas.tasks.task_batch_filter import TaskBatchFilter
+from api.v1.schemas.tasks.task_batch_update import TaskBatchUpdate
 from api.v1.schemas.tasks.task_create import TaskCreate
 from api.v1.schemas.tasks.task_update import TaskUpdate
 import logging
 
+from core.cache.task_list_cache import TaskListCache
 from core.global_config.exceptions.exceptions import (
     ExceptionDataError
 )
+from core.global_config.timing.timing import timed
+from core.settings.settings import settings
 
 logger = logging.getLogger("app")
 
@@ -15,59 +23,194 @@ logger = logging.getLogger("app")
 class TaskService:
     """Servicio para la gestion de tareas."""
 
-    def __init__(self, task_repository: TaskRepository):
+    def __init__(
+        self,
+        task_repository: TaskRepository,
+        task_cache: Optional[TaskListCache] = None,
+        unit_of_work: Optional[UnitOfWork] = None
+    ):
         self.task_repository = task_repository
+        self.task_cache = task_cache
+        self.unit_of_work = unit_of_work
 
-    def create_task(self, task_create: TaskCreate, user_id: int):
+    def _invalidate_cache(self, user_id: int):
+        """Descarta los listados cacheados del usuario tras una escritura.
+
+        Con unidad de trabajo se espera a que la transaccion se confirme; si se
+        invalidara antes, una lectura concurrente podria volver a cachear los
+        datos anteriores.
+        """
+        if self.task_cache is None:
+            return
+        if self.unit_of_work is not None:
+            self.unit_of_work.after_commit(lambda: self.task_cache.invalidate(user_id))
+        else:
+            self.task_cache.invalidate(user_id)
+
+    @timed("service")
+    async def create_task(self, task_create: TaskCreate, user_id: int):
         """Crea una nueva tarea."""
-        task_id = self.task_repository.create_task(
+        task_id = await self.task_repository.create_task(
             title=task_create.title,
             description=task_create.description,
             completed=task_create.completed,
             user_id=user_id
         )
+        self._invalidate_cache(user_id)
         if not task_id:
             logger.warning("[Service] No se pudo crear la tarea")
             raise ExceptionDataError("No se pudo crear la tarea")
 
-        logger.info(f"[Service] Tarea creada exitosamente con ID: {task_id}")
+        logger.info("[Service] Tarea creada exitosamente con ID: %s", task_id)
         return task_id
 
-    def update_task(self, task_id: int, task_update: TaskUpdate, user_id: int):
+    @timed("service")
+    async def create_tasks(self, task_batch: TaskBatchCreate, user_id: int):
+        """Crea varias tareas en una sola transaccion."""
+        task_ids = await self.task_repository.create_tasks(
+            tasks=[(task.title, task.description, task.completed) for task in task_batch.tasks],
+            user_id=user_id,
+            copy_threshold=settings.TASKS_BATCH_COPY_THRESHOLD
+        )
+        self._invalidate_cache(user_id)
+        logger.info("[Service] %s tareas creadas por lote para el usuario %s", len(task_ids), user_id)
+        return task_ids
+
+    @timed("service")
+    async def update_task(self, task_id: int, task_update: TaskUpdate, user_id: int):
         """Actualiza una tarea existente."""
-        updated_task_id = self.task_repository.update_task(
+        updated_task_id = await self.task_repository.update_task(
             task_id=task_id,
             title=task_update.title,
             description=task_update.description,
             completed=task_update.completed,
             user_id=user_id
         )
+        self._invalidate_cache(user_id)
         if not updated_task_id:
-            logger.warning(f"[Service] Tarea con ID: {task_id} no encontrada para actualizar.")
+            logger.warning("[Service] Tarea con ID: %s no encontrada para actualizar.", task_id)
             raise ExceptionDataError("Tarea no encontrada para actualizar")
 
-        logger.info(f"[Service] Tarea con ID: {updated_task_id} actualizada exitosamente.")
+        logger.info("[Service] Tarea con ID: %s actualizada exitosamente.", updated_task_id)
         return updated_task_id
 
-    def delete_task(self, task_id: int, user_id: int):
+    @timed("service")
+    async def delete_task(self, task_id: int, user_id: int):
         """Elimina una tarea existente."""
-        deleted_task_id = self.task_repository.delete_task(
+        deleted_task_id = await self.task_repository.delete_task(
             task_id=task_id,
             user_id=user_id
         )
+        self._invalidate_cache(user_id)
         if not deleted_task_id:
-            logger.warning(f"[Service] Tarea con ID: {task_id} no encontrada para eliminar.")
+            logger.warning("[Service] Tarea con ID: %s no encontrada para eliminar.", task_id)
             raise ExceptionDataError("Tarea no encontrada para eliminar")
-        logger.info(f"[Service] Tarea con ID: {deleted_task_id} eliminada exitosamente.")
+        logger.info("[Service] Tarea con ID: %s eliminada exitosamente.", deleted_task_id)
         return deleted_task_id
 
-    def get_tasks(self, user_id: int):
-        """Obtiene una tarea por su ID."""
-        tasks = self.task_repository.get_task_by_user_id(
-            user_id=user_id
+    @timed("service")
+    async def update_tasks(self, task_batch: TaskBatchUpdate, user_id: int):
+        """Cambia el estado de varias tareas del usuario."""
+        updated_task_ids = await self.task_repository.update_tasks_completed(
+            user_id=user_id,
+            completed=task_batch.completed,
+            task_ids=task_batch.task_ids,
+            where_completed=task_batch.where_completed
         )
-        if not tasks:
-            logger.warning(f"[Service] Tareas para el usuario con ID: {user_id} no encontrada.")
+        self._invalidate_cache(user_id)
+        logger.info("[Service] %s tareas actualizadas por lote para el usuario %s", len(updated_task_ids), user_id)
+        return self._batch_result(task_batch.task_ids, updated_task_ids)
+
+    @timed("service")
+    async def delete_tasks(self, task_filter: TaskBatchFilter, user_id: int):
+        """Elimina varias tareas del usuario."""
+        deleted_task_ids = await self.task_repository.delete_tasks(
+            user_id=user_id,
+            task_ids=task_filter.task_ids,
+            where_completed=task_filter.where_completed
+        )
+        self._invalidate_cache(user_id)
+        logger.info("[Service] %s tareas eliminadas por lote para el usuario %s", len(deleted_task_ids), user_id)
+        return self._batch_result(task_filter.task_ids, deleted_task_ids)
+
+    @staticmethod
+    def _batch_result(requested_ids: Optional[List[int]], matched_ids: List[int]):
+        """Indica que tareas coincidieron y cuales de las pedidas no se encontraron."""
+        matched = sorted(matched_ids)
+        not_found = []
+        if requested_ids is not None:
+            matched_set = set(matched)
+            not_found = sorted({task_id for task_id in requested_ids if task_id not in matched_set})
+        return {"task_ids": matched, "not_found": not_found}
+
+    @timed("service")
+    async def get_tasks(
+        self,
+        user_id: int,
+        limit: Optional[int] = None,
+        after: Optional[int] = None,
+        known_version: Optional[int] = None
+    ) -> Tuple[int, Optional[List[dict]]]:
+        """Obtiene las tareas de un usuario, opcionalmente paginadas por ``id``.
+
+        Devuelve ``(version, tareas)``, donde ``version`` identifica el estado
+        del listado. Si coincide con ``known_version`` (la que ya tiene el
+        cliente) devuelve ``(version, None)`` sin leer las filas.
+
+        La version se lee siempre de la base de datos y la pagina cacheada
+        solo se sirve si se leyo con esa misma version: la cache es local a
+        cada worker y no ve las escrituras hechas en los demas.
+        """
+        generation = self.task_cache.generation if self.task_cache is not None else 0
+        # La version se lee antes que las filas: si cambia entre ambas
+        # lecturas el ETag queda antiguo y el cliente solo repite la consulta
+        version = await self.task_repository.get_task_list_version(user_id)
+        if version == known_version:
+            logger.info("[Service] Tareas del usuario con ID: %s sin cambios (version %s).", user_id, version)
+            return version, None
+        cached = None
+        if self.task_cache is not None:
+            cached = self.task_cache.get(user_id, limit, after)
+        if cached is not None and cached[0] == version:
+            tasks = cached[1]
+        else:
+            tasks = await self.task_repository.get_task_by_user_id(
+                user_id=user_id,
+                limit=limit,
+                after=after
+            )
+            if self.task_cache is not None:
+                self.task_cache.set(user_id, limit, after, tasks, generation, version)
+        if not tasks and after is None:
+            logger.warning("[Service] Tareas para el usuario con ID: %s no encontrada.", user_id)
             raise ExceptionDataError("Tareas no encontradas")
-        logger.info(f"[Service] Tareas para el usuario con ID: {user_id} obtenida exitosamente.")
+        logger.info("[Service] Tareas para el usuario con ID: %s obtenida exitosamente.", user_id)
+        return version, tasks
+
+    @timed("service")
+    async def get_task_summary(self, user_id: int):
+        """Obtiene el total de tareas del usuario, las completadas y las pendientes."""
+        summary = await self.task_repository.get_task_summary(user_id)
+        logger.info("[Service] Resumen de tareas para el usuario con ID: %s obtenido exitosamente.", user_id)
+        return summary
+
+    @timed("service")
+    async def search_tasks(self, user_id: int, query: str, limit: int):
+        """Busca tareas del usuario ordenadas por relevancia.
+
+        Una busqueda sin resultados no es un error: devuelve una lista vacia.
+        """
+        tasks = await self.task_repository.search_tasks(
+            user_id=user_id,
+            query=query,
+            limit=limit
+        )
+        logger.info("[Service] Busqueda de tareas para el usuario con ID: %s completada.", user_id)
         return tasks
+
+    def stream_tasks(self, user_id: int, batch_size: int):
+        """Devuelve un generador asincrono que recorre las tareas del usuario por bloques."""
+        return self.task_repository.iter_tasks_by_user_id(
+            user_id=user_id,
+            batch_size=batch_size
+        )
@@ -1,7 +1,9 @@
 """ Modulo que genera el servicio para los usuarios """
 
 import logging
+from typing import Optional
 from fastapi.security import OAuth2PasswordRequestForm
+from api.v1.database.unit_of_work import UnitOfWork
 from api.v1.repositories.user_repository import UserRepository
 from api.v1.schemas.auth.auth_token import Token
 from api.v1.schemas.users.user_create import UserCreate
@@ -10,8 +12,13 @@ from core.global_config.exceptions.exceptions import (
     InvalidCredentialsError,
     ExceptionDataError
 )
+from core.cache.user_cache import UserCache
+from core.global_config.timing.timing import timed
+from core.settings.settings import settings
 from utils.auth_utils import create_access_token
-from utils.password_managment import hash_password, verify_password
+from utils.deactivated_users import deactivated_users
+from utils.hashing_executor import hashing_executor
+from utils.rate_limiter import login_rate_limiter
 
 logger = logging.getLogger("app")
 
@@ -19,62 +26,144 @@ logger = logging.getLogger("app")
 class UserService:
     """Servicio para la gestion de usuarios."""
 
-    def __init__(self, user_repository: UserRepository):
+    def __init__(
+        self,
+        user_repository: UserRepository,
+        unit_of_work: Optional[UnitOfWork] = None,
+        user_cache: Optional[UserCache] = None
+    ):
         self.user_repository = user_repository
-
-    def create_user(self, user_create: UserCreate):
-        """Crea un nuevo usuario."""
-        existing_user = self.user_repository.get_user_by_email_or_username(
-            user_create.email
-        )
+        self.unit_of_work = unit_of_work
+        self.user_cache = user_cache
+
+    def _invalidate_cache(self, user_id: Optional[int] = None, identifiers=()):
+        """Descarta de la cache el usuario tras una escritura, al confirmarse."""
+        if self.user_cache is None:
+            return
+        if self.unit_of_work is not None:
+            self.unit_of_work.after_commit(lambda: self.user_cache.invalidate(user_id, identifiers))
+        else:
+            self.user_cache.invalidate(user_id, identifiers)
+
+    def _apply_status(self, user_id: int, is_active: bool):
+        """Aplica el nuevo estado en este worker en cuanto se confirma.
+
+        Los demas workers lo reciben por LISTEN/NOTIFY; ``apply`` tambien
+        invalida la cache de usuarios.
+        """
+        if self.unit_of_work is not None:
+            self.unit_of_work.after_commit(lambda: deactivated_users.apply(user_id, is_active))
+        else:
+            deactivated_users.apply(user_id, is_active)
+
+    async def _get_user(self, identifier: str, primary: bool = False):
+        """Busca un usuario por email o nombre de usuario pasando por la cache.
+
+        Un identificador que se sabe inexistente se resuelve como ``None`` sin
+        consultar la base de datos. Con ``primary`` se consulta siempre el
+        principal y la cache solo se actualiza con el resultado.
+        """
+        if self.user_cache is None:
+            return await self.user_repository.get_user_by_email_or_username(identifier, primary=primary)
+        if not primary:
+            if self.user_cache.is_missing(identifier):
+                return None
+            user = self.user_cache.get(identifier)
+            if user is not None:
+                return user
+        generation = self.user_cache.generation
+        user = await self.user_repository.get_user_by_email_or_username(identifier, primary=primary)
+        if user is None:
+            self.user_cache.set_missing(identifier, generation)
+        else:
+            self.user_cache.set(user, generation)
+        return user
+
+    @timed("service")
+    async def create_user(self, user_create: UserCreate):
+        """Crea un nuevo usuario.
+
+        La existencia se comprueba en el principal, sin atajos de la cache,
+        antes de hashear para que los registros duplicados no gasten bcrypt.
+        La conexion se libera mientras corre bcrypt y la insercion va en otra
+        transaccion; si entretanto otro registro usa el mismo email, la
+        restriccion UNIQUE lo rechaza.
+        """
+        existing_user = await self._get_user(user_create.email, primary=True)
         if existing_user:
             logger.warning(
-                f"[Service] El usuario {user_create.email}  ya existe."
+                "[Service] El usuario %s  ya existe.", user_create.email
             )
             raise ExceptionDataError("El usuario ya existe")
 
-        hashed_password = hash_password(user_create.password)
+        if self.unit_of_work is not None:
+            # Libera la conexion antes de bcrypt, que no necesita la base de datos
+            await self.unit_of_work.commit()
+
+        hashed_password = await hashing_executor.hash_password(user_create.password)
 
-        user_id = self.user_repository.create_user(
+        user_id = await self.user_repository.create_user(
             username=user_create.username,
             email=user_create.email,
             hashed_password=hashed_password,
             is_active=user_create.is_active
         )
-        logger.info(f"[Service] Usuario creado exitosamente con ID: {user_id}")
+        self._invalidate_cache(user_id, (user_create.username, user_create.email))
+        self._apply_status(user_id, user_create.is_active)
+        logger.info("[Service] Usuario creado exitosamente con ID: %s", user_id)
         return user_id
 
-    def update_user_status(self, user_id: int, user_update: UserUpdate):
+    @timed("service")
+    async def update_user_status(self, user_id: int, user_update: UserUpdate):
         """Actualiza el estado activo de un usuario."""
-        updated_user_id = self.user_repository.user_update_status(
+        updated_user_id = await self.user_repository.user_update_status(
             user_id=user_id,
             is_active=user_update.is_active
         )
+        if updated_user_id is not None:
+            self._apply_status(user_id, user_update.is_active)
         if updated_user_id is None:
-            logger.warning(f"[Service] Usuario con ID {user_id} no encontrado para actualizar.")
+            logger.warning("[Service] Usuario con ID %s no encontrado para actualizar.", user_id)
             raise ExceptionDataError("No se pudo actualizar el usuario")
 
-        logger.info(f"[Service] Estado del usuario con ID {user_id} actualizado exitosamente")
+        logger.info("[Service] Estado del usuario con ID %s actualizado exitosamente", user_id)
 
         return updated_user_id
 
-    def login_user(self, user_login_data: OAuth2PasswordRequestForm):
-        """Inicia sesion de un usuario."""
-        user = self.user_repository.get_user_by_email_or_username(
-            user_login_data.username
-        )
+    @timed("service")
+    async def login_user(self, user_login_data: OAuth2PasswordRequestForm, client_ip: Optional[str] = None):
+        """Inicia sesion de un usuario.
+
+        Los intentos se limitan por IP y por usuario antes de consultar la
+        base de datos o ejecutar bcrypt. Un usuario desactivado se rechaza
+        tambien antes de bcrypt.
+        """
+        if settings.LOGIN_RATE_LIMIT_ENABLED:
+            login_rate_limiter.check(client_ip, user_login_data.username)
+
+        user = await self._get_user(user_login_data.username)
         if not user:
             logger.warning("[Service] Intento de inicio de sesion fallido - usuario no encontrado")
             raise InvalidCredentialsError("Intento de inicio de sesion fallido - credenciales invalidas")
 
-        is_password_valid = verify_password(user_login_data.password, user["hashed_password"])
+        if user["is_active"] is False or user["id"] in deactivated_users:
+            logger.warning("[Service] Intento de inicio de sesion fallido - usuario %s desactivado", user["id"])
+            raise InvalidCredentialsError("Intento de inicio de sesion fallido - credenciales invalidas")
+
+        if self.unit_of_work is not None:
+            # Libera la conexion antes de bcrypt, que no necesita la base de datos
+            await self.unit_of_work.commit()
+
+        is_password_valid = await hashing_executor.verify_password(
+            user_login_data.password, user["hashed_password"]
+        )
 
         if not is_password_valid:
             logger.warning("[Service] Intento de inicio de sesion fallido - credenciales invalidas")
             raise InvalidCredentialsError("Intento de inicio de sesion fallido - credenciales invalidas")
 
         logger.info(
-            f"[Service] Usuario {user_login_data.username} ha iniciado sesion exitosamente")
+            "[Service] Usuario %s ha iniciado sesion exitosamente", user_login_data.username)
 
         token = create_access_token(
             data={
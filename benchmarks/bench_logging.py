@@ -0,0 +1,175 @@
+"""Benchmark de peticiones por segundo con logging sincrono y con cola.
+
+Levanta una aplicacion FastAPI minima cuya ruta registra los mismos mensajes
+INFO que una peticion real (repositorio, servicio y controller) y la invoca
+directamente como ASGI, sin servidor ni base de datos, para aislar el coste
+del logging. La consola y el fichero se escriben en un directorio temporal.
+
+La referencia es la configuracion anterior: handlers sincronos y mensajes
+formateados con f-strings en la propia peticion (``sync+f-string``). Los
+demas modos usan argumentos ``%s``, que se formatean solo si el registro se
+emite y, con la cola, fuera del bucle de eventos.
+
+Uso (desde la raiz del repositorio):
+
+    python -m benchmarks.bench_logging --requests 20000 --concurrency 50
+
+Con ``--write-latency-us`` cada escritura en consola se bloquea ese tiempo,
+como ocurre cuando el pipe de stdout o el disco van lentos.
+"""
+
+import argparse
+import asyncio
+import copy
+import os
+import tempfile
+import time
+
+from benchmarks._common import use_bench_environment
+
+use_bench_environment()
+
+import logging  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+
+from core.global_config.logging import logging as app_logging  # noqa: E402
+from core.global_config.logging.logging_settings import log_config  # noqa: E402
+from core.settings.settings import settings  # noqa: E402
+
+logger = logging.getLogger("app")
+access_logger = logging.getLogger("uvicorn.access")
+
+app = FastAPI()
+
+
+@app.get("/tasks/get")
+async def get_tasks():
+    user_id = 1
+    tasks = [{"id": i, "title": f"t{i}", "completed": False} for i in range(10)]
+    logger.info("[Repository] %s tareas obtenidas para el usuario %s", len(tasks), user_id)
+    logger.info("[Service] Tareas para el usuario con ID: %s obtenida exitosamente.", user_id)
+    return {"success": True, "data": tasks}
+
+
+@app.get("/tasks/get-eager")
+async def get_tasks_eager():
+    user_id = 1
+    tasks = [{"id": i, "title": f"t{i}", "completed": False} for i in range(10)]
+    logger.info(f"[Repository] {len(tasks)} tareas obtenidas para el usuario {user_id}")
+    logger.info(f"[Service] Tareas para el usuario con ID: {user_id} obtenida exitosamente.")
+    return {"success": True, "data": tasks}
+
+
+async def _request(path: str, eager: bool):
+    """Ejecuta una peticion GET contra la aplicacion ASGI."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    status = 0
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    if eager:
+        access_logger.info(f'127.0.0.1:50000 - "GET {path} HTTP/1.1" {status}')
+    else:
+        access_logger.info('%s - "%s %s HTTP/%s" %d', "127.0.0.1:50000", "GET", path, "1.1", status)
+
+
+async def _run(total: int, concurrency: int, eager: bool) -> float:
+    """Lanza ``total`` peticiones con ``concurrency`` en paralelo y devuelve la duracion."""
+    remaining = iter(range(total))
+    path = "/tasks/get-eager" if eager else "/tasks/get"
+
+    async def worker():
+        for _ in remaining:
+            await _request(path, eager)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - start
+
+
+class _SlowStream:
+    """Stream que simula una escritura bloqueante (pipe lleno, disco lento)."""
+
+    def __init__(self, stream, latency: float):
+        self.stream = stream
+        self.latency = latency
+
+    def write(self, data: str):
+        if self.latency:
+            time.sleep(self.latency)
+        return self.stream.write(data)
+
+    def flush(self):
+        self.stream.flush()
+
+
+def _bench_config(directory: str, console) -> dict:
+    """Copia ``log_config`` escribiendo la consola y el fichero en ``directory``."""
+    config = copy.deepcopy(log_config)
+    config["handlers"]["console"]["stream"] = console
+    config["handlers"]["file"]["filename"] = os.path.join(directory, "app.log")
+    return config
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--write-latency-us", type=float, default=0,
+                        help="Latencia simulada de cada escritura en consola")
+    parser.add_argument("--sample-rate", type=float, default=0.1,
+                        help="Fraccion de registros INFO conservada en el modo con muestreo")
+    args = parser.parse_args()
+
+    sampled = {"app": args.sample_rate, "uvicorn.access": args.sample_rate}
+    # (nombre, modo de logging, f-strings, muestreo)
+    modes = [
+        ("sync+f-string", "sync", True, {}),
+        ("sync", "sync", False, {}),
+        ("queue", "queue", False, {}),
+        ("queue+muestreo", "queue", False, sampled),
+    ]
+    results = {}
+    for name, mode, eager, sample_rates in modes:
+        with tempfile.TemporaryDirectory() as directory, open(os.path.join(directory, "console.log"), "w") as console:
+            settings.LOG_SAMPLE_RATES = sample_rates
+            stream = _SlowStream(console, args.write_latency_us / 1e6)
+            app_logging.initialize_logging(_bench_config(directory, stream), mode=mode)
+            asyncio.run(_run(min(1000, args.requests), args.concurrency, eager))
+            elapsed = asyncio.run(_run(args.requests, args.concurrency, eager))
+            drain_start = time.perf_counter()
+            app_logging._stop_listeners()
+            drain = time.perf_counter() - drain_start
+            logging.shutdown()
+        results[name] = args.requests / elapsed
+        print(f"{name:15s} {results[name]:10.0f} peticiones/s  (vaciado de la cola: {drain * 1000:.0f} ms)")
+
+    settings.LOG_SAMPLE_RATES = {}
+    baseline = results["sync+f-string"]
+    for name in ("sync", "queue", "queue+muestreo"):
+        print(f"{name} frente a sync+f-string: {results[name] / baseline:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
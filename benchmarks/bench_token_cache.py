@@ -0,0 +1,43 @@
+"""Microbenchmark de la verificacion de tokens JWT con y sin cache.
+
+Uso (desde la raiz del repositorio):
+
+    python -m benchmarks.bench_token_cache --iterations 20000
+"""
+
+import argparse
+import timeit
+
+from benchmarks._common import use_bench_environment
+
+use_bench_environment()
+
+from utils.auth_utils import (  # noqa: E402
+    create_access_token,
+    verify_access_token,
+    verify_access_token_cached,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    token = create_access_token(
+        data={"sub": "bench", "email": "bench@example.com", "user_id": 1, "is_active": True}
+    )
+    verify_access_token_cached(token)
+
+    uncached = timeit.timeit(lambda: verify_access_token(token), number=args.iterations)
+    cached = timeit.timeit(lambda: verify_access_token_cached(token), number=args.iterations)
+
+    uncached_us = uncached / args.iterations * 1e6
+    cached_us = cached / args.iterations * 1e6
+    print(f"sin cache: {uncached_us:8.2f} us/peticion")
+    print(f"con cache: {cached_us:8.2f} us/peticion")
+    print(f"ahorro:    {uncached_us - cached_us:8.2f} us/peticion ({uncached / cached:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,348 @@
+"""Prueba de carga de extremo a extremo con percentiles por endpoint.
+
+Registra usuarios, inicia sesion con cada uno y lanza una mezcla configurable
+de operaciones sobre las tareas con una concurrencia fija. Informa del
+rendimiento (peticiones/s) y de la latencia p50/p95/p99 por endpoint, guarda
+los resultados en JSON y, si se indica, los compara con una ejecucion base.
+
+Por defecto ejecuta la aplicacion real de ``main.py`` dentro del proceso
+(incluido su lifespan: pool, migraciones y pool de hasheo) contra la base de
+datos configurada en el entorno o en ``.env``, sin el limite de intentos de
+inicio de sesion. Con ``--base-url`` ataca un servidor ya levantado; si se
+prueban mas usuarios que ``LOGIN_BURST_PER_IP`` conviene desactivar el limite
+con ``LOGIN_RATE_LIMIT_ENABLED=false``.
+
+Uso (desde la raiz del repositorio, con ``pip install -r benchmarks/requirements.txt``):
+
+    python -m benchmarks.load_test --duration 30 --concurrency 32 --output results.json
+    python -m benchmarks.load_test --duration 30 --baseline results.json --output new.json
+    python -m benchmarks.load_test --base-url http://localhost:5000 --mix create=2,list=8
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import sys
+import time
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import httpx
+
+from benchmarks._common import git_revision
+
+DEFAULT_MIX = "create=3,create_batch=1,update=2,update_batch=1,delete=1,list=4,list_conditional=2,list_page=3,summary=2"
+
+
+def parse_mix(value: str) -> Dict[str, int]:
+    """Convierte ``op=peso,op=peso`` en un diccionario de pesos."""
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"Operacion desconocida: {name}")
+        mix[name] = int(weight or 1)
+    return mix
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Percentil por rango mas cercano de una lista ya ordenada."""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class LoadUser:
+    """Usuario de la prueba con su token y las tareas que ha creado."""
+
+    def __init__(self, username: str, token: str):
+        self.username = username
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.task_ids: List[int] = []
+        self.etag: Optional[str] = None
+
+
+class Recorder:
+    """Acumula latencias y codigos de estado por endpoint."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.statuses: Dict[str, Dict[str, int]] = {}
+        self.recording = False
+
+    def record(self, endpoint: str, seconds: float, status: str):
+        if not self.recording:
+            return
+        self.latencies.setdefault(endpoint, []).append(seconds)
+        counts = self.statuses.setdefault(endpoint, {})
+        counts[status] = counts.get(status, 0) + 1
+
+    def summary(self, elapsed: float) -> dict:
+        endpoints = {}
+        for endpoint, values in sorted(self.latencies.items()):
+            values = sorted(values)
+            statuses = self.statuses[endpoint]
+            errors = sum(count for status, count in statuses.items() if not status.startswith(("2", "3", "404")))
+            endpoints[endpoint] = {
+                "requests": len(values),
+                "throughput_rps": round(len(values) / elapsed, 2),
+                "p50_ms": round(percentile(values, 0.50) * 1000, 2),
+                "p95_ms": round(percentile(values, 0.95) * 1000, 2),
+                "p99_ms": round(percentile(values, 0.99) * 1000, 2),
+                "max_ms": round(values[-1] * 1000, 2),
+                "errors": errors,
+                "statuses": statuses,
+            }
+        all_values = sorted(v for values in self.latencies.values() for v in values)
+        overall = {
+            "requests": len(all_values),
+            "throughput_rps": round(len(all_values) / elapsed, 2),
+            "p50_ms": round(percentile(all_values, 0.50) * 1000, 2),
+            "p95_ms": round(percentile(all_values, 0.95) * 1000, 2),
+            "p99_ms": round(percentile(all_values, 0.99) * 1000, 2),
+            "errors": sum(endpoint["errors"] for endpoint in endpoints.values()),
+        }
+        return {"overall": overall, "endpoints": endpoints}
+
+
+async def request(client: httpx.AsyncClient, recorder: Recorder, endpoint: str, method: str, url: str, **kwargs):
+    """Hace una peticion y registra su latencia bajo ``endpoint``."""
+    start = time.perf_counter()
+    try:
+        response = await client.request(method, url, **kwargs)
+    except httpx.HTTPError as e:
+        recorder.record(endpoint, time.perf_counter() - start, type(e).__name__)
+        return None
+    recorder.record(endpoint, time.perf_counter() - start, str(response.status_code))
+    return response
+
+
+async def op_create(client, recorder, user: LoadUser, rng: random.Random):
+    response = await request(client, recorder, "POST /tasks/create", "POST", "/tasks/create", headers=user.headers,
+                             json={"title": f"tarea {rng.randrange(10**6)}", "description": "prueba de carga"})
+    if response is not None and response.status_code == 200:
+        user.task_ids.append(response.json()["data"]["task_id"])
+
+
+async def op_create_batch(client, recorder, user: LoadUser, rng: random.Random):
+    tasks = [{"title": f"lote {rng.randrange(10**6)}", "completed": rng.random() < 0.3} for _ in range(20)]
+    response = await request(client, recorder, "POST /tasks/create-batch", "POST", "/tasks/create-batch",
+                             headers=user.headers, json={"tasks": tasks})
+    if response is not None and response.status_code == 200:
+        user.task_ids.extend(response.json()["data"]["task_ids"])
+
+
+async def op_update(client, recorder, user: LoadUser, rng: random.Random):
+    if not user.task_ids:
+        return await op_create(client, recorder, user, rng)
+    task_id = rng.choice(user.task_ids)
+    await request(client, recorder, "PUT /tasks/update", "PUT", f"/tasks/update?task_id={task_id}", headers=user.headers,
+                  json={"title": "actualizada", "description": "prueba de carga", "completed": rng.random() < 0.5})
+
+
+async def op_update_batch(client, recorder, user: LoadUser, rng: random.Random):
+    if not user.task_ids:
+        return await op_create(client, recorder, user, rng)
+    task_ids = rng.sample(user.task_ids, min(10, len(user.task_ids)))
+    await request(client, recorder, "PUT /tasks/update-batch", "PUT", "/tasks/update-batch", headers=user.headers,
+                  json={"task_ids": task_ids, "completed": rng.random() < 0.5})
+
+
+async def op_delete(client, recorder, user: LoadUser, rng: random.Random):
+    if not user.task_ids:
+        return await op_create(client, recorder, user, rng)
+    task_id = user.task_ids.pop(rng.randrange(len(user.task_ids)))
+    await request(client, recorder, "DELETE /tasks/delete", "DELETE", f"/tasks/delete?task_id={task_id}",
+                  headers=user.headers)
+
+
+async def op_list(client, recorder, user: LoadUser, rng: random.Random):
+    response = await request(client, recorder, "GET /tasks/get", "GET", "/tasks/get", headers=user.headers)
+    if response is not None and response.status_code == 200:
+        user.etag = response.headers.get("ETag")
+
+
+async def op_list_conditional(client, recorder, user: LoadUser, rng: random.Random):
+    """Repite el listado con el ultimo ``ETag``; sin cambios responde 304."""
+    if user.etag is None:
+        return await op_list(client, recorder, user, rng)
+    headers = {**user.headers, "If-None-Match": user.etag}
+    response = await request(client, recorder, "GET /tasks/get If-None-Match", "GET", "/tasks/get", headers=headers)
+    if response is not None and response.status_code == 200:
+        user.etag = response.headers.get("ETag")
+
+
+async def op_list_page(client, recorder, user: LoadUser, rng: random.Random):
+    await request(client, recorder, "GET /tasks/get?limit", "GET", "/tasks/get?limit=50", headers=user.headers)
+
+
+async def op_summary(client, recorder, user: LoadUser, rng: random.Random):
+    await request(client, recorder, "GET /tasks/summary", "GET", "/tasks/summary", headers=user.headers)
+
+
+OPERATIONS = {
+    "create": op_create,
+    "create_batch": op_create_batch,
+    "update": op_update,
+    "update_batch": op_update_batch,
+    "delete": op_delete,
+    "list": op_list,
+    "list_conditional": op_list_conditional,
+    "list_page": op_list_page,
+    "summary": op_summary,
+}
+
+
+async def setup_users(client: httpx.AsyncClient, recorder: Recorder, count: int, run_id: str) -> List[LoadUser]:
+    """Registra ``count`` usuarios nuevos e inicia sesion con cada uno."""
+    users = []
+    for i in range(count):
+        username = f"load_{run_id}_{i}"
+        password = f"Load-{run_id}-{i}!"
+        response = await request(client, recorder, "POST /users/register", "POST", "/users/register",
+                                 json={"username": username, "email": f"{username}@example.com", "password": password})
+        if response is None or response.status_code != 200:
+            raise RuntimeError(f"No se pudo registrar {username}: {response.text if response is not None else ''}")
+        response = await request(client, recorder, "POST /users/token", "POST", "/users/token",
+                                 data={"username": username, "password": password})
+        if response is None or response.status_code != 200:
+            raise RuntimeError(f"No se pudo iniciar sesion con {username}")
+        users.append(LoadUser(username, response.json()["access_token"]))
+    return users
+
+
+async def worker(client, recorder: Recorder, users: List[LoadUser], mix: Dict[str, int], seed: int, deadline: float):
+    """Ejecuta operaciones elegidas segun ``mix`` hasta ``deadline``."""
+    rng = random.Random(seed)
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    user = users[seed % len(users)]
+    while time.perf_counter() < deadline:
+        await OPERATIONS[rng.choices(names, weights)[0]](client, recorder, user, rng)
+
+
+@asynccontextmanager
+async def open_client(base_url: Optional[str], concurrency: int):
+    """Cliente contra ``base_url`` o contra la aplicacion de ``main.py`` en proceso."""
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    if base_url:
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+            yield client
+        return
+
+    # Todos los usuarios de la prueba inician sesion desde la misma direccion
+    os.environ.setdefault("LOGIN_RATE_LIMIT_ENABLED", "false")
+    from main import app
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=30) as client:
+            yield client
+
+
+async def run(args) -> dict:
+    run_id = uuid.uuid4().hex[:8]
+    recorder = Recorder()
+    async with open_client(args.base_url, args.concurrency) as client:
+        users = await setup_users(client, recorder, args.users, run_id)
+
+        warmup_deadline = time.perf_counter() + args.warmup
+        await asyncio.gather(*(
+            worker(client, recorder, users, args.mix, args.seed + i, warmup_deadline) for i in range(args.concurrency)
+        ))
+
+        recorder.recording = True
+        start = time.perf_counter()
+        deadline = start + args.duration
+        await asyncio.gather(*(
+            worker(client, recorder, users, args.mix, args.seed + i, deadline) for i in range(args.concurrency)
+        ))
+        elapsed = time.perf_counter() - start
+
+    results = recorder.summary(elapsed)
+    results["meta"] = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_revision": git_revision(),
+        "target": args.base_url or "in-process",
+        "duration_s": round(elapsed, 2),
+        "warmup_s": args.warmup,
+        "concurrency": args.concurrency,
+        "users": args.users,
+        "mix": args.mix,
+        "seed": args.seed,
+    }
+    return results
+
+
+def print_report(results: dict):
+    print(f"\n{'endpoint':28s} {'peticiones':>10s} {'req/s':>9s} {'p50 ms':>8s} {'p95 ms':>8s} {'p99 ms':>8s} {'errores':>8s}")
+    rows = list(results["endpoints"].items()) + [("TOTAL", results["overall"])]
+    for endpoint, stats in rows:
+        print(f"{endpoint:28s} {stats['requests']:10d} {stats['throughput_rps']:9.1f} {stats['p50_ms']:8.2f} "
+              f"{stats['p95_ms']:8.2f} {stats['p99_ms']:8.2f} {stats['errors']:8d}")
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Compara con la ejecucion base y devuelve las regresiones que superan ``tolerance``."""
+    regressions = []
+    print(f"\nComparacion con la base ({baseline['meta'].get('git_revision')}, {baseline['meta'].get('timestamp')}):")
+    print(f"{'endpoint':28s} {'req/s':>16s} {'p95 ms':>18s}")
+    rows = [("TOTAL", results["overall"], baseline["overall"])] + [
+        (endpoint, stats, baseline["endpoints"][endpoint])
+        for endpoint, stats in results["endpoints"].items()
+        if endpoint in baseline["endpoints"]
+    ]
+    for endpoint, stats, base in rows:
+        throughput_change = stats["throughput_rps"] / base["throughput_rps"] - 1 if base["throughput_rps"] else 0.0
+        p95_change = stats["p95_ms"] / base["p95_ms"] - 1 if base["p95_ms"] else 0.0
+        print(f"{endpoint:28s} {stats['throughput_rps']:9.1f} ({throughput_change:+6.1%}) "
+              f"{stats['p95_ms']:9.2f} ({p95_change:+6.1%})")
+        if throughput_change < -tolerance:
+            regressions.append(f"{endpoint}: rendimiento {throughput_change:+.1%}")
+        if p95_change > tolerance:
+            regressions.append(f"{endpoint}: p95 {p95_change:+.1%}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", help="Servidor a atacar; por defecto la aplicacion en proceso")
+    parser.add_argument("--duration", type=float, default=30, help="Segundos de medicion")
+    parser.add_argument("--warmup", type=float, default=3, help="Segundos de calentamiento sin medir")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--users", type=int, default=8)
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                        help=f"Pesos de las operaciones (por defecto {DEFAULT_MIX})")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="Fichero JSON donde guardar los resultados")
+    parser.add_argument("--baseline", help="Resultados JSON de una ejecucion anterior para comparar")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="Regresion maxima admitida frente a la base (0.10 = 10%%)")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print_report(results)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResultados guardados en {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("\nRegresiones:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
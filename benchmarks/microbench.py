@@ -0,0 +1,174 @@
+"""Microbenchmarks de las funciones que se ejecutan en cada peticion.
+
+Mide, sin base de datos ni servidor:
+
+- la creacion y verificacion de tokens JWT (con y sin cache),
+- ``hash_password`` / ``verify_password`` con varios costes de bcrypt,
+- la conversion de filas a diccionarios de ``TaskRepository``,
+- la serializacion de ``TaskMessageResponse`` con listas de 10 a 100k tareas.
+
+Cada caso se repite varias veces y se informa del mejor tiempo por llamada,
+que es el valor mas estable entre ejecuciones. Los resultados se pueden
+guardar en JSON y compararse con una ejecucion base; si algun caso empeora
+mas que la tolerancia el proceso termina con codigo 1.
+
+Uso (desde la raiz del repositorio):
+
+    python -m benchmarks.microbench --output micro.json
+    python -m benchmarks.microbench --baseline micro.json --tolerance 0.2
+    python -m benchmarks.microbench --filter serialize --sizes 10,1000
+"""
+
+import argparse
+import json
+import re
+import sys
+import timeit
+from datetime import datetime, timezone
+
+from benchmarks._common import git_revision, use_bench_environment
+
+use_bench_environment()
+
+import bcrypt  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+from api.v1.repositories.task_repository import TaskRepository  # noqa: E402
+from api.v1.schemas.tasks.task_message_response import TaskMessageResponse  # noqa: E402
+from utils.auth_utils import (  # noqa: E402
+    create_access_token,
+    verify_access_token,
+    verify_access_token_cached,
+)
+from utils.password_managment import hash_password, verify_password  # noqa: E402
+
+PASSWORD = "Benchmark-Password-123"
+TOKEN_DATA = {"sub": "bench", "email": "bench@example.com", "user_id": 1, "is_active": True}
+
+
+def _rows(count: int):
+    """Filas con la forma que devuelve ``SELECT id, title, description, completed, user_id``."""
+    return [(i, f"Tarea {i}", f"Descripcion de la tarea {i}", i % 3 == 0, 1) for i in range(count)]
+
+
+def _serialize(adapter: TypeAdapter, response: TaskMessageResponse) -> bytes:
+    """Serializa la respuesta con los mismos pasos que FastAPI para un ``response_model``.
+
+    FastAPI vuelca el modelo devuelto, lo valida contra el ``response_model``,
+    lo serializa en modo JSON y ``JSONResponse`` lo codifica.
+    """
+    content = response.model_dump(by_alias=True)
+    value = adapter.validate_python(content)
+    return JSONResponse(adapter.dump_python(value, mode="json", by_alias=True)).body
+
+
+def build_cases(sizes, bcrypt_costs):
+    """Devuelve ``{nombre: funcion}`` con todos los casos del benchmark."""
+    cases = {}
+
+    token = create_access_token(data=TOKEN_DATA)
+    verify_access_token_cached(token)
+    cases["jwt.create_access_token"] = lambda: create_access_token(data=TOKEN_DATA)
+    cases["jwt.verify_access_token"] = lambda: verify_access_token(token)
+    cases["jwt.verify_access_token_cached"] = lambda: verify_access_token_cached(token)
+
+    for cost in bcrypt_costs:
+        salt = bcrypt.gensalt(rounds=cost)
+        hashed = bcrypt.hashpw(PASSWORD.encode("utf-8"), salt).decode("utf-8")
+        cases[f"bcrypt.hash[cost={cost}]"] = lambda salt=salt: bcrypt.hashpw(PASSWORD.encode("utf-8"), salt)
+        cases[f"bcrypt.verify[cost={cost}]"] = lambda hashed=hashed: verify_password(PASSWORD, hashed)
+    default_hash = hash_password(PASSWORD)
+    cases["bcrypt.hash_password[default]"] = lambda: hash_password(PASSWORD)
+    cases["bcrypt.verify_password[default]"] = lambda: verify_password(PASSWORD, default_hash)
+
+    adapter = TypeAdapter(TaskMessageResponse)
+    for size in sizes:
+        rows = _rows(size)
+        tasks = TaskRepository._rows_to_tasks(rows)
+        response = TaskMessageResponse(success=True, data=tasks, message="Tareas obtenidas exitosamente.", status=200)
+        cases[f"rows.to_dict[n={size}]"] = lambda rows=rows: TaskRepository._rows_to_tasks(rows)
+        cases[f"serialize.task_message_response[n={size}]"] = (
+            lambda response=response: _serialize(adapter, response)
+        )
+    return cases
+
+
+def measure(func, repeat: int) -> float:
+    """Mejor tiempo por llamada (segundos) de ``repeat`` rondas de al menos 0.2 s."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def format_duration(seconds: float) -> str:
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:10.2f} ms"
+    return f"{seconds * 1e6:10.2f} us"
+
+
+def compare(results: dict, baseline: dict, tolerance: float):
+    """Compara con la base y devuelve los casos que empeoran mas que ``tolerance``."""
+    regressions = []
+    print(f"\nComparacion con la base ({baseline['meta'].get('git_revision')}, {baseline['meta'].get('timestamp')}):")
+    for name, stats in results["cases"].items():
+        base = baseline["cases"].get(name)
+        if base is None:
+            continue
+        change = stats["seconds_per_call"] / base["seconds_per_call"] - 1
+        flag = "  <-- regresion" if change > tolerance else ""
+        print(f"{name:45s} {format_duration(stats['seconds_per_call'])} ({change:+7.1%}){flag}")
+        if change > tolerance:
+            regressions.append(f"{name}: {change:+.1%}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10,1000,100000",
+                        help="Numero de tareas para el mapeo de filas y la serializacion")
+    parser.add_argument("--bcrypt-costs", default="4,10,12", help="Costes (rounds) de bcrypt a medir")
+    parser.add_argument("--repeat", type=int, default=5, help="Rondas por caso; se toma la mejor")
+    parser.add_argument("--filter", help="Expresion regular para elegir los casos por nombre")
+    parser.add_argument("--output", help="Fichero JSON donde guardar los resultados")
+    parser.add_argument("--baseline", help="Resultados JSON de una ejecucion anterior para comparar")
+    parser.add_argument("--tolerance", type=float, default=0.20,
+                        help="Empeoramiento maximo admitido por caso frente a la base (0.20 = 20%%)")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    bcrypt_costs = [int(cost) for cost in args.bcrypt_costs.split(",")]
+    cases = build_cases(sizes, bcrypt_costs)
+    if args.filter:
+        cases = {name: func for name, func in cases.items() if re.search(args.filter, name)}
+
+    results = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_revision": git_revision(),
+            "python": sys.version.split()[0],
+            "repeat": args.repeat,
+        },
+        "cases": {},
+    }
+    for name, func in cases.items():
+        seconds = measure(func, args.repeat)
+        results["cases"][name] = {"seconds_per_call": seconds, "calls_per_second": round(1 / seconds, 1)}
+        print(f"{name:45s} {format_duration(seconds)} {1 / seconds:14.1f} llamadas/s")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResultados guardados en {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("\nRegresiones:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+"""Modulo que define la interfaz de los backends de cache."""
+
+from abc import ABC, abstractmethod
+from typing import Any, Hashable, Optional
+
+
+class CacheBackend(ABC):
+    """Interfaz comun de los backends de cache.
+
+    ``get`` devuelve ``None`` cuando la clave no existe o ha expirado, por lo
+    que no se deben guardar valores ``None``.
+    """
+
+    @abstractmethod
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Obtiene el valor asociado a ``key``."""
+
+    @abstractmethod
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Guarda ``value`` en ``key``; ``ttl`` sobrescribe la expiracion por defecto."""
+
+    @abstractmethod
+    def delete(self, key: Hashable):
+        """Elimina ``key`` si existe."""
+
+    @abstractmethod
+    def clear(self):
+        """Elimina todas las entradas."""
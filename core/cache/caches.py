@@ -0,0 +1,51 @@
+"""Modulo que crea las caches compartidas de la aplicacion."""
+
+from core.cache.cache_backend import CacheBackend
+from core.cache.memory_cache import InMemoryLRUCache
+from core.cache.task_list_cache import TaskListCache
+from core.cache.user_cache import UserCache
+from core.settings.settings import settings
+
+
+def create_cache_backend(name: str, max_entries: int, ttl: float) -> CacheBackend:
+    """Crea el backend de cache configurado en ``CACHE_BACKEND``."""
+    if settings.CACHE_BACKEND == "memory":
+        return InMemoryLRUCache(name, max_entries=max_entries, ttl=ttl)
+    raise ValueError(f"Backend de cache no soportado: {settings.CACHE_BACKEND}")
+
+
+task_list_cache = TaskListCache(
+    backend=create_cache_backend(
+        "task_list",
+        max_entries=settings.TASKS_CACHE_MAX_USERS,
+        ttl=settings.TASKS_CACHE_TTL_SECONDS
+    ),
+    max_tasks_per_user=settings.TASKS_CACHE_MAX_TASKS_PER_USER,
+    max_tracked_users=settings.TASKS_CACHE_MAX_USERS
+)
+
+token_cache = create_cache_backend(
+    "access_token",
+    max_entries=settings.TOKEN_CACHE_MAX_ENTRIES,
+    ttl=settings.TOKEN_CACHE_MAX_TTL_SECONDS
+)
+
+user_cache = UserCache(
+    records=create_cache_backend(
+        "user",
+        max_entries=settings.USER_CACHE_MAX_ENTRIES,
+        ttl=settings.USER_CACHE_TTL_SECONDS
+    ),
+    aliases=create_cache_backend(
+        "user_alias",
+        max_entries=2 * settings.USER_CACHE_MAX_ENTRIES,
+        ttl=settings.USER_CACHE_TTL_SECONDS
+    ),
+    missing=create_cache_backend(
+        "user_missing",
+        max_entries=settings.USER_NEGATIVE_CACHE_MAX_ENTRIES,
+        ttl=settings.USER_NEGATIVE_CACHE_TTL_SECONDS
+    ),
+    # Un id y dos identificadores por usuario
+    max_tracked_keys=3 * settings.USER_CACHE_MAX_ENTRIES
+)
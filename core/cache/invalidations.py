@@ -0,0 +1,47 @@
+"""Modulo que registra las invalidaciones recientes de cada clave cacheada."""
+
+import threading
+from collections import OrderedDict
+from typing import Hashable, Iterable
+
+
+class InvalidationLog:
+    """Ultima invalidacion de cada clave, para descartar lecturas anteriores.
+
+    Antes de leer de la base de datos se toma ``token()``; al guardar el
+    resultado, ``changed_since`` indica si alguna de sus claves se invalido
+    entretanto. Asi una escritura sobre una clave solo descarta las lecturas
+    de esa clave y no las de las demas.
+
+    El registro guarda como mucho ``max_keys`` claves. Las claves olvidadas
+    toman la marca mas reciente de las descartadas, lo que puede descartar
+    alguna lectura de mas pero nunca guardar una anterior a su
+    invalidacion.
+    """
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._clock = 0
+        self._floor = 0
+        self._last: "OrderedDict[Hashable, int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def token(self) -> int:
+        """Marca del momento actual, que se pasa despues a ``changed_since``."""
+        return self._clock
+
+    def invalidate(self, keys: Iterable[Hashable]):
+        """Registra la invalidacion de ``keys``."""
+        with self._lock:
+            self._clock += 1
+            for key in keys:
+                self._last[key] = self._clock
+                self._last.move_to_end(key)
+            while len(self._last) > self.max_keys:
+                _, forgotten = self._last.popitem(last=False)
+                self._floor = max(self._floor, forgotten)
+
+    def changed_since(self, keys: Iterable[Hashable], token: int) -> bool:
+        """Indica si alguna de ``keys`` se invalido despues de ``token``."""
+        with self._lock:
+            return any(self._last.get(key, self._floor) > token for key in keys)
@@ -0,0 +1,66 @@
+"""Modulo que implementa un backend de cache LRU en memoria del proceso."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from core.cache.cache_backend import CacheBackend
+from core.global_config.metrics.metrics import (
+    CACHE_ENTRIES,
+    CACHE_EVICTIONS,
+    CACHE_REQUESTS,
+    set_gauge_function,
+)
+
+
+class InMemoryLRUCache(CacheBackend):
+    """Cache LRU acotada por numero de entradas y por tiempo de vida.
+
+    Cuando se supera ``max_entries`` se descarta la entrada usada hace mas
+    tiempo. Las entradas expiradas se descartan al consultarlas.
+    """
+
+    def __init__(self, name: str, max_entries: int, ttl: float):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        set_gauge_function(CACHE_ENTRIES.labels(name), lambda: len(self._entries))
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                CACHE_REQUESTS.labels(self.name, "miss").inc()
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                CACHE_EVICTIONS.labels(self.name, "expired").inc()
+                CACHE_REQUESTS.labels(self.name, "miss").inc()
+                return None
+            self._entries.move_to_end(key)
+        CACHE_REQUESTS.labels(self.name, "hit").inc()
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                CACHE_EVICTIONS.labels(self.name, "size").inc()
+
+    def delete(self, key: Hashable):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,60 @@
+"""Modulo que implementa la cache de listados de tareas por usuario."""
+
+from typing import List, Optional, Tuple
+
+from core.cache.cache_backend import CacheBackend
+from core.cache.invalidations import InvalidationLog
+
+
+class TaskListCache:
+    """Cache de lectura de los listados de tareas de cada usuario.
+
+    Cada usuario ocupa una entrada del backend con las paginas consultadas,
+    indexadas por ``(limit, after)`` junto con la version del listado con la
+    que se leyeron. Las escrituras invalidan la entrada completa del usuario.
+
+    Para que una lectura lenta no guarde datos anteriores a una escritura
+    concurrente se toma ``generation`` antes de leer y ``set`` descarta el
+    resultado si el usuario se invalido despues. Las invalidaciones de
+    otros usuarios no le afectan.
+    """
+
+    def __init__(self, backend: CacheBackend, max_tasks_per_user: int, max_tracked_users: int):
+        self.backend = backend
+        self.max_tasks_per_user = max_tasks_per_user
+        self._invalidations = InvalidationLog(max_tracked_users)
+
+    @property
+    def generation(self) -> int:
+        """Marca que se toma antes de leer y se pasa despues a ``set``."""
+        return self._invalidations.token()
+
+    def get(self, user_id: int, limit: Optional[int], after: Optional[int]) -> Optional[Tuple[int, List[dict]]]:
+        """Devuelve ``(version, tareas)`` de la pagina o ``None`` si no esta en cache."""
+        pages = self.backend.get(user_id)
+        if pages is None:
+            return None
+        return pages.get((limit, after))
+
+    def set(
+        self,
+        user_id: int,
+        limit: Optional[int],
+        after: Optional[int],
+        tasks: List[dict],
+        generation: int,
+        version: int
+    ):
+        """Guarda una pagina leida con ``version`` cuando la cache estaba en ``generation``."""
+        if self._invalidations.changed_since((user_id,), generation):
+            return
+        pages = dict(self.backend.get(user_id) or {})
+        pages[(limit, after)] = (version, tasks)
+        if sum(len(page) for _, page in pages.values()) > self.max_tasks_per_user:
+            return
+        self.backend.set(user_id, pages)
+
+    def invalidate(self, user_id: int):
+        """Descarta todas las paginas cacheadas del usuario."""
+        self._invalidations.invalidate((user_id,))
+        self.backend.delete(user_id)
@@ -0,0 +1,67 @@
+"""Modulo que implementa la cache de busquedas de usuarios."""
+
+from typing import Iterable, Optional
+
+from core.cache.cache_backend import CacheBackend
+from core.cache.invalidations import InvalidationLog
+
+
+class UserCache:
+    """Cache de los usuarios buscados por email o nombre de usuario.
+
+    Los registros se guardan una vez por ``id`` y cada identificador (email y
+    nombre de usuario) apunta a ese ``id``, de modo que invalidar un usuario
+    invalida todas sus formas de buscarlo. Los identificadores que no existen
+    se recuerdan aparte con un TTL corto para que los intentos contra nombres
+    desconocidos no lleguen a la base de datos.
+
+    Igual que en ``TaskListCache``, ``generation`` se toma antes de leer y
+    ``set`` / ``set_missing`` descartan lo leido si su ``id`` o alguno de
+    sus identificadores se invalido despues.
+    """
+
+    def __init__(self, records: CacheBackend, aliases: CacheBackend, missing: CacheBackend, max_tracked_keys: int):
+        self.records = records
+        self.aliases = aliases
+        self.missing = missing
+        self._invalidations = InvalidationLog(max_tracked_keys)
+
+    @property
+    def generation(self) -> int:
+        """Marca que se toma antes de leer y se pasa despues a ``set``."""
+        return self._invalidations.token()
+
+    def get(self, identifier: str) -> Optional[dict]:
+        """Devuelve el usuario cacheado para ``identifier`` o ``None``."""
+        user_id = self.aliases.get(identifier)
+        if user_id is None:
+            return None
+        return self.records.get(user_id)
+
+    def is_missing(self, identifier: str) -> bool:
+        """Indica si se sabe que no existe ningun usuario con ``identifier``."""
+        return self.missing.get(identifier) is not None
+
+    def set(self, user: dict, generation: int):
+        """Guarda un usuario leido despues de tomar ``generation``."""
+        if self._invalidations.changed_since((user["id"], user["email"], user["username"]), generation):
+            return
+        self.records.set(user["id"], user)
+        self.aliases.set(user["email"], user["id"])
+        self.aliases.set(user["username"], user["id"])
+
+    def set_missing(self, identifier: str, generation: int):
+        """Recuerda que ``identifier`` no existe (leido despues de tomar ``generation``)."""
+        if self._invalidations.changed_since((identifier,), generation):
+            return
+        self.missing.set(identifier, True)
+
+    def invalidate(self, user_id: Optional[int] = None, identifiers: Iterable[str] = ()):
+        """Descarta el usuario ``user_id`` y lo cacheado para ``identifiers``."""
+        identifiers = tuple(identifiers)
+        self._invalidations.invalidate(identifiers if user_id is None else (user_id,) + identifiers)
+        if user_id is not None:
+            self.records.delete(user_id)
+        for identifier in identifiers:
+            self.aliases.delete(identifier)
+            self.missing.delete(identifier)
@@ -24,3 +24,16 @@ class InvalidCredentialsError(Exception):
 class ExceptionDataError(Exception):
     """Excepción de dominio para errores en obtener datos de user o tasks"""
     pass
+
+
+class HashingQueueFullError(Exception):
+    """Excepcion lanzada cuando la cola de hasheo de contraseñas esta llena."""
+    pass
+
+
+class LoginRateLimitedError(Exception):
+    """Excepcion lanzada cuando un cliente supera el limite de intentos de inicio de sesion."""
+
+    def __init__(self, retry_after: float):
+        super().__init__("Demasiados intentos de inicio de sesion")
+        self.retry_after = retry_after
@@ -0,0 +1,55 @@
+"""Filtros de logging para muestrear y limitar los registros por logger."""
+
+import logging
+import random
+import threading
+import time
+
+from core.global_config.metrics.metrics import LOG_RECORDS_DROPPED
+
+
+class SamplingFilter(logging.Filter):
+    """Deja pasar solo una fraccion ``rate`` de los registros por debajo de WARNING.
+
+    Los avisos y errores nunca se muestrean.
+    """
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or random.random() < self.rate:
+            return True
+        LOG_RECORDS_DROPPED.labels(record.name, "sampled").inc()
+        return False
+
+
+class RateLimitFilter(logging.Filter):
+    """Limita los registros por debajo de ERROR a ``rate`` por segundo.
+
+    Usa un token bucket con capacidad de un segundo de registros, de modo que
+    admite rafagas cortas y descarta el exceso sostenido. Los errores siempre
+    pasan.
+    """
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+        self.capacity = max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.ERROR:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+        LOG_RECORDS_DROPPED.labels(record.name, "rate_limited").inc()
+        return False
@@ -1,9 +1,99 @@
 """Modulo que configura el sistema de logging de la aplicación."""
 
+import atexit
+import logging
+import queue
 from logging.config import dictConfig
+from logging.handlers import QueueHandler, QueueListener
+from typing import List, Optional
+
+from core.global_config.logging.filters import RateLimitFilter, SamplingFilter
 from core.global_config.logging.logging_settings import log_config
+from core.global_config.metrics.metrics import LOG_RECORDS_DROPPED
+from core.settings.settings import settings
+
+_listeners: List[QueueListener] = []
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler que no formatea ni bloquea en el hilo que registra.
+
+    El listener vive en el mismo proceso, por lo que el registro se encola tal
+    cual y el mensaje (``msg % args``) se construye en el hilo del listener.
+    Si la cola esta llena el registro se descarta en lugar de esperar.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.labels(record.name, "queue_full").inc()
+
+
+def _stop_listeners():
+    """Detiene los listeners y escribe los registros pendientes."""
+    while _listeners:
+        _listeners.pop().stop()
+
+
+def _install_queue(logger_names: List[str]):
+    """Sustituye los handlers de cada logger por una cola y un listener.
+
+    Los loggers que comparten el mismo conjunto de handlers comparten cola y
+    listener, de modo que cada registro llega exactamente a los handlers que
+    tenia configurados.
+    """
+    queue_handlers = {}
+    for name in logger_names:
+        logger = logging.getLogger(name)
+        handlers = tuple(logger.handlers)
+        if not handlers:
+            continue
+        if handlers not in queue_handlers:
+            log_queue = queue.Queue(settings.LOG_QUEUE_MAX_SIZE)
+            listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+            listener.start()
+            _listeners.append(listener)
+            queue_handlers[handlers] = NonBlockingQueueHandler(log_queue)
+        for handler in handlers:
+            logger.removeHandler(handler)
+        logger.addHandler(queue_handlers[handlers])
+
+
+def _install_filters():
+    """Aplica el muestreo y los limites de tasa configurados por logger.
+
+    Los filtros de un logger solo actuan sobre los registros emitidos
+    directamente en el (por ejemplo ``app`` o ``uvicorn.access``).
+    """
+    for name in {*settings.LOG_SAMPLE_RATES, *settings.LOG_RATE_LIMITS}:
+        logger = logging.getLogger(name)
+        for log_filter in list(logger.filters):
+            if isinstance(log_filter, (SamplingFilter, RateLimitFilter)):
+                logger.removeFilter(log_filter)
+    for name, rate in settings.LOG_SAMPLE_RATES.items():
+        logging.getLogger(name).addFilter(SamplingFilter(rate))
+    for name, rate in settings.LOG_RATE_LIMITS.items():
+        logging.getLogger(name).addFilter(RateLimitFilter(rate))
+
+
+def initialize_logging(config: dict = log_config, mode: Optional[str] = None):
+    """Inicializa la configuracion de logging de la aplicacion.
+
+    En modo ``queue`` (``LOG_MODE``) las peticiones solo encolan los registros
+    y un hilo en segundo plano hace la escritura en consola y fichero. En modo
+    ``sync`` los handlers escriben directamente. Puede llamarse varias veces:
+    cada llamada detiene los listeners anteriores antes de reconfigurar.
+    """
+    mode = mode or settings.LOG_MODE
+    _stop_listeners()
+    dictConfig(config)
+    if mode == "queue":
+        _install_queue(["", *config.get("loggers", {})])
+    _install_filters()
 
 
-def initialize_logging():
-    """Inicializa la configuracion de logging de la aplicacion."""
-    dictConfig(log_config)
+atexit.register(_stop_listeners)
@@ -8,6 +8,9 @@ log_config = {
             "format": "%(asctime)s [%(levelname)s] %(name)s: %(message)s",
             "datefmt": "%Y-%m-%d %H:%M:%S",
         },
+        "message": {
+            "format": "%(message)s",
+        },
     },
     "handlers": {
         "console": {
@@ -25,12 +28,19 @@ log_config = {
             "interval": 1,
             "backupCount": 7,
         },
+        "access_console": {
+            "class": "logging.StreamHandler",
+            "level": "INFO",
+            "formatter": "message",
+            "stream": "ext://sys.stdout",
+        },
     },
     "loggers": {
         "app": {"handlers": ["console", "file"], "level": "INFO", "propagate": False},
         "uvicorn": {"handlers": ["console", "file"], "level": "INFO", "propagate": False},
         "uvicorn.error": {"handlers": ["console", "file"], "level": "INFO", "propagate": False},
         "uvicorn.access": {"handlers": ["console", "file"], "level": "INFO", "propagate": False},
+        "app.access": {"handlers": ["access_console"], "level": "INFO", "propagate": False},
     },
     "root": {"handlers": ["console", "file"], "level": "INFO"},
 }
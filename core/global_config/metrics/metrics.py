@@ -0,0 +1,180 @@
+"""Modulo que define las metricas de la aplicacion en formato Prometheus."""
+
+import asyncio
+import os
+from typing import Callable, Dict
+
+from prometheus_client import Counter, Gauge, Histogram, multiprocess
+
+# Con varios workers (main.run_server) cada proceso escribe sus metricas en
+# PROMETHEUS_MULTIPROC_DIR y /metrics las agrega todas
+MULTIPROCESS = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+if MULTIPROCESS:
+    os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+
+
+PASSWORD_HASH_QUEUE_DEPTH = Gauge(
+    "password_hash_queue_depth",
+    "Operaciones de bcrypt en espera de un proceso libre.",
+    multiprocess_mode="livesum"
+)
+
+PASSWORD_HASH_IN_FLIGHT = Gauge(
+    "password_hash_in_flight",
+    "Operaciones de bcrypt admitidas (en ejecucion o en espera).",
+    multiprocess_mode="livesum"
+)
+
+PASSWORD_HASH_DURATION = Histogram(
+    "password_hash_duration_seconds",
+    "Duracion de las operaciones de bcrypt, incluida la espera en cola.",
+    ["operation"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 0.75, 1.0, 2.0, 5.0, 10.0)
+)
+
+PASSWORD_HASH_REJECTED = Counter(
+    "password_hash_rejected_total",
+    "Operaciones de bcrypt rechazadas por cola llena.",
+    ["operation"]
+)
+
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Consultas a las caches de la aplicacion.",
+    ["cache", "result"]
+)
+
+CACHE_EVICTIONS = Counter(
+    "cache_evictions_total",
+    "Entradas descartadas de las caches de la aplicacion.",
+    ["cache", "reason"]
+)
+
+CACHE_ENTRIES = Gauge(
+    "cache_entries",
+    "Entradas almacenadas en las caches de la aplicacion.",
+    ["cache"],
+    multiprocess_mode="livesum"
+)
+
+DB_POOL_CHECKOUT_DURATION = Histogram(
+    "db_pool_checkout_duration_seconds",
+    "Tiempo de espera para obtener una conexion del pool.",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+)
+
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_connections",
+    "Conexiones del pool por estado.",
+    ["state"],
+    multiprocess_mode="livesum"
+)
+
+DB_POOL_REQUESTS_WAITING = Gauge(
+    "db_pool_requests_waiting",
+    "Peticiones esperando una conexion libre del pool.",
+    multiprocess_mode="livesum"
+)
+
+DB_TRANSACTION_DURATION = Histogram(
+    "db_transaction_duration_seconds",
+    "Tiempo que una conexion permanece fuera del pool hasta el commit o rollback.",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+
+DB_TRANSACTIONS = Counter(
+    "db_transactions_total",
+    "Transacciones finalizadas por resultado.",
+    ["outcome"]
+)
+
+DB_ERRORS = Counter(
+    "db_errors_total",
+    "Errores de base de datos por tipo.",
+    ["error_type"]
+)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Latencia de las peticiones HTTP por ruta.",
+    ["method", "route"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "Peticiones HTTP por ruta y codigo de estado.",
+    ["method", "route", "status"]
+)
+
+LOG_RECORDS_DROPPED = Counter(
+    "log_records_dropped_total",
+    "Registros de log descartados por muestreo, limite de tasa o cola llena.",
+    ["logger", "reason"]
+)
+
+DB_READ_ROUTING = Counter(
+    "db_read_routing_total",
+    "Conexiones de solo lectura por destino (replica o principal y motivo).",
+    ["target"]
+)
+
+RATE_LIMITER_REJECTED = Counter(
+    "rate_limiter_rejected_total",
+    "Peticiones rechazadas por los limitadores de tasa.",
+    ["limiter"]
+)
+
+RATE_LIMITER_BUCKETS = Gauge(
+    "rate_limiter_buckets",
+    "Buckets en memoria de cada limitador de tasa.",
+    ["limiter"],
+    multiprocess_mode="livesum"
+)
+
+RATE_LIMITER_EVICTIONS = Counter(
+    "rate_limiter_evictions_total",
+    "Buckets descartados por superar el maximo de claves del limitador.",
+    ["limiter"]
+)
+
+DEACTIVATED_USERS = Gauge(
+    "deactivated_users",
+    "Usuarios desactivados en el registro en memoria de la autenticacion.",
+    multiprocess_mode="livemax"
+)
+
+_gauge_functions: Dict[Gauge, Callable[[], float]] = {}
+
+
+def set_gauge_function(gauge: Gauge, function: Callable[[], float]):
+    """Hace que ``gauge`` refleje el valor de ``function``.
+
+    En un solo proceso equivale a ``set_function``, que se evalua al leer
+    las metricas. En modo multiproceso solo se agregan los valores escritos,
+    asi que ``refresh_gauge_functions`` los escribe periodicamente.
+    """
+    if not MULTIPROCESS:
+        gauge.set_function(function)
+        return
+    _gauge_functions[gauge] = function
+    gauge.set(function())
+
+
+def refresh_gauge_functions():
+    """Escribe el valor actual de los gauges registrados con ``set_gauge_function``."""
+    for gauge, function in list(_gauge_functions.items()):
+        gauge.set(function())
+
+
+async def refresh_gauge_functions_forever(interval: float):
+    """Refresca los gauges cada ``interval`` segundos hasta que se cancela."""
+    while True:
+        refresh_gauge_functions()
+        await asyncio.sleep(interval)
+
+
+def mark_process_dead():
+    """Retira los gauges de este proceso de la agregacion al terminar."""
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(os.getpid())
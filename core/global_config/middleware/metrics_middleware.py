@@ -0,0 +1,39 @@
+"""Middleware que registra la latencia y el codigo de estado de cada peticion."""
+
+import time
+
+from core.global_config.metrics.metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS
+
+
+class MetricsMiddleware:
+    """Middleware ASGI que mide las peticiones HTTP por ruta.
+
+    Se usa la plantilla de la ruta (``/tasks/get``) y no la URL concreta para
+    que el numero de series de Prometheus no dependa de los parametros.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            method = scope["method"]
+            HTTP_REQUEST_DURATION.labels(method, route_path).observe(time.perf_counter() - start)
+            HTTP_REQUESTS.labels(method, route_path, str(status_code)).inc()
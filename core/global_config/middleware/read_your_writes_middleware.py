@@ -0,0 +1,70 @@
+"""Middleware que lleva la marca de lectura de lo escrito en una cookie."""
+
+import math
+import time
+from typing import Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import cookie_parser
+
+from api.v1.database.replicas import reset_client_writes, start_client_writes
+from core.settings.settings import settings
+
+
+def _pinned_until(scope) -> Optional[float]:
+    """Lee de la cookie hasta cuando debe leer el cliente del principal.
+
+    Se ignoran los valores no numericos y se recortan los que van mas alla
+    de la ventana, para que un cliente no pueda fijarse al principal.
+    """
+    for name, value in scope["headers"]:
+        if name == b"cookie":
+            raw = cookie_parser(value.decode("latin-1")).get(settings.DB_READ_YOUR_WRITES_COOKIE)
+            try:
+                pinned_until = float(raw)
+            except (TypeError, ValueError):
+                return None
+            if not math.isfinite(pinned_until):
+                return None
+            return min(pinned_until, time.time() + settings.DB_READ_YOUR_WRITES_SECONDS)
+    return None
+
+
+class ReadYourWritesMiddleware:
+    """Middleware ASGI que comparte la lectura de lo escrito entre workers.
+
+    El registro de escrituras de ``replica_router`` es de cada proceso, asi
+    que con varios workers la siguiente peticion del usuario puede caer en
+    otro que no sabe que escribio. Cuando una peticion escribe se responde
+    con la cookie ``DB_READ_YOUR_WRITES_COOKIE`` (instante hasta el que hay
+    que leer del principal) y mientras el cliente la devuelva sus lecturas
+    van al principal en cualquier worker. Los clientes sin cookies solo
+    cuentan con el registro del proceso.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        marker, token = start_client_writes(_pinned_until(scope))
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start" and marker.written_until is not None:
+                headers = MutableHeaders(scope=message)
+                cookie = (
+                    f"{settings.DB_READ_YOUR_WRITES_COOKIE}={marker.written_until:.3f}; "
+                    f"Max-Age={math.ceil(settings.DB_READ_YOUR_WRITES_SECONDS)}; Path=/; HttpOnly; SameSite=Lax"
+                )
+                if scope.get("scheme") == "https":
+                    cookie += "; Secure"
+                headers.append("Set-Cookie", cookie)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_cookie)
+        finally:
+            reset_client_writes(token)
@@ -0,0 +1,87 @@
+"""Middleware que publica el desglose de tiempos de cada peticion."""
+
+import json
+import logging
+import re
+import time
+import uuid
+
+from starlette.datastructures import MutableHeaders
+
+from core.global_config.timing.timing import (
+    format_server_timing,
+    reset_request_timing,
+    start_request_timing,
+)
+from core.settings.settings import settings
+
+access_logger = logging.getLogger("app.access")
+
+_REQUEST_ID_PATTERN = re.compile(r"[A-Za-z0-9._-]{1,64}")
+
+
+def _request_id(scope) -> str:
+    """Reutiliza el ``X-Request-ID`` del cliente si es valido o genera uno nuevo."""
+    for name, value in scope["headers"]:
+        if name == b"x-request-id":
+            request_id = value.decode("latin-1")
+            if _REQUEST_ID_PATTERN.fullmatch(request_id):
+                return request_id
+            break
+    return uuid.uuid4().hex
+
+
+class ServerTimingMiddleware:
+    """Middleware ASGI que mide cada capa de la peticion.
+
+    Abre el registro de tramos (auth, pool, sql, commit, map, repository,
+    service, controller, serialize) para la peticion y responde con un
+    ``X-Request-ID``. Si ``SERVER_TIMING_ENABLED`` esta activo envia ademas
+    el desglose en la cabecera ``Server-Timing``; esta desactivado por
+    defecto porque expone los tiempos internos a cualquier cliente. Si
+    ``ACCESS_LOG_JSON`` esta activo escribe una linea JSON de acceso con el
+    mismo desglose. Los tramos que ocurren despues de enviar las cabeceras
+    (respuestas en streaming) solo aparecen en el log.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        timing, token = start_request_timing()
+        request_id = _request_id(scope)
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("X-Request-ID", request_id)
+                if settings.SERVER_TIMING_ENABLED:
+                    headers.append(
+                        "Server-Timing",
+                        format_server_timing(timing.spans, time.perf_counter() - start)
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            reset_request_timing(token)
+            if settings.ACCESS_LOG_JSON:
+                route = scope.get("route")
+                access_logger.info("%s", json.dumps({
+                    "request_id": request_id,
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "route": getattr(route, "path", None),
+                    "status": status_code,
+                    "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+                    "timing_ms": {name: round(seconds * 1000, 2) for name, seconds in timing.spans.items()},
+                }))
@@ -0,0 +1,53 @@
+"""Ruta de FastAPI que mide el tiempo de serializacion de la respuesta."""
+
+import asyncio
+import functools
+import time
+
+from fastapi.datastructures import Default, DefaultPlaceholder
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+
+from core.global_config.timing.timing import add_span, current_timing
+
+
+class TimedJSONResponse(JSONResponse):
+    """JSONResponse que registra el tramo ``serialize``.
+
+    FastAPI valida el ``response_model`` y despues construye la respuesta, que
+    llama a ``render``; el tramo va desde que termina el endpoint hasta que
+    el cuerpo queda codificado.
+    """
+
+    def render(self, content) -> bytes:
+        body = super().render(content)
+        timing = current_timing()
+        if timing is not None and timing.endpoint_finished_at is not None:
+            add_span("serialize", time.perf_counter() - timing.endpoint_finished_at)
+        return body
+
+
+def _mark_endpoint_finished(endpoint):
+    """Envuelve el endpoint para anotar cuando termina."""
+    if not asyncio.iscoroutinefunction(endpoint):
+        return endpoint
+
+    @functools.wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await endpoint(*args, **kwargs)
+        finally:
+            timing = current_timing()
+            if timing is not None:
+                timing.endpoint_finished_at = time.perf_counter()
+
+    return wrapper
+
+
+class TimedRoute(APIRoute):
+    """APIRoute que mide la serializacion de las respuestas JSON."""
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        if isinstance(kwargs.get("response_class"), DefaultPlaceholder):
+            kwargs["response_class"] = Default(TimedJSONResponse)
+        super().__init__(path, _mark_endpoint_finished(endpoint), **kwargs)
@@ -0,0 +1,69 @@
+"""Modulo que mide el tiempo de cada capa durante una peticion."""
+
+import functools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+
+class RequestTiming:
+    """Tiempos acumulados por capa (en segundos) de la peticion en curso."""
+
+    def __init__(self):
+        self.spans: Dict[str, float] = {}
+        self.endpoint_finished_at: Optional[float] = None
+
+
+_current: ContextVar[Optional[RequestTiming]] = ContextVar("request_timing", default=None)
+
+
+def start_request_timing():
+    """Empieza a acumular tiempos para la peticion actual; devuelve el token para ``reset``."""
+    timing = RequestTiming()
+    return timing, _current.set(timing)
+
+
+def reset_request_timing(token):
+    """Deja de acumular tiempos para la peticion actual."""
+    _current.reset(token)
+
+
+def current_timing() -> Optional[RequestTiming]:
+    """Devuelve los tiempos de la peticion en curso o ``None`` si no se miden."""
+    return _current.get()
+
+
+def add_span(name: str, seconds: float):
+    """Suma ``seconds`` al tramo ``name`` de la peticion en curso."""
+    timing = _current.get()
+    if timing is not None:
+        timing.spans[name] = timing.spans.get(name, 0.0) + seconds
+
+
+@contextmanager
+def span(name: str):
+    """Mide el bloque y lo suma al tramo ``name``."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_span(name, time.perf_counter() - start)
+
+
+def timed(name: str):
+    """Decorador que suma la duracion de una corrutina al tramo ``name``."""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with span(name):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def format_server_timing(spans: Dict[str, float], total: float) -> str:
+    """Construye el valor de la cabecera ``Server-Timing`` (duraciones en ms)."""
+    metrics = [f"{name};dur={seconds * 1000:.2f}" for name, seconds in spans.items()]
+    metrics.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(metrics)
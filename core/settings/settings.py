@@ -1,5 +1,6 @@
 """Modulo de configuracion de variables de entorno"""
 
+from typing import Dict, List
 from pydantic_settings import BaseSettings
 
 
@@ -17,6 +18,91 @@ class Settings(BaseSettings):
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: str
 
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 5000
+    SERVER_WORKERS: int = 1
+    SERVER_LOOP: str = "auto"
+    SERVER_HTTP: str = "auto"
+    SERVER_BACKLOG: int = 2048
+    SERVER_KEEPALIVE_TIMEOUT: int = 5
+    RUN_MIGRATIONS_ON_STARTUP: bool = True
+    STARTUP_DEADLINE: float = 60
+    STARTUP_BACKOFF_BASE: float = 0.1
+    STARTUP_BACKOFF_MAX: float = 5
+    READINESS_TIMEOUT: float = 1
+
+    # Totales del servidor: cada worker usa su parte (utils.worker_budget).
+    # DB_POOL_MAX_SIZE incluye la conexion de escucha de cada worker
+    DB_POOL_MIN_SIZE: int = 2
+    DB_POOL_MAX_SIZE: int = 10
+    DB_POOL_TIMEOUT: float = 10
+    DB_POOL_MAX_WAITING: int = 0
+    DB_POOL_MAX_LIFETIME: float = 1800
+    DB_POOL_MAX_IDLE: float = 300
+    DB_POOL_PING_AFTER_IDLE: float = 30
+    DB_PREPARED_STATEMENTS: bool = True
+    DB_PREPARED_MAX: int = 100
+    # Replicas de lectura (lista JSON de URLs); vacia = todo va al principal.
+    # DB_REPLICA_POOL_*_SIZE son totales del servidor por cada replica
+    DB_REPLICA_URLS: List[str] = []
+    DB_REPLICA_SELECTION: str = "least_busy"
+    DB_REPLICA_POOL_MIN_SIZE: int = 1
+    DB_REPLICA_POOL_MAX_SIZE: int = 10
+    DB_REPLICA_TIMEOUT: float = 1
+    DB_REPLICA_RETRY_AFTER_SECONDS: float = 10
+    DB_READ_YOUR_WRITES_SECONDS: float = 5
+    DB_READ_YOUR_WRITES_MAX_USERS: int = 100000
+    # Cookie con la que el cliente lleva su ventana de lectura de lo escrito
+    # a cualquier worker (el registro de DB_READ_YOUR_WRITES_MAX_USERS es local)
+    DB_READ_YOUR_WRITES_COOKIE: str = "read_primary_until"
+
+    TASKS_PAGE_MAX_LIMIT: int = 1000
+    TASKS_STREAM_BATCH_SIZE: int = 1000
+    TASKS_BATCH_MAX_SIZE: int = 100000
+    # IDs admitidos en la query string (DELETE /tasks/delete-batch): ~8 KB de URL
+    TASKS_BATCH_QUERY_MAX_SIZE: int = 500
+    TASKS_BATCH_COPY_THRESHOLD: int = 1000
+    TASKS_SEARCH_DEFAULT_LIMIT: int = 20
+    TASKS_SEARCH_MAX_LIMIT: int = 100
+
+    CACHE_BACKEND: str = "memory"
+    TASKS_CACHE_ENABLED: bool = True
+    TASKS_CACHE_MAX_USERS: int = 10000
+    TASKS_CACHE_TTL_SECONDS: float = 30
+    TASKS_CACHE_MAX_TASKS_PER_USER: int = 5000
+    TOKEN_CACHE_ENABLED: bool = True
+    TOKEN_CACHE_MAX_ENTRIES: int = 10000
+    TOKEN_CACHE_MAX_TTL_SECONDS: float = 3600
+    USER_CACHE_ENABLED: bool = True
+    USER_CACHE_MAX_ENTRIES: int = 10000
+    USER_CACHE_TTL_SECONDS: float = 60
+    USER_NEGATIVE_CACHE_MAX_ENTRIES: int = 100000
+    USER_NEGATIVE_CACHE_TTL_SECONDS: float = 5
+
+    # Total del servidor (0 = un proceso por CPU), repartido entre workers
+    HASH_POOL_WORKERS: int = 0
+    HASH_QUEUE_MAX_SIZE: int = 32
+    HASH_RETRY_AFTER_SECONDS: int = 1
+
+    # Intentos de inicio de sesion por segundo y rafaga, por proceso worker
+    LOGIN_RATE_LIMIT_ENABLED: bool = True
+    LOGIN_RATE_PER_IP: float = 1
+    LOGIN_BURST_PER_IP: float = 10
+    LOGIN_RATE_PER_USERNAME: float = 0.2
+    LOGIN_BURST_PER_USERNAME: float = 5
+    LOGIN_RATE_LIMIT_MAX_KEYS: int = 100000
+
+    LOG_MODE: str = "queue"
+    LOG_QUEUE_MAX_SIZE: int = 10000
+    LOG_SAMPLE_RATES: Dict[str, float] = {}
+    LOG_RATE_LIMITS: Dict[str, float] = {}
+    # Server-Timing muestra a cualquier cliente los tiempos internos de cada
+    # capa; solo debe activarse para depurar o tras un proxy que lo retire
+    SERVER_TIMING_ENABLED: bool = False
+    # Con varios workers, cada cuanto escribe cada uno sus gauges para /metrics
+    METRICS_REFRESH_SECONDS: float = 5
+    ACCESS_LOG_JSON: bool = False
+
     class Config:
         """Clase de configuracion de pydantic"""
 
@@ -1,20 +1,36 @@
 """Archivo principal de la aplicación FastAPI."""
 
+import asyncio
+import glob
 import logging
+import os
+import tempfile
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 
 
 from contextlib import asynccontextmanager
-from api.v1.models.tasks import create_tasks_tables
-from api.v1.models.users import create_users_tables
+from api.v1.database.connection import DatabaseConnection
+from api.v1.database.migrator import run_migrations
+from api.v1.database.replicas import replica_router
 from core.global_config.global_config import get_deployment_enviroment
+from core.global_config.middleware.metrics_middleware import MetricsMiddleware
+from core.global_config.middleware.read_your_writes_middleware import ReadYourWritesMiddleware
+from core.global_config.middleware.server_timing_middleware import ServerTimingMiddleware
 from api.v1.routers.tasks_routes import router as tasks_router
 from api.v1.routers.users_routes import router as users_router
-from core.global_config.logging.logging_settings import log_config
+from api.v1.routers.monitoring_routes import router as monitoring_router
 from core.global_config.logging.logging import initialize_logging
+from core.global_config.metrics.metrics import (
+    MULTIPROCESS,
+    mark_process_dead,
+    refresh_gauge_functions_forever,
+)
+from utils.deactivated_users import deactivated_users
+from utils.hashing_executor import hashing_executor
 from utils.wait_for_postgres import wait_for_postgres
+from utils.worker_budget import PRIMARY_DEDICATED_CONNECTIONS, primary_pool_size, replica_pool_size
 from core.settings.settings import settings
 
 
@@ -25,13 +41,32 @@ logger.info("Iniciando la aplicación...")
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    wait_for_postgres(settings.DB_URL)
-    create_users_tables(settings.DB_URL)
-    create_tasks_tables(settings.DB_URL)
-    logger.info("Tablas creadas o ya existentes.")
+    # El pool se crea y se prueba aqui, ya dentro del proceso worker
+    await wait_for_postgres(settings.DB_URL)
+    await replica_router.open()
+    if settings.RUN_MIGRATIONS_ON_STARTUP:
+        await run_migrations(settings.DB_URL)
+    await deactivated_users.start()
+    hashing_executor.start()
+    logger.info(
+        "Conexiones del worker: principal %s + %s de escucha, %s replicas x %s.",
+        primary_pool_size()[1], PRIMARY_DEDICATED_CONNECTIONS, len(replica_router.urls), replica_pool_size()[1]
+    )
+    metrics_task = None
+    if MULTIPROCESS:
+        metrics_task = asyncio.create_task(refresh_gauge_functions_forever(settings.METRICS_REFRESH_SECONDS))
 
     yield
 
+    if metrics_task is not None:
+        metrics_task.cancel()
+    hashing_executor.shutdown()
+    await deactivated_users.stop()
+    await replica_router.close()
+    await DatabaseConnection.close_pool()
+    mark_process_dead()
+
+
 app = FastAPI(
     title="TODO API",
     version="0.1.0",
@@ -47,10 +82,80 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(MetricsMiddleware)
+if settings.SERVER_TIMING_ENABLED or settings.ACCESS_LOG_JSON:
+    app.add_middleware(ServerTimingMiddleware)
+if replica_router.enabled:
+    app.add_middleware(ReadYourWritesMiddleware)
 
 app.include_router(tasks_router, prefix="/tasks", tags=["Tasks"])
 app.include_router(users_router, prefix="/users", tags=["Users"])
+app.include_router(monitoring_router)
+
+
+async def _migrate_once():
+    """Aplica las migraciones desde el proceso principal y cierra su pool."""
+    try:
+        await wait_for_postgres(settings.DB_URL)
+        await run_migrations(settings.DB_URL)
+    finally:
+        await DatabaseConnection.close_pool()
+
+
+def _prepare_multiprocess_metrics():
+    """Prepara el directorio en el que cada worker escribe sus metricas.
+
+    Se usa ``PROMETHEUS_MULTIPROC_DIR`` si esta definido o un directorio
+    temporal nuevo. Los ficheros de una ejecucion anterior se borran para
+    que no se sumen a los de esta.
+    """
+    directory = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if not directory:
+        directory = tempfile.mkdtemp(prefix="todo-metrics-")
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = directory
+    os.makedirs(directory, exist_ok=True)
+    for path in glob.glob(os.path.join(directory, "*.db")):
+        os.remove(path)
+
+
+def run_server():
+    """Arranca uvicorn con el perfil definido en los ajustes ``SERVER_*``.
+
+    Con varios workers las migraciones se aplican una sola vez aqui, antes de
+    lanzarlos, y los workers las omiten. Cada worker crea su pool en el
+    lifespan con su parte del presupuesto de conexiones y escribe sus
+    metricas en ``PROMETHEUS_MULTIPROC_DIR`` para que ``/metrics`` las agregue.
+
+    Con replicas y varios workers la lectura de lo escrito entre workers
+    depende de que el cliente devuelva la cookie ``DB_READ_YOUR_WRITES_COOKIE``.
+    """
+    if settings.SERVER_WORKERS > 1:
+        if replica_router.enabled:
+            logger.warning(
+                "[Replicas] Con %s workers la lectura de lo escrito solo se garantiza a los "
+                "clientes que devuelven la cookie %s.",
+                settings.SERVER_WORKERS, settings.DB_READ_YOUR_WRITES_COOKIE
+            )
+        # Antes de lanzar los workers, que leen el directorio al importar prometheus_client
+        _prepare_multiprocess_metrics()
+        asyncio.run(_migrate_once())
+        # Los workers se lanzan como procesos nuevos y leen este ajuste del entorno
+        os.environ["RUN_MIGRATIONS_ON_STARTUP"] = "false"
+
+    # El logging ya lo configura initialize_logging; uvicorn no debe reemplazarlo
+    uvicorn.run(
+        "main:app",
+        host=settings.SERVER_HOST,
+        port=settings.SERVER_PORT,
+        workers=settings.SERVER_WORKERS,
+        loop=settings.SERVER_LOOP,
+        http=settings.SERVER_HTTP,
+        backlog=settings.SERVER_BACKLOG,
+        timeout_keep_alive=settings.SERVER_KEEPALIVE_TIMEOUT,
+        log_config=None,
+        reload=False
+    )
 
 
 if __name__ == "__main__":
-    uvicorn.run("main:app", host="0.0.0.0", port=5000, log_config=log_config, reload=False)
+    run_server()
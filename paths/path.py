@@ -13,3 +13,6 @@ class ApiPaths:
 
     api_config_file = os.path.join(global_config, "api_config_files", "deployment_enviroments.yml")
     """ Ruta del archivo de configuracion de despliegue"""
+
+    migrations = os.path.join(base_dir, "..", "./api/v1/database/migrations")
+    """ Carpeta de las migraciones del esquema de base de datos"""
@@ -0,0 +1,85 @@
+"""Pruebas de la escucha de usuarios desactivados."""
+
+import asyncio
+import logging
+
+from core.settings.settings import settings
+from utils.deactivated_users import DeactivatedUsers
+
+
+class FakeNotify:
+    def __init__(self, payload):
+        self.payload = payload
+
+
+class FakeConnection:
+    """Conexion de escucha que entrega ``payloads`` y despues falla con ``error``."""
+
+    def __init__(self, payloads, error):
+        self.payloads = payloads
+        self.error = error
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def notifies(self):
+        for payload in self.payloads:
+            yield FakeNotify(payload)
+        raise self.error
+        yield
+
+
+def test_listen_reconecta_ante_cualquier_error(monkeypatch):
+    monkeypatch.setattr(settings, "STARTUP_BACKOFF_BASE", 0)
+    registry = DeactivatedUsers("postgresql://")
+    handled = []
+    reconnected = asyncio.Event()
+
+    def handle(payload):
+        handled.append(payload)
+        if payload == "roto":
+            raise RuntimeError("fallo inesperado")
+
+    async def connect():
+        reconnected.set()
+        return FakeConnection([], asyncio.CancelledError())
+
+    monkeypatch.setattr(registry, "_handle", handle)
+    monkeypatch.setattr(registry, "_connect", connect)
+
+    async def main():
+        task = asyncio.create_task(registry._listen(FakeConnection(["roto"], RuntimeError())))
+        await asyncio.wait_for(reconnected.wait(), 1)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(main())
+    assert handled == ["roto"]
+    assert reconnected.is_set()
+
+
+def test_listener_done_registra_la_salida_inesperada(caplog):
+    async def failing():
+        raise RuntimeError("fallo")
+
+    async def cancelled():
+        await asyncio.sleep(10)
+
+    async def main():
+        task = asyncio.create_task(failing())
+        await asyncio.gather(task, return_exceptions=True)
+        DeactivatedUsers._listener_done(task)
+        task = asyncio.create_task(cancelled())
+        await asyncio.sleep(0)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        DeactivatedUsers._listener_done(task)
+
+    with caplog.at_level(logging.ERROR, logger="app"):
+        asyncio.run(main())
+    errors = [record for record in caplog.records if record.levelno == logging.ERROR]
+    assert len(errors) == 1
+    assert errors[0].exc_info[0] is RuntimeError
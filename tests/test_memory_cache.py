@@ -0,0 +1,62 @@
+"""Pruebas de la cache LRU en memoria."""
+
+import pytest
+
+from core.cache import memory_cache
+from core.cache.memory_cache import InMemoryLRUCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Reloj controlado por la prueba en lugar de ``time.monotonic``."""
+    now = [1000.0]
+    monkeypatch.setattr(memory_cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_guarda_y_devuelve_valores(clock):
+    cache = InMemoryLRUCache("test_basic", max_entries=10, ttl=60)
+    cache.set("a", 1)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+
+
+def test_descarta_la_entrada_usada_hace_mas_tiempo(clock):
+    cache = InMemoryLRUCache("test_lru", max_entries=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_las_entradas_expiran(clock):
+    cache = InMemoryLRUCache("test_ttl", max_entries=10, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=5)
+
+    clock[0] += 10
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+    clock[0] += 60
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_delete_y_clear(clock):
+    cache = InMemoryLRUCache("test_delete", max_entries=10, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    cache.delete("a")
+    cache.delete("no-existe")
+    assert cache.get("a") is None
+
+    cache.clear()
+    assert len(cache) == 0
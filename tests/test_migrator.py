@@ -0,0 +1,61 @@
+"""Pruebas de la lectura de las migraciones."""
+
+import pytest
+
+from api.v1.database.migrator import NO_TRANSACTION_MARKER, load_migrations, split_statements
+
+
+def test_load_migrations_ordena_por_version(tmp_path):
+    (tmp_path / "0002_second.sql").write_text("SELECT 2;")
+    (tmp_path / "0010_tenth.sql").write_text("SELECT 10;")
+    (tmp_path / "0001_first.sql").write_text("SELECT 1;")
+    (tmp_path / "README.md").write_text("no es una migracion")
+
+    migrations = load_migrations(str(tmp_path))
+
+    assert [(migration.version, migration.name) for migration in migrations] == [
+        (1, "first"), (2, "second"), (10, "tenth")
+    ]
+    assert migrations[0].sql == "SELECT 1;"
+    assert all(migration.transactional for migration in migrations)
+
+
+def test_load_migrations_rechaza_versiones_repetidas(tmp_path):
+    (tmp_path / "0001_first.sql").write_text("SELECT 1;")
+    (tmp_path / "01_other.sql").write_text("SELECT 1;")
+
+    with pytest.raises(ValueError):
+        load_migrations(str(tmp_path))
+
+
+def test_load_migrations_detecta_las_migraciones_sin_transaccion(tmp_path):
+    (tmp_path / "0001_index.sql").write_text(f"{NO_TRANSACTION_MARKER}\nCREATE INDEX CONCURRENTLY i ON t (c);\n")
+
+    assert not load_migrations(str(tmp_path))[0].transactional
+
+
+def test_las_migraciones_del_repositorio_se_cargan():
+    migrations = load_migrations()
+
+    assert [migration.version for migration in migrations] == list(range(1, len(migrations) + 1))
+
+
+def test_split_statements():
+    sql = (
+        f"{NO_TRANSACTION_MARKER}\n"
+        "-- Comentario\n"
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm;\n"
+        "\n"
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS i ON t USING GIN (\n"
+        "    a,\n"
+        "    (b || c)\n"
+        ");\n"
+        "-- Solo un comentario al final\n"
+    )
+
+    statements = split_statements(sql)
+
+    assert len(statements) == 2
+    assert statements[0].endswith("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    assert statements[1].startswith("CREATE INDEX CONCURRENTLY")
+    assert statements[1].endswith(")")
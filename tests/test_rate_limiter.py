@@ -0,0 +1,82 @@
+"""Pruebas del limitador de intentos por token buckets."""
+
+import pytest
+
+from core.global_config.exceptions.exceptions import LoginRateLimitedError
+from utils import rate_limiter
+from utils.rate_limiter import LoginRateLimiter, TokenBucketLimiter
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Reloj controlado por la prueba en lugar de ``time.monotonic``."""
+    now = [1000.0]
+    monkeypatch.setattr(rate_limiter.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_admite_la_rafaga_y_luego_rechaza(clock):
+    limiter = TokenBucketLimiter("test_burst", rate=2, burst=3, max_keys=10)
+
+    assert [limiter.acquire("a") for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limiter.acquire("a") == pytest.approx(0.5)
+
+
+def test_recupera_tokens_con_el_tiempo(clock):
+    limiter = TokenBucketLimiter("test_refill", rate=1, burst=1, max_keys=10)
+    assert limiter.acquire("a") == 0.0
+    assert limiter.acquire("a") > 0
+
+    clock[0] += 1.0
+
+    assert limiter.acquire("a") == 0.0
+
+
+def test_las_claves_son_independientes(clock):
+    limiter = TokenBucketLimiter("test_keys", rate=1, burst=1, max_keys=10)
+    assert limiter.acquire("a") == 0.0
+    assert limiter.acquire("b") == 0.0
+    assert limiter.acquire("a") > 0
+
+
+def test_descarta_la_clave_usada_hace_mas_tiempo(clock):
+    limiter = TokenBucketLimiter("test_lru", rate=1, burst=1, max_keys=2)
+    limiter.acquire("a")
+    limiter.acquire("b")
+    limiter.acquire("c")
+
+    assert len(limiter) == 2
+    # ``a`` fue descartada y vuelve con el bucket lleno
+    assert limiter.acquire("a") == 0.0
+    assert limiter.acquire("c") > 0
+
+
+@pytest.mark.parametrize("rate", [0, -1])
+def test_rechaza_una_tasa_no_positiva(rate):
+    with pytest.raises(ValueError):
+        TokenBucketLimiter("test_rate", rate=rate, burst=1, max_keys=10)
+
+
+def test_login_limita_por_usuario_sin_distinguir_mayusculas(clock):
+    limiter = LoginRateLimiter(
+        by_ip=TokenBucketLimiter("test_login_ip", rate=1, burst=100, max_keys=10),
+        by_username=TokenBucketLimiter("test_login_username", rate=0.5, burst=1, max_keys=10)
+    )
+    limiter.check("10.0.0.1", "Ana")
+
+    with pytest.raises(LoginRateLimitedError) as error:
+        limiter.check("10.0.0.2", " ana ")
+    assert error.value.retry_after == pytest.approx(2.0)
+
+
+def test_login_limita_por_ip(clock):
+    limiter = LoginRateLimiter(
+        by_ip=TokenBucketLimiter("test_login_ip_only", rate=1, burst=1, max_keys=10),
+        by_username=TokenBucketLimiter("test_login_username_only", rate=1, burst=100, max_keys=10)
+    )
+    limiter.check("10.0.0.1", "ana")
+
+    with pytest.raises(LoginRateLimitedError):
+        limiter.check("10.0.0.1", "luis")
+    # Sin IP solo se limita por usuario
+    limiter.check(None, "luis")
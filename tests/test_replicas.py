@@ -0,0 +1,123 @@
+"""Pruebas del reparto de lecturas entre replicas."""
+
+import asyncio
+import time
+
+import httpx
+from psycopg import OperationalError
+from psycopg_pool import PoolTimeout
+
+from api.v1.database.replicas import ReplicaRouter, _client_writes, reset_client_writes, start_client_writes
+from core.global_config.middleware.read_your_writes_middleware import ReadYourWritesMiddleware
+from core.settings.settings import settings
+
+
+class FakePool:
+    """Pool que falla con ``error`` o entrega una conexion ficticia."""
+
+    def __init__(self, name, error=None):
+        self.name = name
+        self.error = error
+
+    async def getconn(self, timeout=None):
+        if self.error is not None:
+            raise self.error
+        return f"conexion-{self.name}"
+
+    def get_stats(self):
+        return {}
+
+
+def make_router(*pools) -> ReplicaRouter:
+    router = ReplicaRouter(
+        urls=[pool.name for pool in pools],
+        selection="round_robin",
+        read_your_writes=5,
+        retry_after=10,
+        max_tracked_keys=10
+    )
+    router._pools = {pool.name: pool for pool in pools}
+    return router
+
+
+def test_getconn_no_aparta_una_replica_saturada():
+    busy, healthy = FakePool("a", PoolTimeout("ocupada")), FakePool("b")
+    router = make_router(busy, healthy)
+
+    pool, connection = asyncio.run(router.getconn())
+
+    assert pool is healthy
+    assert connection == "conexion-b"
+    assert router._down_until == {}
+
+
+def test_getconn_aparta_una_replica_caida():
+    down = FakePool("a", OperationalError("sin conexion"))
+    router = make_router(down)
+
+    assert asyncio.run(router.getconn()) is None
+    assert "a" in router._down_until
+
+
+def test_la_marca_del_cliente_fija_al_principal_en_otro_proceso():
+    router = make_router(FakePool("a"))
+
+    marker, token = start_client_writes(None)
+    try:
+        router.record_write(7)
+    finally:
+        reset_client_writes(token)
+    assert marker.written_until is not None
+
+    # Otro worker: no tiene la escritura registrada, pero la cookie la trae
+    router._recent_writes.clear()
+    assert router.use_replica(7)
+    _, token = start_client_writes(marker.written_until)
+    try:
+        assert not router.use_replica(7)
+    finally:
+        reset_client_writes(token)
+
+
+def test_middleware_envia_la_cookie_solo_si_la_peticion_escribe():
+    router = make_router(FakePool("a"))
+
+    async def app(scope, receive, send):
+        if scope["path"] == "/write":
+            router.record_write(7)
+        pinned = "si" if router.pinned_to_primary(7) else "no"
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": pinned.encode()})
+
+    async def main():
+        transport = httpx.ASGITransport(app=ReadYourWritesMiddleware(app))
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+            read = await client.get("/read")
+            write = await client.get("/write")
+            router._recent_writes.clear()
+            after = await client.get("/read")
+            return read, write, after
+
+    read, write, after = asyncio.run(main())
+    assert "set-cookie" not in read.headers
+    assert write.headers["set-cookie"].startswith(f"{settings.DB_READ_YOUR_WRITES_COOKIE}=")
+    assert after.text == "si"
+
+
+def test_middleware_recorta_la_ventana_de_la_cookie():
+    seen = []
+
+    async def app(scope, receive, send):
+        seen.append(_client_writes.get().pinned_until)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def main():
+        transport = httpx.ASGITransport(app=ReadYourWritesMiddleware(app))
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+            await client.get("/", headers={"Cookie": f"{settings.DB_READ_YOUR_WRITES_COOKIE}={time.time() + 10**6}"})
+            await client.get("/", headers={"Cookie": f"{settings.DB_READ_YOUR_WRITES_COOKIE}=nan"})
+
+    asyncio.run(main())
+    assert seen[0] <= time.time() + settings.DB_READ_YOUR_WRITES_SECONDS
+    assert seen[1] is None
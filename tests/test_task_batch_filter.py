@@ -0,0 +1,21 @@
+"""Pruebas de los filtros de las operaciones por lotes."""
+
+import pytest
+from pydantic import ValidationError
+
+from api.v1.schemas.tasks.task_batch_filter import TaskBatchFilter, TaskBatchQueryFilter
+from core.settings.settings import settings
+
+
+def test_exige_algun_criterio():
+    with pytest.raises(ValidationError):
+        TaskBatchFilter()
+
+
+def test_la_query_string_admite_menos_ids_que_el_cuerpo():
+    ids = list(range(1, settings.TASKS_BATCH_QUERY_MAX_SIZE + 2))
+
+    assert TaskBatchFilter(task_ids=ids).task_ids == ids
+    with pytest.raises(ValidationError):
+        TaskBatchQueryFilter(task_ids=ids)
+    assert TaskBatchQueryFilter(task_ids=ids[:-1]).task_ids == ids[:-1]
@@ -0,0 +1,27 @@
+"""Pruebas del ETag del listado de tareas."""
+
+import pytest
+
+from api.v1.controllers.task_controller import TaskController
+
+
+def test_etag():
+    assert TaskController._etag(7, 3) == '"7-3"'
+
+
+@pytest.mark.parametrize(
+    "if_none_match, expected",
+    [
+        (None, None),
+        ("", None),
+        ('"7-3"', 3),
+        ('W/"7-3"', 3),
+        ('"7-1", "7-4"', 4),
+        ('"8-3"', None),
+        ('"7-abc"', None),
+        ('"17-3"', None),
+        ("*", None),
+    ]
+)
+def test_known_version(if_none_match, expected):
+    assert TaskController._known_version(if_none_match, 7) == expected
@@ -0,0 +1,65 @@
+"""Pruebas de la cache de listados de tareas y de sus invalidaciones."""
+
+from core.cache.invalidations import InvalidationLog
+from core.cache.memory_cache import InMemoryLRUCache
+from core.cache.task_list_cache import TaskListCache
+
+
+def _task_cache(max_tasks_per_user=100):
+    return TaskListCache(
+        InMemoryLRUCache("test_task_list", max_entries=10, ttl=60),
+        max_tasks_per_user=max_tasks_per_user,
+        max_tracked_users=10
+    )
+
+
+def test_invalidation_log_solo_afecta_a_sus_claves():
+    log = InvalidationLog(max_keys=10)
+    token = log.token()
+    log.invalidate(["a"])
+
+    assert log.changed_since(["a"], token)
+    assert not log.changed_since(["b"], token)
+    assert not log.changed_since(["a"], log.token())
+
+
+def test_invalidation_log_acotado_descarta_de_mas_pero_nunca_de_menos():
+    log = InvalidationLog(max_keys=1)
+    token = log.token()
+    log.invalidate(["a"])
+    log.invalidate(["b"])
+
+    # ``a`` ya no se registra, pero su invalidacion sigue contando
+    assert log.changed_since(["a"], token)
+    assert not log.changed_since(["a"], log.token())
+
+
+def test_task_cache_guarda_paginas_por_limit_y_after():
+    cache = _task_cache()
+    generation = cache.generation
+    cache.set(1, None, None, [{"id": 1}], generation, version=3)
+    cache.set(1, 10, 5, [{"id": 6}], generation, version=3)
+
+    assert cache.get(1, None, None) == (3, [{"id": 1}])
+    assert cache.get(1, 10, 5) == (3, [{"id": 6}])
+    assert cache.get(1, 10, None) is None
+    assert cache.get(2, None, None) is None
+
+
+def test_task_cache_descarta_lecturas_anteriores_a_una_invalidacion():
+    cache = _task_cache()
+    generation = cache.generation
+    cache.invalidate(1)
+
+    cache.set(1, None, None, [{"id": 1}], generation, version=1)
+    cache.set(2, None, None, [{"id": 2}], generation, version=1)
+
+    assert cache.get(1, None, None) is None
+    assert cache.get(2, None, None) == (1, [{"id": 2}])
+
+
+def test_task_cache_no_guarda_usuarios_con_demasiadas_tareas():
+    cache = _task_cache(max_tasks_per_user=2)
+    cache.set(1, None, None, [{"id": 1}, {"id": 2}, {"id": 3}], cache.generation, version=1)
+
+    assert cache.get(1, None, None) is None
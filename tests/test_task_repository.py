@@ -0,0 +1,22 @@
+"""Pruebas del filtro de las operaciones por lotes."""
+
+import pytest
+
+from api.v1.repositories.task_repository import TaskRepository
+
+
+@pytest.mark.parametrize(
+    "task_ids, where_completed, expected_sql, expected_params",
+    [
+        (None, None, "user_id = %s", [7]),
+        ([1, 2], None, "user_id = %s AND id = ANY(%s)", [7, [1, 2]]),
+        (None, False, "user_id = %s AND completed = %s", [7, False]),
+        ([3], True, "user_id = %s AND id = ANY(%s) AND completed = %s", [7, [3], True]),
+        ([], None, "user_id = %s AND id = ANY(%s)", [7, []]),
+    ]
+)
+def test_batch_conditions(task_ids, where_completed, expected_sql, expected_params):
+    sql, params = TaskRepository._batch_conditions(7, task_ids, where_completed)
+
+    assert sql == expected_sql
+    assert params == expected_params
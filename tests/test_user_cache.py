@@ -0,0 +1,50 @@
+"""Pruebas de la cache de busquedas de usuarios y de sus invalidaciones."""
+
+from core.cache.memory_cache import InMemoryLRUCache
+from core.cache.user_cache import UserCache
+
+USER = {"id": 1, "username": "ana", "email": "ana@example.com"}
+
+
+def _user_cache():
+    return UserCache(
+        records=InMemoryLRUCache("test_user", max_entries=10, ttl=60),
+        aliases=InMemoryLRUCache("test_user_alias", max_entries=20, ttl=60),
+        missing=InMemoryLRUCache("test_user_missing", max_entries=10, ttl=60),
+        max_tracked_keys=30
+    )
+
+
+def test_user_cache_busca_por_email_y_por_nombre():
+    cache = _user_cache()
+    cache.set(USER, cache.generation)
+
+    assert cache.get("ana") == USER
+    assert cache.get("ana@example.com") == USER
+
+    cache.invalidate(USER["id"])
+    assert cache.get("ana") is None
+
+
+def test_user_cache_descarta_lecturas_anteriores_a_una_invalidacion():
+    cache = _user_cache()
+    generation = cache.generation
+    cache.invalidate(USER["id"])
+    cache.invalidate(None, ("luis",))
+
+    cache.set(USER, generation)
+    cache.set_missing("luis", generation)
+    cache.set_missing("eva", generation)
+
+    assert cache.get("ana") is None
+    assert not cache.is_missing("luis")
+    assert cache.is_missing("eva")
+
+
+def test_user_cache_invalidar_identificadores_limpia_los_inexistentes():
+    cache = _user_cache()
+    cache.set_missing("ana", cache.generation)
+
+    cache.invalidate(USER["id"], ("ana", "ana@example.com"))
+
+    assert not cache.is_missing("ana")
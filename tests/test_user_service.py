@@ -0,0 +1,83 @@
+"""Pruebas del orden de las comprobaciones del registro y del inicio de sesion."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from api.v1.schemas.users.user_create import UserCreate
+from api.v1.services import user_service
+from api.v1.services.user_service import UserService
+from core.cache.memory_cache import InMemoryLRUCache
+from core.cache.user_cache import UserCache
+from core.global_config.exceptions.exceptions import ExceptionDataError, LoginRateLimitedError
+from utils.rate_limiter import LoginRateLimiter, TokenBucketLimiter
+
+
+class _Recorder:
+    """Registra las llamadas que no deben producirse."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def get_user_by_email_or_username(self, identifier, primary=False):
+        self.calls.append(("get_user", identifier))
+        return None
+
+    async def verify_password(self, password, hashed_password):
+        self.calls.append(("verify_password", password))
+        return True
+
+
+def test_un_intento_limitado_se_rechaza_antes_de_buscar_el_usuario_y_de_bcrypt(monkeypatch):
+    recorder = _Recorder()
+    limiter = LoginRateLimiter(
+        by_ip=TokenBucketLimiter("test_service_ip", rate=0.001, burst=1, max_keys=10),
+        by_username=TokenBucketLimiter("test_service_username", rate=0.001, burst=100, max_keys=10)
+    )
+    limiter.check("10.0.0.1", "ana")
+    monkeypatch.setattr(user_service.settings, "LOGIN_RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(user_service, "login_rate_limiter", limiter)
+    monkeypatch.setattr(user_service.hashing_executor, "verify_password", recorder.verify_password)
+    service = UserService(recorder)
+    monkeypatch.setattr(service, "_get_user", recorder.get_user_by_email_or_username)
+
+    form = SimpleNamespace(username="ana", password="Password123!")
+    with pytest.raises(LoginRateLimitedError):
+        asyncio.run(service.login_user(form, client_ip="10.0.0.1"))
+
+    assert recorder.calls == []
+
+
+class _ExistingUserRepository:
+    """Repositorio en el que el usuario ya existe en el principal."""
+
+    def __init__(self, user):
+        self.user = user
+        self.lookups = []
+
+    async def get_user_by_email_or_username(self, identifier, primary=False):
+        self.lookups.append((identifier, primary))
+        return self.user
+
+
+def test_el_registro_consulta_el_principal_aunque_la_cache_diga_que_no_existe(monkeypatch):
+    async def hash_password(password):
+        raise AssertionError("No se debe hashear un registro duplicado")
+
+    monkeypatch.setattr(user_service.hashing_executor, "hash_password", hash_password)
+    user = {"id": 1, "username": "ana", "email": "ana@example.com", "is_active": True}
+    repository = _ExistingUserRepository(user)
+    cache = UserCache(
+        records=InMemoryLRUCache("test_service_user", max_entries=10, ttl=60),
+        aliases=InMemoryLRUCache("test_service_user_alias", max_entries=20, ttl=60),
+        missing=InMemoryLRUCache("test_service_user_missing", max_entries=10, ttl=60),
+        max_tracked_keys=30
+    )
+    cache.set_missing("ana@example.com", cache.generation)
+    service = UserService(repository, user_cache=cache)
+
+    with pytest.raises(ExceptionDataError):
+        asyncio.run(service.create_user(UserCreate(username="ana", email="ana@example.com", password="Password123!")))
+
+    assert repository.lookups == [("ana@example.com", True)]
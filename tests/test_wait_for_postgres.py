@@ -0,0 +1,15 @@
+"""Pruebas de la espera exponencial entre reintentos."""
+
+import pytest
+
+from utils.wait_for_postgres import backoff_delay
+
+
+@pytest.mark.parametrize("attempt, limit", [(0, 0.1), (1, 0.2), (3, 0.8), (10, 5.0), (100, 5.0)])
+def test_backoff_delay_queda_entre_cero_y_el_limite(attempt, limit):
+    for _ in range(200):
+        assert 0 <= backoff_delay(attempt, base=0.1, cap=5.0) <= limit
+
+
+def test_backoff_delay_tiene_jitter():
+    assert len({backoff_delay(5, base=0.1, cap=5.0) for _ in range(50)}) > 1
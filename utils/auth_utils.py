@@ -1,10 +1,13 @@
 """Funciones utilitarias para la autenticacion con JWT."""
 
+import hashlib
+import time
 from typing import Optional
 import jwt
 from jwt.exceptions import ExpiredSignatureError, InvalidTokenError
 from datetime import datetime, timedelta, timezone
 from fastapi import HTTPException
+from core.cache.caches import token_cache
 from core.settings.settings import settings
 
 from api.v1.schemas.auth.auth_token import UserAuthData
@@ -27,21 +30,49 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
-def verify_access_token(token: str):
-    """Verifica y decodifica un token de acceso JWT."""
+def _decode_access_token(token: str) -> dict:
+    """Verifica la firma y la expiracion de un token JWT y devuelve su payload."""
     try:
-        payload = jwt.decode(token, settings.SECRETE_KEY, algorithms=[settings.ALGORITHM])
-        username = payload.get("sub")
-        email = payload.get("email")
-        user_id = payload.get("user_id")
-        is_active = payload.get("is_active")
+        return jwt.decode(token, settings.SECRETE_KEY, algorithms=[settings.ALGORITHM])
     except ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token has expired")
     except InvalidTokenError:
         raise HTTPException(status_code=401, detail="Invalid token")
+
+
+def _user_from_payload(payload: dict) -> UserAuthData:
+    """Construye los datos del usuario autenticado a partir del payload."""
     return UserAuthData(
-        username=username,
-        email=email,
-        user_id=user_id,
-        is_active=is_active
+        username=payload.get("sub"),
+        email=payload.get("email"),
+        user_id=payload.get("user_id"),
+        is_active=payload.get("is_active")
     )
+
+
+def verify_access_token(token: str):
+    """Verifica y decodifica un token de acceso JWT."""
+    return _user_from_payload(_decode_access_token(token))
+
+
+def verify_access_token_cached(token: str) -> UserAuthData:
+    """Verifica un token JWT reutilizando el resultado de verificaciones previas.
+
+    Los tokens validos se guardan en ``token_cache`` indexados por el SHA-256
+    del token y expiran en el ``exp`` del propio token, sin superar
+    ``TOKEN_CACHE_MAX_TTL_SECONDS``, de modo que las peticiones repetidas de
+    una misma sesion no vuelven a verificar la firma.
+    """
+    cache_key = hashlib.sha256(token.encode("utf-8")).digest()
+    user = token_cache.get(cache_key)
+    if user is not None:
+        return user
+
+    payload = _decode_access_token(token)
+    user = _user_from_payload(payload)
+    expires_at = payload.get("exp")
+    if expires_at is not None:
+        ttl = expires_at - time.time()
+        if ttl > 0:
+            token_cache.set(cache_key, user, ttl=min(ttl, settings.TOKEN_CACHE_MAX_TTL_SECONDS))
+    return user
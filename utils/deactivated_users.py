@@ -0,0 +1,136 @@
+"""Registro en memoria de los usuarios desactivados, sincronizado entre workers."""
+
+import asyncio
+import json
+import logging
+from typing import Iterable, Optional, Set
+
+import psycopg
+from psycopg import sql
+
+from api.v1.repositories.user_repository import USER_STATUS_CHANNEL, UserRepository
+from core.cache.caches import user_cache
+from core.global_config.metrics.metrics import DEACTIVATED_USERS, set_gauge_function
+from core.settings.settings import settings
+from utils.wait_for_postgres import backoff_delay
+
+logger = logging.getLogger("app")
+
+
+class DeactivatedUsers:
+    """Conjunto de los IDs de usuarios desactivados para la autenticacion.
+
+    Se carga al arrancar y se mantiene al dia escuchando el canal
+    ``USER_STATUS_CHANNEL``, que alimenta un trigger de ``users``: cada
+    usuario creado y cada cambio de estado confirmado, se haga desde
+    cualquier worker o fuera de la API, llega a todos en milisegundos, asi
+    que comprobar un token es una busqueda O(1) sin consultar la base de
+    datos.
+
+    La escucha usa una conexion propia fuera del pool. Si se pierde se
+    reconecta con espera exponencial y se recarga el conjunto completo,
+    porque los avisos emitidos mientras tanto se pierden.
+    """
+
+    def __init__(self, db_url: str):
+        self.db_url = db_url
+        self._ids: Set[int] = set()
+        self._task: Optional[asyncio.Task] = None
+        set_gauge_function(DEACTIVATED_USERS, lambda: len(self._ids))
+
+    def __contains__(self, user_id: Optional[int]) -> bool:
+        return user_id in self._ids
+
+    def apply(self, user_id: int, is_active: Optional[bool], identifiers: Iterable[str] = ()):
+        """Registra el nuevo estado del usuario y descarta su entrada de la cache.
+
+        Como en la carga (``NOT is_active``), solo ``False`` cuenta como
+        desactivado. ``identifiers`` (email y nombre de usuario) limpian
+        tambien las busquedas cacheadas como inexistentes.
+        """
+        if is_active is False:
+            self._ids.add(user_id)
+        else:
+            self._ids.discard(user_id)
+        user_cache.invalidate(user_id, identifiers)
+
+    async def start(self):
+        """Carga el conjunto y empieza a escuchar los cambios."""
+        if self._task is not None:
+            return
+        connection = await self._connect()
+        self._task = asyncio.create_task(self._listen(connection))
+        self._task.add_done_callback(self._listener_done)
+
+    async def stop(self):
+        """Deja de escuchar y cierra la conexion de escucha."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _connect(self) -> psycopg.AsyncConnection:
+        """Abre la conexion de escucha y recarga el conjunto.
+
+        El ``LISTEN`` va antes de la carga para que ningun cambio quede entre
+        ambas: como mucho se aplica dos veces, lo que no tiene efecto.
+        """
+        connection = await psycopg.AsyncConnection.connect(self.db_url, autocommit=True)
+        try:
+            await connection.execute(sql.SQL("LISTEN {}").format(sql.Identifier(USER_STATUS_CHANNEL)))
+            self._ids = await UserRepository(self.db_url).get_inactive_user_ids()
+        except BaseException:
+            await connection.close()
+            raise
+        logger.info("[Auth] %s usuarios desactivados cargados.", len(self._ids))
+        return connection
+
+    async def _listen(self, connection: psycopg.AsyncConnection):
+        """Aplica los avisos recibidos y reconecta si se pierde la conexion.
+
+        Cualquier error (no solo de psycopg) pasa por la reconexion y la
+        recarga; solo la cancelacion de ``stop`` termina la tarea.
+        """
+        attempt = 0
+        while True:
+            try:
+                async with connection:
+                    attempt = 0
+                    async for notify in connection.notifies():
+                        self._handle(notify.payload)
+            except Exception as e:
+                logger.warning("[Auth] Conexion de escucha de usuarios perdida: %s", e, exc_info=True)
+            while True:
+                await asyncio.sleep(backoff_delay(attempt, settings.STARTUP_BACKOFF_BASE, settings.STARTUP_BACKOFF_MAX))
+                attempt += 1
+                try:
+                    connection = await self._connect()
+                    break
+                except Exception as e:
+                    logger.warning("[Auth] No se pudo reconectar la escucha de usuarios (%s): %s", attempt, e)
+
+    @staticmethod
+    def _listener_done(task: asyncio.Task):
+        """Avisa si la escucha termina sin que la haya cancelado ``stop``."""
+        if task.cancelled():
+            return
+        logger.error(
+            "[Auth] La escucha de usuarios desactivados termino inesperadamente; "
+            "los cambios de estado no se aplicaran en este worker.",
+            exc_info=task.exception()
+        )
+
+    def _handle(self, payload: str):
+        """Aplica un aviso ``{"user_id", "is_active", "username", "email"}``."""
+        try:
+            change = json.loads(payload)
+            identifiers = [change[key] for key in ("username", "email") if change.get(key)]
+            self.apply(int(change["user_id"]), change["is_active"], identifiers)
+        except (ValueError, KeyError, TypeError):
+            logger.warning("[Auth] Aviso de estado de usuario no valido: %s", payload)
+
+
+deactivated_users = DeactivatedUsers(settings.DB_URL)
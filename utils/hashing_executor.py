@@ -0,0 +1,87 @@
+"""Ejecutor dedicado para el hasheo de contraseñas con bcrypt."""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from core.global_config.exceptions.exceptions import HashingQueueFullError
+from core.global_config.metrics.metrics import (
+    PASSWORD_HASH_DURATION,
+    PASSWORD_HASH_IN_FLIGHT,
+    PASSWORD_HASH_QUEUE_DEPTH,
+    PASSWORD_HASH_REJECTED,
+    set_gauge_function,
+)
+from core.settings.settings import settings
+from utils.password_managment import hash_password, verify_password
+from utils.worker_budget import per_worker
+
+logger = logging.getLogger("app")
+
+
+class HashingExecutor:
+    """Pool de procesos acotado para bcrypt con control de admision.
+
+    bcrypt consume CPU y retiene el GIL, por lo que se ejecuta en procesos
+    aparte. Como maximo se admiten ``max_workers + max_queue_size``
+    operaciones a la vez; el resto se rechaza de inmediato con
+    ``HashingQueueFullError`` en lugar de acumularse.
+    """
+
+    def __init__(self, max_workers: int, max_queue_size: int):
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._in_flight = 0
+        set_gauge_function(PASSWORD_HASH_IN_FLIGHT, lambda: self._in_flight)
+        set_gauge_function(PASSWORD_HASH_QUEUE_DEPTH, lambda: max(0, self._in_flight - self.max_workers))
+
+    def start(self):
+        """Crea el pool de procesos si aun no existe."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+            logger.info("[Hashing] Pool de hasheo iniciado con %s procesos", self.max_workers)
+
+    def shutdown(self):
+        """Detiene el pool de procesos."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    async def _submit(self, operation: str, func, *args):
+        """Envia una operacion al pool aplicando el control de admision."""
+        if self._in_flight >= self.max_workers + self.max_queue_size:
+            PASSWORD_HASH_REJECTED.labels(operation).inc()
+            logger.warning("[Hashing] Cola de hasheo llena, operacion '%s' rechazada", operation)
+            raise HashingQueueFullError("Servicio de autenticacion saturado")
+
+        self.start()
+        self._in_flight += 1
+        start = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            self._in_flight -= 1
+            PASSWORD_HASH_DURATION.labels(operation).observe(time.perf_counter() - start)
+
+    async def hash_password(self, plain_password: str) -> str:
+        """Hashea una contraseña en el pool de procesos."""
+        return await self._submit("hash", hash_password, plain_password)
+
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        """Verifica una contraseña en el pool de procesos."""
+        return await self._submit("verify", verify_password, plain_password, hashed_password)
+
+
+hashing_executor = HashingExecutor(
+    max_workers=per_worker(settings.HASH_POOL_WORKERS or os.cpu_count() or 1),
+    max_queue_size=per_worker(settings.HASH_QUEUE_MAX_SIZE)
+)
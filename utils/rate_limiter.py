@@ -0,0 +1,100 @@
+"""Limitador de peticiones por clave con token buckets en memoria."""
+
+import logging
+import time
+from collections import OrderedDict
+from typing import Hashable, Optional, Tuple
+
+from core.global_config.exceptions.exceptions import LoginRateLimitedError
+from core.global_config.metrics.metrics import (
+    RATE_LIMITER_BUCKETS,
+    RATE_LIMITER_EVICTIONS,
+    RATE_LIMITER_REJECTED,
+    set_gauge_function,
+)
+from core.settings.settings import settings
+
+logger = logging.getLogger("app")
+
+
+class TokenBucketLimiter:
+    """Un token bucket por clave: ``rate`` intentos por segundo y rafagas de ``burst``.
+
+    Los buckets se guardan en orden LRU y, al superar ``max_keys``, se
+    descarta el usado hace mas tiempo, de modo que la memoria del limitador
+    esta acotada aunque lleguen claves nuevas sin parar. Un bucket descartado
+    vuelve lleno, lo que solo favorece a claves que llevaban tiempo sin uso.
+
+    Los limites son por proceso: con varios workers el total es ``rate`` por
+    el numero de workers.
+    """
+
+    def __init__(self, name: str, rate: float, burst: float, max_keys: int):
+        if rate <= 0:
+            raise ValueError(f"La tasa del limitador {name} debe ser mayor que 0: {rate}")
+        self.name = name
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[Hashable, Tuple[float, float]]" = OrderedDict()
+        set_gauge_function(RATE_LIMITER_BUCKETS.labels(name), lambda: len(self._buckets))
+
+    def acquire(self, key: Hashable) -> float:
+        """Consume un token de ``key``.
+
+        Devuelve 0 si se admite o los segundos hasta que haya un token libre.
+        """
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.pop(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated_at) * self.rate)
+        if tokens >= 1:
+            tokens -= 1
+            retry_after = 0.0
+        else:
+            retry_after = (1 - tokens) / self.rate
+            RATE_LIMITER_REJECTED.labels(self.name).inc()
+        self._buckets[key] = (tokens, now)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+            RATE_LIMITER_EVICTIONS.labels(self.name).inc()
+        return retry_after
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+class LoginRateLimiter:
+    """Limita los intentos de inicio de sesion por IP de cliente y por usuario.
+
+    La IP frena a un cliente que prueba muchos usuarios y el usuario frena
+    los intentos contra una misma cuenta desde muchas IPs.
+    """
+
+    def __init__(self, by_ip: TokenBucketLimiter, by_username: TokenBucketLimiter):
+        self.by_ip = by_ip
+        self.by_username = by_username
+
+    def check(self, client_ip: Optional[str], username: str):
+        """Consume un intento o lanza ``LoginRateLimitedError`` con la espera necesaria."""
+        retry_after = self.by_ip.acquire(client_ip) if client_ip else 0.0
+        if not retry_after:
+            retry_after = self.by_username.acquire(username.strip().lower())
+        if retry_after:
+            logger.warning("[RateLimit] Demasiados intentos de inicio de sesion (ip=%s)", client_ip)
+            raise LoginRateLimitedError(retry_after)
+
+
+login_rate_limiter = LoginRateLimiter(
+    by_ip=TokenBucketLimiter(
+        "login_ip",
+        rate=settings.LOGIN_RATE_PER_IP,
+        burst=settings.LOGIN_BURST_PER_IP,
+        max_keys=settings.LOGIN_RATE_LIMIT_MAX_KEYS
+    ),
+    by_username=TokenBucketLimiter(
+        "login_username",
+        rate=settings.LOGIN_RATE_PER_USERNAME,
+        burst=settings.LOGIN_BURST_PER_USERNAME,
+        max_keys=settings.LOGIN_RATE_LIMIT_MAX_KEYS
+    )
+)
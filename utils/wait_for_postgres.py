@@ -1,21 +1,57 @@
 """Utilidad para esperar a que PostgreSQL esté listo antes de continuar."""
 
+import asyncio
 import logging
+import random
 import time
-import psycopg2
+import psycopg
+
+from api.v1.database.connection import DatabaseConnection
+from core.global_config.exceptions.exceptions import RepositoryConnectionError
+from core.settings.settings import settings
 
 logger = logging.getLogger("app")
 
 
-def wait_for_postgres(db_url: str):
-    for i in range(10):
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Espera antes del reintento ``attempt`` (desde 0): exponencial con jitter completo.
+
+    El jitter reparte los reintentos de varios workers que arrancan a la vez
+    para que no golpeen la base de datos al mismo tiempo.
+    """
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+async def _probe(db_url: str, timeout: float):
+    """Abre y cierra una conexion directa; falla rapido si el servidor la rechaza."""
+    connection = await asyncio.wait_for(psycopg.AsyncConnection.connect(db_url), timeout)
+    await connection.close()
+
+
+async def wait_for_postgres(db_url: str, deadline: float = settings.STARTUP_DEADLINE):
+    """Espera a PostgreSQL y deja el pool del proceso abierto y probado.
+
+    Reintenta con espera exponencial y jitter hasta agotar ``deadline``
+    segundos en total. Cuando el servidor acepta conexiones abre el pool, que
+    crea sus conexiones minimas, y comprueba una con ``SELECT 1``.
+    """
+    give_up_at = time.monotonic() + deadline
+    attempt = 0
+    while True:
+        remaining = give_up_at - time.monotonic()
         try:
-            conn = psycopg2.connect(db_url)
-            conn.close()
-            logger.info("PostgreSQL está listo.")
+            await _probe(db_url, remaining)
+            await DatabaseConnection.open_pool(db_url)
+            await DatabaseConnection.ping(timeout=max(0.0, give_up_at - time.monotonic()))
+            logger.info("PostgreSQL está listo (intentos: %s).", attempt + 1)
             return
-        except Exception as e:
-            logger.warning(f"PostgreSQL no está listo todavía, reintentando... ({i+1}/10): {e}")
-            time.sleep(2)
-
-    raise Exception("PostgreSQL no se pudo iniciar.")
+        except (psycopg.Error, OSError, asyncio.TimeoutError) as e:
+            await DatabaseConnection.close_pool()
+            attempt += 1
+            remaining = give_up_at - time.monotonic()
+            if remaining <= 0:
+                logger.error("PostgreSQL no respondio en %s segundos: %r", deadline, e)
+                raise RepositoryConnectionError("PostgreSQL no se pudo iniciar.") from e
+            delay = min(remaining, backoff_delay(attempt - 1, settings.STARTUP_BACKOFF_BASE, settings.STARTUP_BACKOFF_MAX))
+            logger.warning("PostgreSQL no está listo todavía, reintentando en %.2f s (%s): %s", delay, attempt, e)
+            await asyncio.sleep(delay)
@@ -0,0 +1,43 @@
+"""Reparto de los recursos globales del servidor entre sus workers."""
+
+from typing import Tuple
+
+from core.settings.settings import settings
+
+# Conexiones al principal que cada worker abre fuera de su pool: la de
+# escucha de los cambios de estado de usuario (utils.deactivated_users)
+PRIMARY_DEDICATED_CONNECTIONS = 1
+
+
+def per_worker(total: int, minimum: int = 1) -> int:
+    """Parte de ``total`` que corresponde a cada proceso worker.
+
+    ``total`` es el presupuesto de todo el servidor (por ejemplo conexiones a
+    la base de datos); con ``SERVER_WORKERS`` procesos cada uno usa una
+    fraccion, nunca menos que ``minimum``.
+    """
+    return max(minimum, total // max(1, settings.SERVER_WORKERS))
+
+
+def primary_pool_size() -> Tuple[int, int]:
+    """``(min, max)`` del pool de cada worker contra el principal.
+
+    ``DB_POOL_MAX_SIZE`` es el total de conexiones del servidor al
+    principal, incluidas las que cada worker abre fuera del pool, que se
+    descuentan de su parte.
+    """
+    max_conn = max(1, per_worker(settings.DB_POOL_MAX_SIZE) - PRIMARY_DEDICATED_CONNECTIONS)
+    min_conn = min(per_worker(settings.DB_POOL_MIN_SIZE, minimum=0), max_conn)
+    return min_conn, max_conn
+
+
+def replica_pool_size() -> Tuple[int, int]:
+    """``(min, max)`` del pool de cada worker contra cada replica.
+
+    ``DB_REPLICA_POOL_MAX_SIZE`` es el total de conexiones del servidor a
+    cada replica.
+    """
+    max_conn = per_worker(settings.DB_REPLICA_POOL_MAX_SIZE)
+    min_conn = min(per_worker(settings.DB_REPLICA_POOL_MIN_SIZE, minimum=0), max_conn)
+    return min_conn, max_conn
+